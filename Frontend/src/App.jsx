@@ -1,5 +1,8 @@
 import React, { useState, useEffect } from 'react';
 import { FileText, UserCircle, AlertTriangle, X, Menu, Calendar, MessageCircle, List, ChevronsRight, Wrench, Power } from 'lucide-react';
+import { readAnswerStream } from './answerStream';
+
+const API_URL = 'http://localhost:5001';
 
 // --- RakeAssist Chatbot Component ---
 const RakeAssist = ({ onClose, currentDay }) => {
@@ -8,6 +11,7 @@ const RakeAssist = ({ onClose, currentDay }) => {
   ]);
   const [inputValue, setInputValue] = useState('');
   const [isLoading, setIsLoading] = useState(false);
+  const [isStreaming, setIsStreaming] = useState(false);
 
   const handleSendMessage = async () => {
     if (inputValue.trim() === '' || isLoading) return;
@@ -18,16 +22,26 @@ const RakeAssist = ({ onClose, currentDay }) => {
     setIsLoading(true);
 
     try {
-      const response = await fetch('http://localhost:5001/ask', {
+      const response = await fetch(`${API_URL}/ask/stream`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ question: inputValue, day: currentDay }),
       });
 
       if (!response.ok) throw new Error('Network response was not ok');
-      const data = await response.json();
-      const aiMessage = { text: data.answer || "Sorry, I couldn't get a response.", sender: 'ai' };
-      setMessages(prev => [...prev, aiMessage]);
+      // Questions the server can answer without the model (e.g. no train ID) come back as plain JSON
+      if (!(response.headers.get('Content-Type') || '').includes('text/event-stream')) {
+        const data = await response.json();
+        const aiMessage = { text: data.answer || "Sorry, I couldn't get a response.", sender: 'ai' };
+        setMessages(prev => [...prev, aiMessage]);
+        return;
+      }
+
+      setIsStreaming(true);
+      setMessages(prev => [...prev, { text: '', sender: 'ai' }]);
+      await readAnswerStream(response, (token) => {
+        setMessages(prev => [...prev.slice(0, -1), { ...prev[prev.length - 1], text: prev[prev.length - 1].text + token }]);
+      });
 
     } catch (error) {
       console.error("Error fetching from RakeAssist API:", error);
@@ -35,6 +49,7 @@ const RakeAssist = ({ onClose, currentDay }) => {
       setMessages(prev => [...prev, errorMessage]);
     } finally {
       setIsLoading(false);
+      setIsStreaming(false);
     }
   };
   
@@ -54,7 +69,7 @@ const RakeAssist = ({ onClose, currentDay }) => {
             {msg.text}
           </div>
         ))}
-        {isLoading && <div className="p-3 rounded-2xl max-w-[80%] leading-snug bg-gray-700 text-gray-200 self-start rounded-bl-lg animate-pulse">Thinking...</div>}
+        {isLoading && !isStreaming && <div className="p-3 rounded-2xl max-w-[80%] leading-snug bg-gray-700 text-gray-200 self-start rounded-bl-lg animate-pulse">Thinking...</div>}
       </div>
       <div className="p-4 border-t border-gray-700 flex gap-2">
         <input
@@ -286,10 +301,78 @@ const TrainDetailModal = ({ train, status, onClose }) => {
     );
 };
 
+// --- Simulation Log Loading ---
+// Expands the delta-encoded log (simulation_log.delta.jsonl) into the simulation_log.json shape:
+// keyframe days carry every row, other days only {column: [[row, value], ...]} changes, and the plan is the status column.
+const decodeDeltaLog = (text) => {
+  const [header, ...records] = text.trim().split('\n').map(line => JSON.parse(line));
+  if (header.format !== 'kronos-delta-log') throw new Error('Not a delta-encoded simulation log.');
+  const columns = header.columns;
+  let rows = [];
+  return records.map(record => {
+    if (record.rows) {
+      rows = record.rows;
+    } else {
+      rows = rows.slice();
+      const copied = new Set();
+      for (const [column, changes] of Object.entries(record.changes)) {
+        const c = columns.indexOf(column);
+        for (const [i, value] of changes) {
+          if (!copied.has(i)) { rows[i] = rows[i].slice(); copied.add(i); }
+          rows[i][c] = value;
+        }
+      }
+    }
+    const fleet = rows.map(row => Object.fromEntries(columns.map((column, c) => [column, row[c]])));
+    const plan = { SERVICE: [], MAINTENANCE: [], STANDBY: [] };
+    fleet.forEach(train => plan[train.status].push(train.train_id));
+    return { day: record.day, scenario: record.scenario, plan, fleet_status_today: fleet };
+  });
+};
+
+// Day summaries from the paged log API; each day's plan and fleet are fetched when the day is viewed.
+const LOG_PAGE_LIMIT = 500; // The API's largest page (LOG_PAGE_MAX)
+
+// Follows next_offset until the last page; `pageOf` picks the paged list out of a response. Returns the first response and every item.
+const fetchAllPages = async (path, pageOf, errorMessage) => {
+  let first = null;
+  const items = [];
+  for (let offset = 0; offset != null; ) {
+    const response = await fetch(`${API_URL}${path}?offset=${offset}&limit=${LOG_PAGE_LIMIT}`);
+    if (!response.ok) throw new Error(`HTTP ${response.status}: ${errorMessage}`);
+    const data = await response.json();
+    first = first || data;
+    const page = pageOf(data);
+    items.push(...page.items);
+    offset = page.next_offset;
+  }
+  return { first, items };
+};
+
+const fetchDaySummaries = async () => (await fetchAllPages('/log/days', data => data, 'Failed to fetch the day summaries.')).items;
+
+const fetchDayDetails = async (day) => {
+  const { first, items } = await fetchAllPages(`/log/days/${day}`, data => data.fleet, `Failed to fetch Day ${day}.`);
+  return { plan: first.plan, fleet_status_today: items };
+};
+
+// Without the API server: prefers the delta-encoded log file and falls back to the full JSON log.
+const fetchSimulationLog = async () => {
+  const deltaResponse = await fetch('/simulation_log.delta.jsonl');
+  if (deltaResponse.ok) {
+    try { return decodeDeltaLog(await deltaResponse.text()); } catch (err) { console.warn(err); }
+  }
+  const response = await fetch('/simulation_log.json');
+  if (!response.ok) throw new Error(`HTTP ${response.status}: Failed to fetch data. Make sure simulation_log.delta.jsonl or simulation_log.json is in your /public folder.`);
+  return response.json();
+};
+
 // --- Main App Component ---
 
 export default function App() {
     const [simulationLog, setSimulationLog] = useState([]);
+    const [logFromApi, setLogFromApi] = useState(false); // Day summaries only; details are fetched per day
+    const [dayDetails, setDayDetails] = useState({});
     const [currentDay, setCurrentDay] = useState(1);
     const [isLoading, setIsLoading] = useState(true);
     const [error, setError] = useState(null);
@@ -304,9 +387,14 @@ export default function App() {
             setIsLoading(true);
             setError(null);
             try {
-                const response = await fetch('/simulation_log.json');
-                if (!response.ok) throw new Error(`HTTP ${response.status}: Failed to fetch data. Make sure simulation_log.json is in your /public folder.`);
-                const data = await response.json();
+                let data;
+                try {
+                    data = await fetchDaySummaries();
+                    setLogFromApi(true);
+                } catch (apiErr) {
+                    console.warn(apiErr);
+                    data = await fetchSimulationLog();
+                }
                 if (!Array.isArray(data) || data.length === 0) throw new Error("Simulation data is empty or invalid. Please re-run the Python simulation.");
                 setSimulationLog(data);
             } catch (err) {
@@ -319,7 +407,19 @@ export default function App() {
         fetchData();
     }, []);
 
-    const selectedDayData = simulationLog.find(d => d.day === currentDay);
+    // Loads the viewed day and prefetches the next one, so stepping the slider forward is instant
+    useEffect(() => {
+        if (!logFromApi) return;
+        [currentDay, currentDay + 1].filter(day => !dayDetails[day] && simulationLog.some(d => d.day === day)).forEach(day => {
+            setDayDetails(prev => ({ ...prev, [day]: { pending: true } }));
+            fetchDayDetails(day)
+                .then(details => setDayDetails(prev => ({ ...prev, [day]: details })))
+                .catch(err => { console.error(err); setDayDetails(prev => ({ ...prev, [day]: { error: err.message } })); });
+        });
+    }, [logFromApi, currentDay, simulationLog, dayDetails]);
+
+    const daySummary = simulationLog.find(d => d.day === currentDay);
+    const selectedDayData = daySummary && (logFromApi ? { ...daySummary, ...dayDetails[currentDay] } : daySummary);
     const plan = selectedDayData?.plan || { SERVICE: [], MAINTENANCE: [], STANDBY: [] };
     const fleetStatus = selectedDayData?.fleet_status_today || [];
 
@@ -337,6 +437,8 @@ export default function App() {
         if (isLoading) return <div className="text-center py-20"><p className="text-2xl text-gray-400 animate-pulse">Loading Simulation Data...</p></div>;
         if (error) return <div className="text-center p-8 bg-red-900/50 border border-red-700 rounded-lg max-w-2xl mx-auto"><p className="text-2xl font-bold text-red-400 mb-4">Failed to Load Data</p><p className="text-gray-300 font-mono bg-gray-900 p-4 rounded">{error}</p></div>;
         if (!selectedDayData) return <p className="text-center text-xl text-gray-500">No data for Day {currentDay}.</p>;
+        if (selectedDayData.error) return <p className="text-center text-xl text-red-400">{selectedDayData.error}</p>;
+        if (!selectedDayData.plan) return <div className="text-center py-20"><p className="text-2xl text-gray-400 animate-pulse">Loading Day {currentDay}...</p></div>;
 
         return (
             <>
@@ -0,0 +1,20 @@
+// Reads the Server-Sent Events answer from /ask/stream, calling onToken with each chunk of text as it arrives.
+export const readAnswerStream = async (response, onToken) => {
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    const events = buffer.split('\n\n');
+    buffer = events.pop();
+    for (const rawEvent of events) {
+      const lines = rawEvent.split('\n');
+      const type = (lines.find(line => line.startsWith('event: ')) || '').slice(7);
+      const data = JSON.parse((lines.find(line => line.startsWith('data: ')) || 'data: {}').slice(6));
+      if (type === 'token') onToken(data.text);
+      if (type === 'error') throw new Error(data.error);
+    }
+  }
+};
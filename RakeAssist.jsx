@@ -1,4 +1,5 @@
 import React, { useState } from 'react';
+import { readAnswerStream } from './Frontend/src/answerStream';
 
 // A simple styling object. In a real app, you'd use CSS classes.
 const styles = {
@@ -76,6 +77,7 @@ const RakeAssist = () => {
   ]);
   const [inputValue, setInputValue] = useState('');
   const [isLoading, setIsLoading] = useState(false);
+  const [isStreaming, setIsStreaming] = useState(false);
 
   const handleSendMessage = async () => {
     if (inputValue.trim() === '' || isLoading) return;
@@ -86,8 +88,8 @@ const RakeAssist = () => {
     setIsLoading(true);
 
     try {
-      // The API server we created runs on port 5001
-      const response = await fetch('http://localhost:5001/ask', {
+      // The API server we created runs on port 5001; /ask/stream sends the answer as it is generated
+      const response = await fetch('http://localhost:5001/ask/stream', {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -99,9 +101,19 @@ const RakeAssist = () => {
         throw new Error('Network response was not ok');
       }
 
-      const data = await response.json();
-      const aiMessage = { text: data.answer || "Sorry, I couldn't get a response.", sender: 'ai' };
-      setMessages(prev => [...prev, aiMessage]);
+      // Questions the server can answer without the model (e.g. no train ID) come back as plain JSON
+      if (!(response.headers.get('Content-Type') || '').includes('text/event-stream')) {
+        const data = await response.json();
+        const aiMessage = { text: data.answer || "Sorry, I couldn't get a response.", sender: 'ai' };
+        setMessages(prev => [...prev, aiMessage]);
+        return;
+      }
+
+      setIsStreaming(true);
+      setMessages(prev => [...prev, { text: '', sender: 'ai' }]);
+      await readAnswerStream(response, (token) => {
+        setMessages(prev => [...prev.slice(0, -1), { ...prev[prev.length - 1], text: prev[prev.length - 1].text + token }]);
+      });
 
     } catch (error) {
       console.error("Error fetching from RakeAssist API:", error);
@@ -109,6 +121,7 @@ const RakeAssist = () => {
       setMessages(prev => [...prev, errorMessage]);
     } finally {
       setIsLoading(false);
+      setIsStreaming(false);
     }
   };
 
@@ -132,7 +145,7 @@ const RakeAssist = () => {
             {msg.text}
           </div>
         ))}
-        {isLoading && <div style={{...styles.message, ...styles.aiMessage}}>Thinking...</div>}
+        {isLoading && !isStreaming && <div style={{...styles.message, ...styles.aiMessage}}>Thinking...</div>}
       </div>
       <div style={styles.inputArea}>
         <input
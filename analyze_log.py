@@ -1,55 +1,113 @@
-import pandas as pd
+import argparse
+from kronos.log_index import LogIndex
 
 LOG_FILE = "monthly_simulation_log.csv"
 
-def show_final_status(df):
-    """Displays the final status of the fleet on the last day."""
-    print("\n--- FINAL FLEET STATUS (End of Day 30) ---")
-    final_day = df['simulation_day'].max()
-    final_df = df[df['simulation_day'] == final_day].copy()
-    
+# --- LOG ANALYTICS ---
+# Queries the simulation log through its persisted index (kronos/log_index.py): the log is
+# streamed once to build <log>.index.npz, journeys, days and the final status then read only
+# the indexed rows, and the aggregate reports are answered from the index alone.
+
+def show_final_status(index):
+    """Displays each train's last logged row."""
+    final_df = index.final_status()
+    print(f"\n--- FINAL FLEET STATUS (End of Day {final_df['simulation_day'].max()}) ---")
+
     # Clean up for display
     final_df['health_score'] = final_df['health_score'].round(1)
-    
+
     cols_to_show = [
-        'train_id', 'status', 'health_score', 'current_km', 'current_hours', 
+        'train_id', 'status', 'health_score', 'current_km', 'current_hours',
         'total_service_days_month', 'total_maintenance_days_month'
     ]
     print(final_df[cols_to_show].to_string(index=False))
 
-def track_train_progress(df, train_id):
-    """Filters the log to show the journey of a single train."""
-    train_df = df[df['train_id'] == train_id].copy()
-    
-    if train_df.empty:
+def track_train_progress(index, train_id):
+    """Shows the journey of a single train from its indexed rows."""
+    train_df = index.journey(train_id)
+
+    if train_df is None:
         print(f"\nError: Train ID '{train_id}' not found in the log.")
         return
-        
+
     print(f"\n--- Monthly Journey for {train_id} ---")
-    
+
     # Clean up for display
     train_df['health_score'] = train_df['health_score'].round(1)
-    
+
     cols_to_show = [
-        'simulation_day', 'status', 'health_score', 'current_km', 
+        'simulation_day', 'status', 'health_score', 'current_km',
         'consecutive_service_days'
     ]
     print(train_df[cols_to_show].to_string(index=False))
 
-if __name__ == "__main__":
-    try:
-        log_df = pd.read_csv(LOG_FILE)
-    except FileNotFoundError:
-        print(f"Error: Log file '{LOG_FILE}' not found.")
-        print("Please run the main simulation (run_simulation.py) first to generate the log.")
-        exit()
-        
-    show_final_status(log_df)
-    
+def show_summary(index):
+    """Service-day distribution, maintenance counts and km balance across the fleet."""
+    trains = index.train_summary()
+    print("\n--- SERVICE-DAY DISTRIBUTION ---")
+    distribution = trains['service_days'].value_counts().sort_index().rename_axis('service_days').reset_index(name='trains')
+    print(distribution.to_string(index=False))
+    print(f"Mean {trains['service_days'].mean():.1f}, min {trains['service_days'].min()}, max {trains['service_days'].max()} service days per train")
+
+    print("\n--- MAINTENANCE COUNTS ---")
+    maintenance = trains[['train_id', 'maintenance_days']].sort_values(['maintenance_days', 'train_id'], ascending=[False, True])
+    print(maintenance.to_string(index=False))
+    print(f"{trains['maintenance_days'].sum()} maintenance days across {int((trains['maintenance_days'] > 0).sum())} trains")
+
+    print("\n--- KM BALANCE ---")
+    trains['km_run'] = trains['last_km'] - trains['first_km']
+    trains['deviation_from_mean'] = (trains['last_km'] - trains['last_km'].mean()).round(0).astype(int)
+    print(trains.sort_values('last_km', ascending=False)[['train_id', 'last_km', 'km_run', 'deviation_from_mean']].to_string(index=False))
+    print(f"Spread {trains['last_km'].max() - trains['last_km'].min()} km (std {trains['last_km'].std():.0f} km) between the highest- and lowest-mileage trains")
+
+def show_days(index, day=None):
+    """Trains in each status per simulated day, or every train's row on `day`."""
+    if day is None:
+        print("\n--- DAILY ASSIGNMENTS ---")
+        print(index.day_summary().to_string(index=False))
+        return
+    day_df = index.day_rows(day)
+    if day_df is None:
+        print(f"\nError: Day {day} not found in the log.")
+        return
+    print(f"\n--- FLEET ON DAY {day} ---")
+    day_df['health_score'] = day_df['health_score'].round(1)
+    print(day_df[['train_id', 'status', 'health_score', 'current_km', 'consecutive_service_days']].to_string(index=False))
+
+def interactive(index):
+    show_final_status(index)
+
     # Interactive part to track a specific train
     while True:
         print("\n" + "-"*50)
         train_input = input("Enter a Train ID to track its monthly journey (e.g., Rake-05), or type 'exit' to quit: ")
         if train_input.lower() == 'exit':
             break
-        track_train_progress(log_df, train_input.strip())
+        track_train_progress(index, train_input.strip())
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Analyze the simulation log (interactive when no command is given).")
+    parser.add_argument("--log", default=LOG_FILE, help="simulation log CSV")
+    parser.add_argument("--rebuild-index", action="store_true", help="rescan the whole log instead of reusing or extending its index")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("final", help="each train's last logged status")
+    journey = commands.add_parser("journey", help="day-by-day rows of one or more trains")
+    journey.add_argument("train_ids", nargs="+")
+    commands.add_parser("summary", help="service-day distribution, maintenance counts and km balance")
+    days = commands.add_parser("days", help="trains in each status per day, or the fleet on one day")
+    days.add_argument("day", nargs="?", type=int)
+    args = parser.parse_args()
+
+    try:
+        index = LogIndex.open(args.log, rebuild=args.rebuild_index)
+    except FileNotFoundError:
+        print(f"Error: Log file '{args.log}' not found.")
+        print("Please run the main simulation (log_solver.py) first to generate the log.")
+        exit()
+
+    if args.command == "final": show_final_status(index)
+    elif args.command == "journey":
+        for train_id in args.train_ids: track_train_progress(index, train_id)
+    elif args.command == "summary": show_summary(index)
+    elif args.command == "days": show_days(index, args.day)
+    else: interactive(index)
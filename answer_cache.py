@@ -0,0 +1,80 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+# --- RAKEASSIST ANSWER CACHE ---
+# LRU + TTL cache for model answers. Identical questions asked while the first one is
+# still waiting on the model are coalesced onto that single upstream call.
+
+def normalize_question(question):
+    """Lower-cases, collapses whitespace and drops trailing punctuation so trivial rewordings share a cache entry."""
+    return re.sub(r'\s+', ' ', question.strip().lower()).rstrip(' ?!.')
+
+def answer_cache_key(question, day, train_ids, log_version):
+    return (normalize_question(question), day, tuple(sorted(set(train_ids))), log_version)
+
+class AnswerCache:
+    """Thread-safe LRU cache with a per-entry time-to-live and in-flight request coalescing."""
+
+    def __init__(self, max_entries=256, ttl_seconds=600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries = OrderedDict() # key -> (expires_at, value)
+        self._in_flight = {} # key -> Future shared by the coalesced callers
+        self.stats = {'hits': 0, 'misses': 0, 'coalesced': 0}
+
+    def get(self, key):
+        """Returns the cached value for `key`, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic(): return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry[1]
+
+    def put(self, key, value):
+        with self._lock: self._store(key, value)
+
+    def _store(self, key, value):
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries: self._entries.popitem(last=False)
+
+    def get_or_compute(self, key, compute, timeout=None):
+        """
+        Returns the cached value for `key`, joining an identical in-flight call or running `compute()` once.
+        A caller that joins waits at most `timeout` seconds and then raises TimeoutError; the call itself keeps running.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return entry[1]
+            future = self._in_flight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = self._in_flight[key] = Future()
+                self.stats['misses'] += 1
+            else:
+                self.stats['coalesced'] += 1
+        if not is_owner: return future.result(timeout=timeout)
+
+        try:
+            value = compute()
+        except Exception as e:
+            # Failures are shared with the waiting callers but never cached
+            with self._lock: self._in_flight.pop(key, None)
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self._store(key, value)
+            self._in_flight.pop(key, None)
+        future.set_result(value)
+        return value
+
+    def clear(self):
+        with self._lock: self._entries.clear()
@@ -1,27 +1,113 @@
+import gzip
+import hashlib
+import json
+import threading
+import time
 import pandas as pd
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 import os
 from dotenv import load_dotenv
-import google.generativeai as genai
 from datetime import datetime, timedelta
 import re # Import the regular expression module
+from log_store import DeltaLogStore, LogStore, SnapshotStore
+from answer_cache import AnswerCache, answer_cache_key
+from log_views import LogViews
 
 # --- Configuration ---
 load_dotenv()
 LOG_FILE = "monthly_simulation_log.csv"
+DELTA_LOG_FILE = "simulation_log.delta.jsonl"
+# "delta" (the default) reads DELTA_LOG_FILE, which has each day's scenario and the fleet the solver planned from;
+# "csv" reads LOG_FILE (post-update rows, no scenario); "database" answers from the fleet_snapshots table (KRONOS_DB_URL / DB_CONFIG), which holds the same rows as the delta log
+LOG_SOURCE = os.getenv("KRONOS_LOG_SOURCE", "delta")
+EXPLANATION_FILE = "daily_explanations.csv" # Per-day, per-train "why" records written by the simulators
 API_KEY = os.getenv("GEMINI_API_KEY")
+USE_STUB_MODEL = os.getenv("RAKEASSIST_STUB_MODEL") == "1" # Local canned model for tests and offline demos
+ANSWER_CACHE_SIZE = 256
+ANSWER_CACHE_TTL_SECONDS = 600
+MODEL_CONCURRENCY = 4 # Upstream model calls allowed at once; other requests keep being served meanwhile
+MODEL_TIMEOUT_SECONDS = 30 # Per-request budget for waiting on a model slot and for the model call itself
+COALESCED_WAIT_SECONDS = 2 * MODEL_TIMEOUT_SECONDS + 5 # A question joining an identical in-flight one waits out its slot wait and call, plus a margin
+STUB_MODEL_LATENCY_SECONDS = float(os.getenv("RAKEASSIST_STUB_LATENCY", "0")) # Simulated round-trip for offline load tests
+LOG_PAGE_SIZE = 50 # Default and maximum page sizes of the /log endpoints
+LOG_PAGE_MAX = 500
+LOG_CACHE_MAX_AGE_SECONDS = 30 # Browsers reuse a /log response this long, then revalidate it with its ETag
+LOG_RESPONSE_CACHE_SIZE = 256 # Encoded /log responses kept per (log version, query, encoding)
+GZIP_MIN_BYTES = 1024 # Smaller responses are sent uncompressed
 
 # --- We need the simulation parameters to calculate pace ---
 SIMULATION_START_DATE = datetime(2025, 9, 1)
 SIMULATION_MONTH_DAYS = 30
 DAILY_HOURS_PER_TRAIN = 16
 
-if not API_KEY:
-    raise ValueError("GEMINI_API_KEY not found. Please create a .env file with your key.")
+class StubModel:
+    """
+    Stands in for the Gemini model without a network call; mirrors generate_content(prompt, stream=..., request_options=...).
+    Answers take `latency_seconds`; past request_options["timeout"] the call raises TimeoutError instead.
+    """
+    class _Response:
+        def __init__(self, text): self.text = text
+
+    def __init__(self, latency_seconds=0.0):
+        self.latency_seconds = latency_seconds
+        self.calls = 0
+
+    def generate_content(self, prompt, stream=False, request_options=None):
+        self.calls += 1
+        question = re.search(r'\*\*Supervisor\'s Question:\*\* "(.*)"', prompt)
+        text = f"[stub answer] {question.group(1) if question else ''}"
+        timeout = (request_options or {}).get("timeout")
+        if not stream:
+            self._wait(self.latency_seconds, timeout)
+            return self._Response(text)
+        return self._stream(text, timeout)
+
+    def _stream(self, text, timeout):
+        words = text.split(" ")
+        step = self.latency_seconds / len(words)
+        for i, word in enumerate(words):
+            self._wait(step, timeout, elapsed=i * step)
+            yield self._Response(word if i == 0 else " " + word)
 
-genai.configure(api_key=API_KEY)
-model = genai.GenerativeModel('gemini-1.5-flash')
+    @staticmethod
+    def _wait(seconds, timeout, elapsed=0.0):
+        if timeout is not None and elapsed + seconds > timeout:
+            time.sleep(max(0.0, timeout - elapsed))
+            raise TimeoutError(f"the model did not answer within the {timeout}s request timeout")
+        time.sleep(seconds)
+
+# Created on the first question, so startup and /health never import or configure the model client
+_model = None
+_model_lock = threading.Lock()
+
+def get_model():
+    global _model
+    with _model_lock:
+        if _model is None:
+            if USE_STUB_MODEL:
+                _model = StubModel(STUB_MODEL_LATENCY_SECONDS)
+            else:
+                if not API_KEY:
+                    raise ValueError("GEMINI_API_KEY not found. Please create a .env file with your key.")
+                import google.generativeai as genai
+                genai.configure(api_key=API_KEY)
+                _model = genai.GenerativeModel('gemini-1.5-flash')
+        return _model
+
+# Loaded once, indexed by (simulation_day, train_id) and reloaded only when the file changes;
+# or queried per question from the (simulation_day, train_id)-keyed snapshot table
+if LOG_SOURCE == "database":
+    log_store, LOG_NAME = SnapshotStore(), "Snapshot table 'fleet_snapshots'"
+else:
+    log_store = DeltaLogStore(DELTA_LOG_FILE) if LOG_SOURCE == "delta" else LogStore(LOG_FILE)
+    LOG_NAME = f"Log file '{log_store.log_file}'"
+explanation_store = LogStore(EXPLANATION_FILE)
+# Answers keyed on (normalized question, day, train IDs, data version); identical in-flight questions share one call
+answer_cache = AnswerCache(ANSWER_CACHE_SIZE, ANSWER_CACHE_TTL_SECONDS)
+model_slots = threading.BoundedSemaphore(MODEL_CONCURRENCY)
+# Encoded /log responses; keys include the log version, so the TTL only bounds memory
+log_response_cache = AnswerCache(LOG_RESPONSE_CACHE_SIZE, ANSWER_CACHE_TTL_SECONDS)
 
 app = Flask(__name__)
 CORS(app)  # Allow requests from your React frontend
@@ -38,11 +124,11 @@ def extract_day_from_question(question, default_day=15):
         return int(match.group(1))
     return default_day
 
-def get_context_for_query(log_df, day, train_ids):
+def get_context_for_query(store, day, train_ids):
     """
     Finds the relevant rows and creates a rich summary for the AI.
     """
-    context_df = log_df[(log_df['simulation_day'] == day) & (log_df['train_id'].isin(train_ids))]
+    context_df = store.rows(day, train_ids)
     if context_df.empty:
         return "No data found for the specified trains on that day.", ""
     
@@ -64,28 +150,97 @@ def get_context_for_query(log_df, day, train_ids):
 
     return context_df.to_string(index=False), context_summary
 
-# --- The Main API Endpoint ---
-@app.route('/ask', methods=['POST'])
-def ask_rake_assist():
-    data = request.json
-    user_question = data.get('question')
+# Questions about a train's assignment are answered straight from the explanation records
+DIRECT_ANSWER_PATTERN = re.compile(r'\b(why|status|assigned|assignment|where|what happened)\b', re.IGNORECASE)
+CONSTRAINT_REASONS = {
+    'CERT_EXPIRED': "its telecom certificate had expired, which rules out service",
+    'CRITICAL_JOB_CARD': "it had an open CRITICAL job card, which rules out service",
+    'LOW_HEALTH': "its health score ({health:.1f}) was below the maintenance threshold ({threshold:.0f})",
+    'MANUAL_FORCE': "a supervisor flagged it for maintenance",
+}
 
-    if not user_question:
-        return jsonify({"error": "No question provided."}), 400
+def _ordinal(n):
+    n = int(n)
+    return f"{n}{'th' if 10 <= n % 100 <= 20 else {1: 'st', 2: 'nd', 3: 'rd'}.get(n % 10, 'th')}"
+
+def _cost_breakdown(record):
+    return (f"₹{int(record['net_service_cost']):,}: fatigue ₹{int(record['fatigue_cost']):,}, mileage ₹{int(record['mileage_cost']):,}, "
+            f"shunting ₹{int(record['shunt_cost']):,}, weather ₹{int(record['weather_cost']):,}, branding credit ₹{int(record['branding_penalty']):,}")
+
+def explain_record(record):
+    """Turns one explanation record into a plain-language answer for its train."""
+    status, constraints = record['status'], record['binding_constraint']
+    text = f"On Day {record['simulation_day']}, {record['train_id']} was assigned to: **{status}**."
+    if isinstance(constraints, str) and constraints:
+        reasons = [CONSTRAINT_REASONS[c].format(health=record['health_score'], threshold=record['maint_threshold']) for c in constraints.split(';')]
+        return text + f" This was forced because {' and '.join(reasons)}."
+    if status == 'MAINTENANCE':
+        return text + f" No rule forced it; the planner used it to fill a maintenance slot (health {record['health_score']:.1f})."
+    rank = f"it ranked {_ordinal(record['service_rank'])} of {record['service_candidates']} available trains by service cost ({_cost_breakdown(record)})"
+    if status == 'SERVICE':
+        return text + f" No rule forced it; {rank} and {record['trains_in_service']} trains were scheduled. It had been in service for {record['consecutive_service_days']} consecutive day(s) before that."
+    if record['service_rank'] <= record['trains_in_service']:
+        return text + f" No rule kept it out of service; {rank}, level with trains that were scheduled, so the planner could take either."
+    return text + f" No rule kept it out of service; {rank}, but only {record['trains_in_service']} trains were scheduled."
 
+def get_explanations(day, train_ids):
+    """Returns the explanation records for the trains on `day`, or None if any of them is missing."""
     try:
-        log_df = pd.read_csv(LOG_FILE)
+        records = explanation_store.rows(day, train_ids)
     except FileNotFoundError:
-        return jsonify({"error": f"Log file '{LOG_FILE}' not found."}), 500
+        return None
+    if set(records['train_id']) != set(train_ids): return None
+    return records.to_dict('records')
 
-    # NEW: Extract the day from the question
-    simulation_day = extract_day_from_question(user_question)
-    
-    mentioned_train_ids = [word for word in user_question.replace(",", " ").split() if 'Rake-' in word]
-    if not mentioned_train_ids:
-        return jsonify({"answer": "Please mention a specific train ID (e.g., Rake-03) in your question."})
+def direct_answer(user_question, simulation_day, mentioned_train_ids):
+    """Answers "why/status" questions deterministically from the explanation index; None means ask the model."""
+    if not DIRECT_ANSWER_PATTERN.search(user_question): return None
+    records = get_explanations(simulation_day, mentioned_train_ids)
+    if records is None: return None
+    return "\n".join(explain_record(record) for record in records)
 
-    context_data, context_summary = get_context_for_query(log_df, simulation_day, mentioned_train_ids)
+def data_version():
+    """Changes whenever the simulation log or the explanation index is rewritten."""
+    try:
+        explanations = explanation_store.version
+    except FileNotFoundError:
+        explanations = None
+    return (log_store.version, explanations)
+
+class ModelBusyError(Exception):
+    """No model slot became free within MODEL_TIMEOUT_SECONDS."""
+
+def call_model(prompt, stream=False):
+    """
+    Calls the model inside one of the MODEL_CONCURRENCY slots, with a MODEL_TIMEOUT_SECONDS budget.
+    Returns the answer text, or with stream=True a generator of text chunks that holds its slot until exhausted.
+    """
+    if not model_slots.acquire(timeout=MODEL_TIMEOUT_SECONDS):
+        raise ModelBusyError()
+    try:
+        response = get_model().generate_content(prompt, stream=stream, request_options={"timeout": MODEL_TIMEOUT_SECONDS})
+    except Exception:
+        model_slots.release()
+        raise
+    if not stream:
+        model_slots.release()
+        return response.text
+    return _stream_chunks(response)
+
+def _stream_chunks(response):
+    try:
+        for chunk in response: yield chunk.text
+    finally:
+        model_slots.release()
+
+def build_prompt(user_question, simulation_day, mentioned_train_ids):
+    """Builds the RakeAssist prompt, preferring the compact explanation records over the raw log rows."""
+    records = get_explanations(simulation_day, mentioned_train_ids)
+    if records is not None:
+        context_data = pd.DataFrame(records).drop(columns=['simulation_day']).fillna('').to_string(index=False)
+        context_summary = "".join(f"\n- {explain_record(record)}" for record in records)
+    else:
+        context_data, context_summary = get_context_for_query(log_store, simulation_day, mentioned_train_ids)
     days_remaining = SIMULATION_MONTH_DAYS - simulation_day + 1
 
     # --- This is the new, much smarter prompt ---
@@ -116,14 +271,190 @@ def ask_rake_assist():
     **Your Answer:**
     """
 
+    return prompt
+
+def generate_answer(user_question, simulation_day, mentioned_train_ids):
+    return call_model(build_prompt(user_question, simulation_day, mentioned_train_ids))
+
+def parse_question(data):
+    """Returns (question, day, train_ids, error_response) for an /ask request body."""
+    user_question = (data or {}).get('question')
+    if not user_question:
+        return None, None, None, (jsonify({"error": "No question provided."}), 400)
+
+    # NEW: Extract the day from the question
+    simulation_day = extract_day_from_question(user_question)
+    
+    mentioned_train_ids = re.findall(r'Rake-\d+', user_question)
+    if not mentioned_train_ids:
+        return None, None, None, jsonify({"answer": "Please mention a specific train ID (e.g., Rake-03) in your question."})
+    return user_question, simulation_day, mentioned_train_ids, None
+
+@app.route('/health', methods=['GET'])
+def health():
+    """Liveness check that touches neither the model nor the logs' contents."""
+    return jsonify({"status": "ok", "model_loaded": _model is not None,
+                    "log_source": LOG_SOURCE,
+                    "log_available": None if LOG_SOURCE == "database" else os.path.exists(log_store.log_file), "explanations_available": os.path.exists(EXPLANATION_FILE)})
+
+# --- Simulation Log Endpoints ---
+# Paged, projectable views of the simulation log so the dashboard can render a day without
+# downloading the month. Views are rebuilt only when the log version changes; responses
+# carry an ETag for (log version, query), are gzipped when the client accepts it, and may
+# be reused by the browser for LOG_CACHE_MAX_AGE_SECONDS before revalidating.
+
+_log_views = (None, None)
+_log_views_lock = threading.Lock()
+
+def get_log_views(version):
+    global _log_views
+    with _log_views_lock:
+        if _log_views[0] != version:
+            _log_views = (version, LogViews(log_store.log_df))
+        return _log_views[1]
+
+def paging_args():
+    """(offset, limit, fields) from ?offset=&limit=&fields=a,b; raises ValueError when out of range."""
+    offset = request.args.get('offset', 0, type=int)
+    limit = request.args.get('limit', LOG_PAGE_SIZE, type=int)
+    if offset < 0 or not 1 <= limit <= LOG_PAGE_MAX: raise ValueError(f"offset must be >= 0 and limit between 1 and {LOG_PAGE_MAX}.")
+    fields = [field.strip() for field in request.args.get('fields', '').split(',') if field.strip()]
+    return offset, limit, fields or None
+
+def log_response(build):
+    """
+    Serves `build(views)` as JSON. A LookupError from `build` becomes a 404 and a ValueError a 400;
+    a request whose If-None-Match matches the current ETag gets a 304 without building anything.
+    """
     try:
-        response = model.generate_content(prompt)
-        ai_answer = response.text
+        version = log_store.version
+    except FileNotFoundError:
+        return jsonify({"error": f"{LOG_NAME} not found."}), 404
+    etag = hashlib.sha1(repr((version, request.path, sorted(request.args.items(multi=True)))).encode()).hexdigest()
+    headers = {"ETag": f'"{etag}"', "Cache-Control": f"public, max-age={LOG_CACHE_MAX_AGE_SECONDS}", "Vary": "Accept-Encoding"}
+    if request.if_none_match.contains(etag): return Response(status=304, headers=headers)
+    use_gzip = 'gzip' in request.accept_encodings
+
+    def render():
+        try: payload, status = build(get_log_views(version)), 200
+        except LookupError as e: payload, status = {"error": str(e)}, 404
+        except ValueError as e: payload, status = {"error": str(e)}, 400
+        body = json.dumps(payload, separators=(',', ':')).encode()
+        compressed = use_gzip and len(body) >= GZIP_MIN_BYTES
+        return (gzip.compress(body) if compressed else body), status, compressed
+
+    body, status, compressed = log_response_cache.get_or_compute((etag, use_gzip), render)
+    response = Response(body, status=status, mimetype="application/json", headers=headers if status == 200 else {"Vary": "Accept-Encoding"})
+    if compressed: response.headers["Content-Encoding"] = "gzip"
+    return response
+
+@app.route('/log/days', methods=['GET'])
+def log_days():
+    """Per-day summaries (scenario, status counts, fleet health), paged with ?offset=&limit=."""
+    def build(views):
+        offset, limit, _ = paging_args()
+        return views.days(offset, limit)
+    return log_response(build)
+
+@app.route('/log/days/<int:day>', methods=['GET'])
+def log_day(day):
+    """One day's summary and plan with a page of its fleet rows; ?fields= projects the rows."""
+    def build(views):
+        offset, limit, fields = paging_args()
+        views.check_fields(fields)
+        result = views.day(day, fields, offset, limit)
+        if result is None: raise LookupError(f"Day {day} is not in the simulation log.")
+        return result
+    return log_response(build)
+
+@app.route('/log/trains/<train_id>', methods=['GET'])
+def log_train(train_id):
+    """One train's rows in day order, paged and projectable like /log/days/<day>."""
+    def build(views):
+        offset, limit, fields = paging_args()
+        views.check_fields(fields)
+        result = views.train(train_id, fields, offset, limit)
+        if result is None: raise LookupError(f"Train '{train_id}' is not in the simulation log.")
+        return result
+    return log_response(build)
+
+# --- The Main API Endpoint ---
+@app.route('/ask', methods=['POST'])
+def ask_rake_assist():
+    user_question, simulation_day, mentioned_train_ids, error_response = parse_question(request.json)
+    if error_response: return error_response
+    answer = direct_answer(user_question, simulation_day, mentioned_train_ids)
+    if answer: return jsonify({"answer": answer, "source": "explanation_index"})
+
+    try:
+        cache_key = answer_cache_key(user_question, simulation_day, mentioned_train_ids, data_version())
+    except FileNotFoundError:
+        return jsonify({"error": f"{LOG_NAME} not found."}), 500
+
+    try:
+        ai_answer = answer_cache.get_or_compute(cache_key, lambda: generate_answer(user_question, simulation_day, mentioned_train_ids), COALESCED_WAIT_SECONDS)
         return jsonify({"answer": ai_answer})
+    except FileNotFoundError:
+        return jsonify({"error": f"{LOG_NAME} not found."}), 500
+    except (ModelBusyError, TimeoutError): # The model call, or the identical call this question joined, ran out of time
+        return jsonify({"error": "RakeAssist is busy, please try again in a moment."}), 503
     except Exception as e:
         print(f"Error calling Gemini API: {e}")
         return jsonify({"error": "An error occurred while contacting the AI model."}), 500
 
-if __name__ == '__main__':
-    app.run(port=5001, debug=True)
+def _sse(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
 
+@app.route('/ask/stream', methods=['POST'])
+def ask_rake_assist_stream():
+    """
+    Same question handling as /ask, answered as Server-Sent Events while the model generates:
+    `token` events carry {"text": chunk}, then one `done` event (or an `error` event).
+    Cached answers are sent as a single token event; direct answers from the explanation index come back as JSON.
+    """
+    user_question, simulation_day, mentioned_train_ids, error_response = parse_question(request.json)
+    if error_response: return error_response
+    answer = direct_answer(user_question, simulation_day, mentioned_train_ids)
+    if answer: return jsonify({"answer": answer, "source": "explanation_index"})
+
+    try:
+        cache_key = answer_cache_key(user_question, simulation_day, mentioned_train_ids, data_version())
+        cached_answer = answer_cache.get(cache_key)
+        prompt = build_prompt(user_question, simulation_day, mentioned_train_ids) if cached_answer is None else None
+    except FileNotFoundError:
+        return jsonify({"error": f"{LOG_NAME} not found."}), 500
+
+    def generate():
+        if cached_answer is not None:
+            yield _sse("token", {"text": cached_answer})
+            yield _sse("done", {"cached": True})
+            return
+        chunks = []
+        try:
+            for chunk in call_model(prompt, stream=True):
+                chunks.append(chunk)
+                yield _sse("token", {"text": chunk})
+        except (ModelBusyError, TimeoutError):
+            yield _sse("error", {"error": "RakeAssist is busy, please try again in a moment."})
+            return
+        except Exception as e:
+            print(f"Error calling Gemini API: {e}")
+            yield _sse("error", {"error": "An error occurred while contacting the AI model."})
+            return
+        answer_cache.put(cache_key, "".join(chunks))
+        yield _sse("done", {"cached": False})
+
+    return Response(stream_with_context(generate()), mimetype="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+# --- Serving ---
+# `python api_server.py` starts Flask's development server, for local use only. In production
+# serve the app with threaded workers, so /ask/stream answers do not hold up other requests:
+#   pip install gunicorn
+#   gunicorn --worker-class gthread --workers 1 --threads 16 --bind 0.0.0.0:5001 --timeout 60 api_server:app
+# One process keeps a single answer cache, log index and set of MODEL_CONCURRENCY model slots;
+# more --workers multiply the model slots and give each worker its own caches.
+
+if __name__ == '__main__':
+    if not (USE_STUB_MODEL or API_KEY): print("Warning: GEMINI_API_KEY not found; questions the explanation index cannot answer will fail. Please create a .env file with your key.")
+    # Threaded: a slow model answer only occupies its own request thread and one of the model slots
+    app.run(port=5001, threaded=True)
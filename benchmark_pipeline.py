@@ -0,0 +1,178 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timedelta
+import numpy as np
+import ortools
+import pandas as pd
+from ortools.sat.python import cp_model
+from kronos import ENGINE_CONFIGS, Simulator, apply_fleet_schema, make_strategy
+from kronos.model_builder import compute_daily_coefficients, build_daily_model, extract_plan, explain_plan, make_solver, solve_stats
+from kronos.telemetry import timed
+
+# --- PLANNING PIPELINE BENCHMARK ---
+# Generates synthetic fleets far larger than fleet_data.csv and times every stage of the
+# nightly pipeline separately (health preprocessing, coefficients, CP-SAT model build,
+# solve, plan extraction and the state update) for each scenario. Results are written
+# as JSON tagged with the git commit so two runs can be compared with --compare.
+
+FLEET_SIZES = [25, 100, 500, 2000]
+SCENARIOS = ['NORMAL', 'HEAVY_MONSOON', 'FESTIVAL_SURGE']
+STAGES = ['preprocess', 'coefficients', 'model_build', 'solve', 'extraction', 'state_update']
+BASE_FLEET_SIZE = 25 # Fleet size the configured scenario modifiers were written for
+
+# Distributions modelled on fleet_data.csv
+FLEET_DISTRIBUTIONS = {
+    "cert_expiry_days": (-10, 480), # Relative to the simulation start; a few are already expired
+    "job_card_open_probability": 0.3,
+    "job_card_priorities": {'LOW': 0.4, 'MEDIUM': 0.35, 'CRITICAL': 0.25},
+    "branding_probability": 0.2,
+    "branding_target_hours": (40, 120),
+    "brake_models": {'ElectroBrake_v2': 0.6, 'HydroMech_v1': 0.4},
+    "km_mean": 50000, "km_std": 6000,
+    "km_since_bogie_service": (0, 8000), # Keeps most trains above the maintenance health threshold
+    "max_shunt_moves": 2,
+    "days_since_cleaned": (0, 10),
+}
+
+def synthetic_fleet(n_trains, rng, start_date, dist=FLEET_DISTRIBUTIONS):
+    """Master fleet data (the fleet_data.csv columns) for n_trains synthetic rakes."""
+    width = max(2, len(str(n_trains)))
+    job_open = rng.random(n_trains) < dist["job_card_open_probability"]
+    priorities = rng.choice(list(dist["job_card_priorities"]), n_trains, p=list(dist["job_card_priorities"].values()))
+    branded = rng.random(n_trains) < dist["branding_probability"]
+    current_km = np.maximum(0, rng.normal(dist["km_mean"], dist["km_std"], n_trains)).round(-2).astype(int)
+    low, high = dist["cert_expiry_days"]
+    clean_low, clean_high = dist["days_since_cleaned"]
+    df = pd.DataFrame({
+        'train_id': [f"Rake-{i:0{width}d}" for i in range(1, n_trains + 1)],
+        'cert_telecom_expiry': [start_date + timedelta(days=int(d)) for d in rng.integers(low, high, n_trains)],
+        'job_card_status': np.where(job_open, 'OPEN', 'CLOSED'),
+        'job_card_priority': np.where(job_open, priorities, 'NONE'),
+        'branding_sla_active': branded,
+        'current_km': current_km,
+        'target_km': 50000,
+        'last_cleaned_date': [start_date - timedelta(days=int(d)) for d in rng.integers(clean_low, clean_high + 1, n_trains)],
+        'stabling_shunt_moves': rng.integers(0, dist["max_shunt_moves"] + 1, n_trains),
+        'target_hours': np.where(branded, rng.integers(*dist["branding_target_hours"], n_trains), np.nan),
+        'current_hours': np.where(branded, 0.0, np.nan),
+        'brake_model': rng.choice(list(dist["brake_models"]), n_trains, p=list(dist["brake_models"].values())),
+        'bogie_last_service_km': np.maximum(0, current_km - rng.integers(*dist["km_since_bogie_service"], n_trains)),
+    })
+    return apply_fleet_schema(df)
+
+def fleet_state(master_df):
+    """Mid-life fleet state: master data as-is (open job cards, worn bogies) plus zeroed tracking columns."""
+    df = master_df.copy()
+    df[['target_hours', 'current_hours']] = df[['target_hours', 'current_hours']].fillna(0)
+    df['health_score'] = 100
+    for col in ['consecutive_service_days', 'total_service_days_month', 'total_maintenance_days_month']: df[col] = 0
+    return apply_fleet_schema(df)
+
+def scaled_modifiers(scenario_modifiers, n_trains, base_size=BASE_FLEET_SIZE):
+    """Scales the service and slot counts (written for the 25-rake fleet) to n_trains."""
+    scale = n_trains / base_size
+    return {name: {key: max(1, round(value * scale)) if key in ('MIN_SERVICE', 'MAX_SERVICE', 'MAINTENANCE_SLOTS') else value
+                   for key, value in modifiers.items()}
+            for name, modifiers in scenario_modifiers.items()}
+
+def benchmark_case(engine_name, initial_df, scenario, days, solver_profile):
+    """Runs `days` consecutive nights of one scenario and returns per-stage timings and solve stats for each."""
+    config = ENGINE_CONFIGS[engine_name]
+    config = {**config, 'scenario_modifiers': scaled_modifiers(config['scenario_modifiers'], len(initial_df)), 'planning_horizon_days': 1}
+    simulator = Simulator(config, make_strategy(config), scenarios=[scenario] * config['month_days'], manual_inputs={})
+    modifiers = simulator.modifiers[scenario]
+    state_df = initial_df.copy()
+    previous_plan, nights = None, []
+    for day in range(1, days + 1):
+        times = {}
+        fleet_df = timed(times, 'preprocess', simulator.preprocess, state_df, day)
+        weights = simulator.strategy.daily_weights(fleet_df, scenario, modifiers)
+        coeffs = timed(times, 'coefficients', compute_daily_coefficients, fleet_df, day, modifiers, weights, config['month_days'], config['daily_hours'])
+        model, is_in_service, is_in_maintenance = timed(times, 'model_build', build_daily_model, coeffs, modifiers, config['shortfall_penalty'], config['slot_penalty'], previous_plan)
+        solver = make_solver(solver_profile)
+        status = timed(times, 'solve', solver.Solve, model)
+        stats = solve_stats(solver, status)
+        if status not in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
+            nights.append({'day': day, 'times_s': times, 'status': stats['status']})
+            break
+        def extract():
+            plan = extract_plan(solver, coeffs, is_in_service, is_in_maintenance)
+            explain_plan(coeffs, plan, day)
+            return plan
+        plan = timed(times, 'extraction', extract)
+        state_df = timed(times, 'state_update', simulator.apply_daily_updates, fleet_df.copy(), plan, day)
+        previous_plan = plan
+        nights.append({'day': day, 'times_s': times, 'status': stats['status'], 'objective': stats['objective'],
+                       'gap': stats['gap'], 'branches': stats['branches'], 'service': len(plan['SERVICE'])})
+    return nights
+
+def summarize_case(nights):
+    """Median and max per stage over the benchmarked nights."""
+    summary = {}
+    for stage in STAGES:
+        values = [night['times_s'][stage] for night in nights if stage in night['times_s']]
+        if values: summary[stage] = {'median_s': float(np.median(values)), 'max_s': float(np.max(values))}
+    summary['total_median_s'] = float(sum(stage['median_s'] for stage in summary.values()))
+    return summary
+
+def _git_commit():
+    try: return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError): return None
+
+def run_benchmark(engine_name="new_solver", sizes=FLEET_SIZES, scenarios=SCENARIOS, days=3, solver_profile="sweep", seed=0):
+    start_date = ENGINE_CONFIGS[engine_name]['start_date']
+    cases = []
+    for n_trains in sizes:
+        initial_df = fleet_state(synthetic_fleet(n_trains, np.random.default_rng(seed), start_date))
+        for scenario in scenarios:
+            nights = benchmark_case(engine_name, initial_df, scenario, days, solver_profile)
+            cases.append({'fleet_size': n_trains, 'scenario': scenario, 'summary': summarize_case(nights), 'nights': nights})
+            print(f"{n_trains:>5} trains | {scenario:<15} | {format_summary(cases[-1]['summary'])}")
+    return {
+        'commit': _git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'engine': engine_name, 'solver_profile': solver_profile, 'days': days, 'seed': seed,
+        'machine': {'python': platform.python_version(), 'ortools': ortools.__version__, 'pandas': pd.__version__,
+                    'numpy': np.__version__, 'cpu_count': os.cpu_count(), 'platform': platform.platform()},
+        'cases': cases,
+    }
+
+def format_summary(summary):
+    return ", ".join(f"{stage} {summary[stage]['median_s'] * 1000:.1f}ms" for stage in STAGES if stage in summary)
+
+def compare_results(baseline, current):
+    """Prints the median per-stage ratio current/baseline for every case present in both runs."""
+    baseline_cases = {(c['fleet_size'], c['scenario']): c['summary'] for c in baseline['cases']}
+    print(f"\nComparing {current.get('commit')} against {baseline.get('commit')} (ratio < 1 is faster)")
+    for case in current['cases']:
+        old = baseline_cases.get((case['fleet_size'], case['scenario']))
+        if old is None: continue
+        ratios = [f"{stage} x{case['summary'][stage]['median_s'] / old[stage]['median_s']:.2f}"
+                  for stage in STAGES if stage in case['summary'] and stage in old and old[stage]['median_s'] > 0]
+        print(f"{case['fleet_size']:>5} trains | {case['scenario']:<15} | {', '.join(ratios)}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark each stage of the planning pipeline on synthetic fleets.")
+    parser.add_argument("--engine", default="new_solver", choices=list(ENGINE_CONFIGS), help="simulation configuration to benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=FLEET_SIZES, help="synthetic fleet sizes")
+    parser.add_argument("--scenarios", nargs="+", default=SCENARIOS, choices=SCENARIOS, help="scenarios to benchmark")
+    parser.add_argument("--days", type=int, default=3, help="consecutive nights per case (later nights are warm-started)")
+    parser.add_argument("--profile", default="sweep", help="solver profile (the default is deterministic, so runs are comparable)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the synthetic fleets")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON file for the results")
+    parser.add_argument("--compare", default=None, help="earlier results JSON to compare against")
+    args = parser.parse_args()
+    logging.basicConfig(stream=sys.stdout, format="%(message)s", level=logging.WARNING)
+
+    results = run_benchmark(args.engine, args.sizes, args.scenarios, args.days, args.profile, args.seed)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Benchmark results saved to '{args.output}'")
+    if args.compare:
+        with open(args.compare) as f:
+            compare_results(json.load(f), results)
@@ -0,0 +1,52 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+# --- STARTUP BUDGET CHECK ---
+# Times each entry point's cold start in a fresh interpreter (best of a few runs) and
+# fails when one exceeds its budget, so a new eager import of pandas, OR-Tools, sklearn
+# or a model file in the wrong place shows up before it reaches a process pool.
+
+STARTUP_BUDGETS_SECONDS = {
+    "import kronos": 0.1,
+    "import kronos.cli": 0.4, # argparse + numpy for the strategist names
+    "log_solver.py --help": 0.5,
+    "scenario_sweep.py --help": 1.5, # pandas + the fleet schema
+    "import api_server": 2.0, # Flask + pandas; the Gemini client is created on the first question
+}
+RUNS = 3
+
+def _command(check):
+    if check.startswith("import "): return [sys.executable, "-c", check]
+    script, *args = check.split()
+    return [sys.executable, script, *args]
+
+def time_startup(check, runs=RUNS):
+    """Best wall time over `runs` cold starts of `check`; raises CalledProcessError if it fails."""
+    env = {**os.environ, "RAKEASSIST_STUB_MODEL": "1"}
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(_command(check), cwd=cwd, env=env, check=True, capture_output=True)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the cold-start time of every entry point against its budget.")
+    parser.add_argument("--runs", type=int, default=RUNS, help="cold starts per entry point; the fastest counts")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget (e.g. 2 on a slow CI machine)")
+    args = parser.parse_args()
+
+    over_budget = []
+    for check, budget in STARTUP_BUDGETS_SECONDS.items():
+        elapsed = time_startup(check, args.runs)
+        ok = elapsed <= budget * args.scale
+        print(f"{'OK  ' if ok else 'SLOW'} {check:<28} {elapsed:.3f}s (budget {budget * args.scale:.2f}s)")
+        if not ok: over_budget.append(check)
+    if over_budget:
+        print(f"{len(over_budget)} entry point(s) over their startup budget: {', '.join(over_budget)}")
+        sys.exit(1)
@@ -1,16 +1,8 @@
-import pandas as pd
-
-def initialize_fleet_status(base_file="fleet_data.csv", output_file="fleet_status.csv"):
-    """
-    Creates the starting CSV file for a new month from the master data.
-    Resets all monthly tracking columns to their initial state.
-    """
-    try:
-        base_df = pd.read_csv(base_file)
-    except FileNotFoundError:
-        print(f"Error: Base data file '{base_file}' not found. Please ensure it exists.")
-        return
+from kronos.fleet_schema import apply_fleet_schema, load_fleet
 
+def build_initial_fleet_status(base_df):
+    """Returns a typed copy of the master fleet data with all monthly tracking columns reset."""
+    base_df = apply_fleet_schema(base_df)
     # Add/reset columns for the start of the month
     base_df['health_score'] = 100
     base_df['current_km'] = 0
@@ -26,8 +18,23 @@ def initialize_fleet_status(base_file="fleet_data.csv", output_file="fleet_statu
     
     # Fill NaN values in branding columns to prevent errors
     base_df[['target_hours', 'current_hours']] = base_df[['target_hours', 'current_hours']].fillna(0)
+    return apply_fleet_schema(base_df)
+
+def initialize_fleet_status(base_file="fleet_data.csv", output_file="fleet_status.csv"):
+    """
+    Creates the starting CSV file for a new month from the master data.
+    Resets all monthly tracking columns to their initial state.
+    """
+    try:
+        base_df = load_fleet(base_file)
+    except FileNotFoundError:
+        print(f"Error: Base data file '{base_file}' not found. Please ensure it exists.")
+        return
+    except ValueError as e:
+        print(f"Error: Invalid fleet data in '{base_file}': {e}")
+        return
 
-    final_df = base_df.copy()
+    final_df = build_initial_fleet_status(base_df)
     final_df.to_csv(output_file, index=False)
     print(f"Fleet status initialized with monthly stats tracking in '{output_file}'")
 
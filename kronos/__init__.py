@@ -0,0 +1,25 @@
+# --- KRONOS ENGINE PACKAGE ---
+# Fleet state, health scoring, CP-SAT model building and the daily simulation loop.
+# The solver scripts (new_solver.py, run_simulation.py, log_solver.py, new_log_solver.py)
+# are thin entry points that each run one of the configurations in kronos.configs.
+# Names are imported from their submodules on first access, so `import kronos` (and
+# `--help` on the scripts) does not pay for pandas, OR-Tools or the strategist model.
+
+import importlib
+
+_EXPORTS = {
+    'ENGINE_CONFIGS': 'kronos.configs',
+    'apply_fleet_schema': 'kronos.fleet_schema', 'load_fleet': 'kronos.fleet_schema',
+    'SimulationEngine': 'kronos.simulation_engine',
+    'Simulator': 'kronos.simulator', 'build_simulator': 'kronos.simulator',
+    'main': 'kronos.cli',
+    'SINKS': 'kronos.sinks', 'make_sinks': 'kronos.sinks',
+    'STRATEGIES': 'kronos.strategies', 'StaticStrategy': 'kronos.strategies', 'StrategistStrategy': 'kronos.strategies', 'make_strategy': 'kronos.strategies',
+}
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS: raise AttributeError(f"module 'kronos' has no attribute '{name}'")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
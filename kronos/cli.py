@@ -0,0 +1,62 @@
+import argparse
+import logging
+import sys
+import time
+from kronos.configs import ENGINE_CONFIGS
+from kronos.sinks import SINKS
+from kronos.strategies import STRATEGIES
+from kronos.telemetry import TELEMETRY_FORMATS, make_telemetry
+
+# --- COMMAND LINE ---
+# Parses the options before importing the simulator, so --help and bad arguments return
+# without loading pandas, OR-Tools or the strategist model.
+
+FLEET_SOURCES = ['csv', 'database']
+
+def parse_run_args(description, live_pacing_seconds, strategies=(), sinks=(), telemetry_formats=(), fleet_sources=()):
+    """
+    Command-line options shared by the simulation scripts. Runs are headless batch runs by
+    default; --live restores the demo pacing between simulated days. --strategy and
+    --log-sinks override the script's configured strategy source and log sinks; --telemetry
+    writes per-day stage timings and solver statistics (off by default); --fleet-source
+    database reads and commits the fleet state through the database instead of the CSV.
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--live", action="store_true", help=f"pause {live_pacing_seconds}s after each simulated day (demo mode)")
+    parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"], help="verbosity of the per-day output")
+    if strategies: parser.add_argument("--strategy", default=None, choices=strategies, help="source of the daily cost weights (default: the script's)")
+    if sinks: parser.add_argument("--log-sinks", default=None, type=lambda value: [s.strip() for s in value.split(",") if s.strip()], help=f"comma-separated log sinks from {', '.join(sinks)} (default: the script's)")
+    if fleet_sources: parser.add_argument("--fleet-source", default=None, choices=fleet_sources, help="where the fleet state is read from and committed to (default: the script's)")
+    if telemetry_formats:
+        parser.add_argument("--telemetry", default="off", choices=telemetry_formats, help="per-day stage timings and solver statistics as JSON lines or a Prometheus textfile")
+        parser.add_argument("--telemetry-file", default=None, help="telemetry output file (default: telemetry.jsonl or kronos.prom)")
+    args = parser.parse_args()
+    if sinks and args.log_sinks:
+        unknown = [s for s in args.log_sinks if s not in sinks]
+        if unknown: parser.error(f"unknown log sink(s): {', '.join(unknown)}")
+    args.pacing_seconds = live_pacing_seconds if args.live else 0
+    logging.basicConfig(stream=sys.stdout, format="%(message)s", level=args.log_level)
+    return args
+
+def main(engine_name):
+    """Command-line entry point shared by the simulation scripts."""
+    config = ENGINE_CONFIGS[engine_name]
+    args = parse_run_args(config['description'], config['live_pacing_seconds'], strategies=STRATEGIES, sinks=list(SINKS) + ['none'], telemetry_formats=list(TELEMETRY_FORMATS) + ['off'], fleet_sources=FLEET_SOURCES)
+    fleet_source = args.fleet_source or config['fleet_source']
+    sinks = args.log_sinks
+    if fleet_source == 'database' and 'database' not in (sinks or config['sinks']):
+        sinks = [*(sinks or config['sinks']), 'database'] # The database sink is what commits each day's state
+    from kronos.simulator import build_simulator, get_fleet_data, print_final_status
+    load_start = time.perf_counter()
+    initial_df = get_fleet_data(config['fleet_file'], fleet_source)
+    load_s = time.perf_counter() - load_start
+    if initial_df is None: sys.exit(1)
+    telemetry = make_telemetry(args.telemetry, args.telemetry_file)
+    if telemetry: telemetry.run_started(engine_name, len(initial_df), load_s)
+    try:
+        simulator = build_simulator(engine_name, args.strategy, sinks, telemetry=telemetry, overrides={'fleet_source': fleet_source})
+    except FileNotFoundError:
+        print(f"Error: '{config.get('strategist_model', 'strategy_model.joblib')}' not found. Please run train_weight_predictor.py first.")
+        sys.exit(1)
+    engine = simulator.run(initial_df, args.pacing_seconds)
+    print_final_status(engine.state)
@@ -0,0 +1,70 @@
+import os
+import shutil
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# --- COLUMNAR SIMULATION LOG ---
+# Append-only Parquet log partitioned by simulation_day (hive layout):
+#   simulation_log/simulation_day=1/part-0.parquet, simulation_day=2/..., ...
+# The writer flushes one partition per simulated day, so a run never holds the whole
+# month in memory; readers project columns and prune days/trains without a full load.
+
+DEFAULT_LOG_DIR = "simulation_log"
+DATE_COLUMNS = ['cert_telecom_expiry', 'last_cleaned_date']
+
+def build_day_log(state_df, plan, day, scenario):
+    """One log row per train: the post-update state plus the day, scenario and assigned status."""
+    log_df = state_df.copy()
+    log_df['simulation_day'] = day
+    log_df['scenario'] = scenario
+    log_df['status'] = 'STANDBY'
+    log_df.loc[log_df['train_id'].isin(plan['SERVICE']), 'status'] = 'SERVICE'
+    log_df.loc[log_df['train_id'].isin(plan['MAINTENANCE']), 'status'] = 'MAINTENANCE'
+    return log_df
+
+def _day_dir(log_dir, day):
+    return os.path.join(log_dir, f"simulation_day={day}")
+
+class ColumnarLogWriter:
+    """Streams one Parquet partition per simulated day; the first day's schema is kept for the run."""
+
+    def __init__(self, log_dir=DEFAULT_LOG_DIR, overwrite=True):
+        self.log_dir = log_dir
+        self.schema = None
+        if overwrite and os.path.isdir(log_dir): shutil.rmtree(log_dir)
+        os.makedirs(log_dir, exist_ok=True)
+
+    def write_day(self, day, log_df):
+        """Writes `log_df` (one row per train) as the partition for `day`, replacing any earlier write of that day."""
+        log_df = log_df.drop(columns=['simulation_day'], errors='ignore')
+        for col in DATE_COLUMNS:
+            if col in log_df.columns: log_df[col] = pd.to_datetime(log_df[col]).dt.date
+        table = pa.Table.from_pandas(log_df, preserve_index=False)
+        if self.schema is None: self.schema = table.schema
+        else: table = table.select(self.schema.names).cast(self.schema)
+        day_dir = _day_dir(self.log_dir, day)
+        os.makedirs(day_dir, exist_ok=True)
+        pq.write_table(table, os.path.join(day_dir, "part-0.parquet"))
+
+def log_days(log_dir=DEFAULT_LOG_DIR):
+    """Lists the simulated days present in the log from the partition names alone."""
+    if not os.path.isdir(log_dir): return []
+    return sorted(int(name.split("=", 1)[1]) for name in os.listdir(log_dir) if name.startswith("simulation_day="))
+
+def read_log(log_dir=DEFAULT_LOG_DIR, columns=None, days=None, train_ids=None):
+    """
+    Reads the log into a DataFrame, loading only the requested columns, days and trains.
+    simulation_day is always returned; day filters prune whole partitions.
+    """
+    if not os.path.isdir(log_dir): raise FileNotFoundError(log_dir)
+    dataset = ds.dataset(log_dir, format="parquet", partitioning="hive")
+    condition = None
+    if days is not None: condition = ds.field('simulation_day').isin(list(days))
+    if train_ids is not None:
+        train_condition = ds.field('train_id').isin(list(train_ids))
+        condition = train_condition if condition is None else condition & train_condition
+    if columns is not None: columns = ['simulation_day'] + [c for c in columns if c != 'simulation_day']
+    df = dataset.to_table(columns=columns, filter=condition).to_pandas()
+    return df.sort_values('simulation_day', kind='stable').reset_index(drop=True)
@@ -0,0 +1,115 @@
+from datetime import datetime
+
+# --- SIMULATION CONFIGURATIONS ---
+# One configuration per entry-point script. They share the calendar, fleet update and
+# solver settings and differ in where the daily cost weights come from (the "static"
+# constants or the joblib "strategist"), the scenario modifiers and calendars, and
+# which log sinks are written. See kronos.simulator.build_simulator.
+
+SIMULATION_START_DATE = datetime(2025, 9, 1)
+SIMULATION_MONTH_DAYS = 30
+
+def monthly_scenarios():
+    scenarios = ['NORMAL'] * SIMULATION_MONTH_DAYS
+    scenarios[6] = scenarios[7] = 'FESTIVAL_SURGE'
+    scenarios[12] = scenarios[13] = 'HEAVY_MONSOON'
+    scenarios[21] = 'FESTIVAL_SURGE'
+    return scenarios
+
+BASE_CONFIG = {
+    'start_date': SIMULATION_START_DATE,
+    'month_days': SIMULATION_MONTH_DAYS,
+    'daily_km': 200,
+    'daily_hours': 16,
+    'cert_validity_days': 365,
+    'slot_penalty': 1000000,
+    'shortfall_penalty': 5000000,
+    # Rolling-horizon lookahead: plan this many days in one model and commit only the first (1 = greedy daily solve)
+    'planning_horizon_days': 1,
+    'horizon_time_limit_seconds': 10.0,
+    # Warm-start each night's solve from the previous night's plan via CP-SAT hints
+    'warm_start': True,
+    'report_warm_start_timings': False, # Re-solves with and without hints and prints both timings
+    # CP-SAT parameter profile: "fast", "balanced" or "thorough" (see model_builder.SOLVER_PROFILES)
+    'solver_profile': "balanced",
+    # Fleet state stays in memory for the run; fleet_status.csv is checkpointed every K days (0 = only at the end)
+    'checkpoint_every_days': 0,
+    'fleet_file': "fleet_status.csv",
+    # "csv" reads and checkpoints fleet_file; "database" starts from the fleet_status table and commits every day to it (see kronos.database)
+    'fleet_source': "csv",
+    'scenarios': monthly_scenarios(),
+    'expired_penalty_per_day': 0, # Health points lost per day a certificate has been expired
+}
+
+# Fixed cost weights (new_solver.py)
+STATIC_CONFIG = {
+    **BASE_CONFIG,
+    'description': "Run the 30-day fleet simulation with fixed cost weights.",
+    'live_pacing_seconds': 0.5,
+    'strategy': "static",
+    'expired_penalty_per_day': 5, # Health score drops by 5 points for each day expired
+    'weights': {
+        'fatigue_factor': 500,
+        'cost_per_km': 5,
+        'branding_penalty': 50000,
+        'target_mileage': 200 * 22,
+        'maint_threshold': 50,
+        'shunt_cost': 500,
+        'bogie_service_interval_km': 25000,
+        'expired_cert_forces_maintenance': False,
+    },
+    'scenario_modifiers': {
+        "NORMAL": {"MIN_SERVICE": 15, "MAX_SERVICE": 18, "MAINTENANCE_SLOTS": 2},
+        "HEAVY_MONSOON": {"MIN_SERVICE": 15, "MAX_SERVICE": 18, "MAINTENANCE_SLOTS": 2, "WEATHER_PENALTY_OLD_BRAKES": 15000, "WEATHER_PENALTY_BOGIE_WEAR": 20000},
+        "FESTIVAL_SURGE": {"MIN_SERVICE": 18, "MAX_SERVICE": 20, "MAINTENANCE_SLOTS": 1},
+    },
+    # Ad-hoc supervisor inputs for specific days
+    'manual_inputs': {
+        5: {"Rake-12": {"health_penalty": 40, "reason": "Visual inspection shows damaged pantograph"}},
+        10: {"Rake-08": {"health_penalty": 15, "reason": "Minor graffiti on exterior panel reported"}},
+        15: {"Rake-19": {"force_maintenance": True, "reason": "Driver reported unusual noise from bogie"}},
+        20: {"Rake-04": {"health_penalty": 25, "reason": "Faulty door sensor reported"},
+             "Rake-16": {"force_maintenance": True, "reason": "Leak in HVAC unit"}},
+        25: {"Rake-01": {"force_maintenance": True, "reason": "Sudden failure of passenger information display"}},
+    },
+    'sinks': [],
+}
+
+# Daily cost weights predicted by the AI strategist (run_simulation.py, log_solver.py, new_log_solver.py)
+STRATEGIST_CONFIG = {
+    **BASE_CONFIG,
+    'description': "Run the 30-day AI-driven fleet simulation.",
+    'live_pacing_seconds': 0.1,
+    'strategy': "strategist",
+    'strategist_model': "strategy_model.joblib",
+    'strategist_compiled': True, # Evaluate the forests as flat arrays instead of through sklearn (identical predictions)
+    'strategist_health_quantum': None, # Round avg_fleet_health to this step before predicting so days share cached predictions (None = exact)
+    # Used for any weight the strategist does not predict
+    'weights': {
+        'fatigue_factor': 500,
+        'cost_per_km': 5,
+        'branding_penalty': 50000,
+        'target_mileage': 1400,
+        'maint_threshold': 50,
+        'shunt_cost': 400,
+        'expired_cert_forces_maintenance': True,
+    },
+    'scenario_modifiers': {
+        "NORMAL": {"MIN_SERVICE": 6, "MAX_SERVICE": 6, "MAINTENANCE_SLOTS": 2},
+        "HEAVY_MONSOON": {"MIN_SERVICE": 6, "MAX_SERVICE": 6, "MAINTENANCE_SLOTS": 2, "WEATHER_PENALTY_OLD_BRAKES": 15000},
+        "FESTIVAL_SURGE": {"MIN_SERVICE": 7, "MAX_SERVICE": 8, "MAINTENANCE_SLOTS": 1},
+    },
+    'manual_inputs': {
+        5: {"Rake-12": {"health_penalty": 40, "reason": "Visual inspection"}},
+        15: {"Rake-19": {"force_maintenance": True, "reason": "Driver report"}},
+    },
+    'sinks': ["explanations", "delta"],
+}
+
+ENGINE_CONFIGS = {
+    'new_solver': STATIC_CONFIG,
+    'run_simulation': STRATEGIST_CONFIG,
+    # One full log per run: the CSV log for analyze_log.py's byte-offset index, the delta log (the default) for everything else
+    'log_solver': {**STRATEGIST_CONFIG, 'description': "Run the 30-day AI-driven fleet simulation and write the CSV log.", 'sinks': ["explanations", "csv"]},
+    'new_log_solver': {**STRATEGIST_CONFIG, 'description': "Run the 30-day AI-driven fleet simulation and write the delta-encoded log."},
+}
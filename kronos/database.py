@@ -0,0 +1,298 @@
+import io
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+import pandas as pd
+
+# --- DATABASE ACCESS ---
+# One small connection pool per process, shared by setup_database.py, the simulation and
+# the API, plus a bulk loader. On PostgreSQL rows are streamed with COPY FROM STDIN from an
+# in-memory CSV buffer; upserts COPY into a temporary table and merge with
+# INSERT ... ON CONFLICT, so nothing has to be truncated. SQLite (KRONOS_DB_URL=sqlite:///path)
+# is a local stand-in with the same interface, loaded with executemany.
+
+DB_CONFIG = {
+    "dbname": os.getenv("KRONOS_DB_NAME", "kronos"),
+    "user": os.getenv("KRONOS_DB_USER", "your_postgres_user"),
+    "password": os.getenv("KRONOS_DB_PASSWORD", "your_postgres_password"),
+    "host": os.getenv("KRONOS_DB_HOST", "localhost"),
+    "port": os.getenv("KRONOS_DB_PORT", "5432"),
+}
+DB_URL = os.getenv("KRONOS_DB_URL") # "sqlite:///kronos.db" selects SQLite; unset uses DB_CONFIG on PostgreSQL
+POOL_MIN_CONNECTIONS = 1
+POOL_MAX_CONNECTIONS = 5
+LOAD_MODES = ['replace', 'upsert', 'append']
+
+class PostgresPool:
+    dialect = "postgres"
+    placeholder = "%s"
+
+    def __init__(self, config=DB_CONFIG, min_connections=POOL_MIN_CONNECTIONS, max_connections=POOL_MAX_CONNECTIONS):
+        from psycopg2.pool import ThreadedConnectionPool
+        self.pool = ThreadedConnectionPool(min_connections, max_connections, **config)
+
+    def getconn(self): return self.pool.getconn()
+    def putconn(self, conn): self.pool.putconn(conn)
+    def closeall(self): self.pool.closeall()
+
+class SQLitePool:
+    """Same interface over one SQLite file; connections are opened per checkout (they are thread-bound)."""
+    placeholder = "?"
+    dialect = "sqlite"
+
+    def __init__(self, path):
+        self.path = path
+
+    def getconn(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL") # Readers (the API) are not blocked while a run commits days
+        return conn
+    def putconn(self, conn): conn.close()
+    def closeall(self): pass
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool(url=None):
+    """The process-wide pool, created on first use from `url` (or KRONOS_DB_URL / DB_CONFIG)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            url = url or DB_URL
+            _pool = SQLitePool(url[len("sqlite:///"):]) if url and url.startswith("sqlite:///") else PostgresPool()
+        return _pool
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None: _pool.closeall()
+        _pool = None
+
+@contextmanager
+def connection(pool=None):
+    """A pooled connection that commits on success, rolls back on error and is always returned."""
+    pool = pool or get_pool()
+    conn = pool.getconn()
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        pool.putconn(conn)
+
+def create_table(conn, dialect, sql):
+    # SQLite has no SERIAL; an INTEGER PRIMARY KEY is its auto-incrementing rowid
+    if dialect == "sqlite": sql = sql.replace("SERIAL PRIMARY KEY", "INTEGER PRIMARY KEY")
+    cur = conn.cursor()
+    cur.execute(sql)
+    cur.close()
+
+def _rows(df):
+    """DataFrame rows as Python values: dates as ISO strings, NaN as None."""
+    df = df.copy()
+    for col in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[col]): df[col] = df[col].dt.strftime('%Y-%m-%d')
+        elif isinstance(df[col].dtype, pd.CategoricalDtype): df[col] = df[col].astype(object)
+    df = df.astype(object).where(df.notna(), None)
+    return [tuple(row) for row in df.itertuples(index=False, name=None)]
+
+def _copy_postgres(cur, table, df):
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False, date_format='%Y-%m-%d', na_rep='')
+    buffer.seek(0)
+    cur.copy_expert(f"COPY {table} ({', '.join(df.columns)}) FROM STDIN WITH (FORMAT csv, NULL '')", buffer)
+
+def bulk_load(conn, dialect, table, df, mode="replace", key=None):
+    """
+    Loads every row of `df` (its columns name the table columns) in one bulk operation:
+    "replace" empties the table first, "append" adds the rows, "upsert" inserts new keys and
+    updates existing ones (requires `key`, a column list with a unique constraint).
+    Returns the number of rows loaded.
+    """
+    if mode not in LOAD_MODES: raise ValueError(f"Unknown load mode '{mode}' (expected one of: {', '.join(LOAD_MODES)})")
+    if mode == "upsert" and not key: raise ValueError(f"Table '{table}' has no key to upsert on; use 'replace' or 'append'")
+    columns = list(df.columns)
+    cur = conn.cursor()
+    if mode == "replace":
+        cur.execute(f"DELETE FROM {table}" if dialect == "sqlite" else f"TRUNCATE TABLE {table} RESTART IDENTITY")
+
+    updates = ", ".join(f"{col} = EXCLUDED.{col}" for col in columns if col not in (key or []))
+    conflict = f" ON CONFLICT ({', '.join(key)}) DO UPDATE SET {updates}" if mode == "upsert" else ""
+    if dialect == "sqlite":
+        placeholders = ", ".join("?" for _ in columns)
+        cur.executemany(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}){conflict}", _rows(df))
+    elif mode == "upsert":
+        staging = f"{table}_staging"
+        cur.execute(f"CREATE TEMP TABLE {staging} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP")
+        _copy_postgres(cur, staging, df)
+        cur.execute(f"INSERT INTO {table} ({', '.join(columns)}) SELECT {', '.join(columns)} FROM {staging}{conflict}")
+    else:
+        _copy_postgres(cur, table, df)
+    cur.close()
+    return len(df)
+
+# --- FLEET STATE TABLES ---
+# fleet_status holds the latest committed fleet state (one row per train) and is what a
+# database-backed run starts from. fleet_snapshots keeps every simulated day's fleet as the
+# solver planned from it (pre-update, like the delta log) and the plan, keyed on (simulation_day, train_id), so the API answers a question with an
+# index lookup while a run is still writing later days. fleet_snapshot_version is a one-row
+# counter bumped in the same transaction as every day written, so readers can tell whether
+# the snapshots changed without scanning them.
+
+SQL_CREATE_FLEET_TABLE = """
+CREATE TABLE IF NOT EXISTS fleet_status (
+    train_id VARCHAR(10) PRIMARY KEY,
+    health_score DOUBLE PRECISION,
+    current_km INTEGER,
+    current_hours REAL,
+    job_card_status VARCHAR(50),
+    job_card_priority VARCHAR(50),
+    cert_telecom_expiry DATE,
+    branding_sla_active BOOLEAN,
+    target_km INTEGER,
+    target_hours REAL,
+    last_cleaned_date DATE,
+    stabling_shunt_moves INTEGER,
+    brake_model VARCHAR(50),
+    bogie_last_service_km INTEGER,
+    consecutive_service_days INTEGER,
+    total_service_days_month INTEGER,
+    total_maintenance_days_month INTEGER
+);
+"""
+# Tables created before target_km was stored (and with a single-precision health_score) are brought up to date in place
+SQL_MIGRATE_FLEET_TABLE = [
+    "ALTER TABLE fleet_status ADD COLUMN IF NOT EXISTS target_km INTEGER",
+    "ALTER TABLE fleet_status ALTER COLUMN health_score TYPE DOUBLE PRECISION",
+]
+FLEET_STATUS_COLUMNS = ['train_id', 'health_score', 'current_km', 'current_hours', 'job_card_status', 'job_card_priority', 'cert_telecom_expiry', 'branding_sla_active', 'target_km', 'target_hours', 'last_cleaned_date', 'stabling_shunt_moves', 'brake_model', 'bogie_last_service_km', 'consecutive_service_days', 'total_service_days_month', 'total_maintenance_days_month']
+
+SQL_CREATE_SNAPSHOT_TABLE = """
+CREATE TABLE IF NOT EXISTS fleet_snapshots (
+    simulation_day INTEGER NOT NULL,
+    train_id VARCHAR(10) NOT NULL,
+    scenario VARCHAR(20),
+    status VARCHAR(20),
+    health_score DOUBLE PRECISION,
+    current_km INTEGER,
+    current_hours REAL,
+    job_card_status VARCHAR(50),
+    job_card_priority VARCHAR(50),
+    cert_telecom_expiry DATE,
+    is_cert_expired BOOLEAN,
+    branding_sla_active BOOLEAN,
+    target_km INTEGER,
+    target_hours REAL,
+    last_cleaned_date DATE,
+    stabling_shunt_moves INTEGER,
+    brake_model VARCHAR(50),
+    bogie_last_service_km INTEGER,
+    km_since_last_service INTEGER,
+    manual_force_maintenance BOOLEAN,
+    consecutive_service_days INTEGER,
+    total_service_days_month INTEGER,
+    total_maintenance_days_month INTEGER,
+    written_at TIMESTAMP,
+    PRIMARY KEY (simulation_day, train_id)
+);
+"""
+SQL_CREATE_SNAPSHOT_VERSION_TABLE = """
+CREATE TABLE IF NOT EXISTS fleet_snapshot_version (
+    id INTEGER PRIMARY KEY,
+    version BIGINT NOT NULL
+);
+"""
+SQL_BUMP_SNAPSHOT_VERSION = ("INSERT INTO fleet_snapshot_version (id, version) VALUES (1, 1) "
+                             "ON CONFLICT (id) DO UPDATE SET version = fleet_snapshot_version.version + 1")
+SQL_CREATE_SNAPSHOT_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS fleet_snapshots_train_day ON fleet_snapshots (train_id, simulation_day)",
+    "CREATE INDEX IF NOT EXISTS fleet_snapshots_day_status ON fleet_snapshots (simulation_day, status)",
+]
+SNAPSHOT_COLUMNS = ['simulation_day', 'train_id', 'scenario', 'status', 'health_score', 'current_km', 'current_hours', 'job_card_status', 'job_card_priority',
+                    'cert_telecom_expiry', 'is_cert_expired', 'branding_sla_active', 'target_km', 'target_hours', 'last_cleaned_date', 'stabling_shunt_moves',
+                    'brake_model', 'bogie_last_service_km', 'km_since_last_service', 'manual_force_maintenance', 'consecutive_service_days',
+                    'total_service_days_month', 'total_maintenance_days_month', 'written_at']
+
+def create_snapshot_table(conn, dialect):
+    create_table(conn, dialect, SQL_CREATE_SNAPSHOT_TABLE)
+    create_table(conn, dialect, SQL_CREATE_SNAPSHOT_VERSION_TABLE)
+    for sql in SQL_CREATE_SNAPSHOT_INDEXES: create_table(conn, dialect, sql)
+
+def migrate_fleet_table(conn, dialect):
+    """Adds the columns a fleet_status table from an older setup_database.py is missing; a no-op on a current table."""
+    cur = conn.cursor()
+    if dialect == "sqlite":
+        # SQLite has no ADD COLUMN IF NOT EXISTS or ALTER COLUMN TYPE; its REAL is already double precision
+        cur.execute("PRAGMA table_info(fleet_status)")
+        if 'target_km' not in [row[1] for row in cur.fetchall()]: cur.execute("ALTER TABLE fleet_status ADD COLUMN target_km INTEGER")
+    else:
+        for sql in SQL_MIGRATE_FLEET_TABLE: cur.execute(sql)
+    cur.close()
+
+def fleet_status_rows(fleet_df):
+    """The fleet_status table's columns, with the simulation-state columns defaulted when absent."""
+    fleet_df = fleet_df.copy()
+    for col, default in [('health_score', 100), ('current_km', 0), ('current_hours', 0), ('consecutive_service_days', 0), ('total_service_days_month', 0), ('total_maintenance_days_month', 0)]:
+        if col not in fleet_df.columns: fleet_df[col] = default
+    return fleet_df[FLEET_STATUS_COLUMNS]
+
+def snapshot_rows(day, scenario, plan, fleet_df):
+    """One fleet_snapshots row per train: the pre-update state and the train's assignment for `day`."""
+    snapshot_df = fleet_df.copy()
+    snapshot_df['simulation_day'] = day
+    snapshot_df['scenario'] = scenario
+    snapshot_df['status'] = 'STANDBY'
+    snapshot_df.loc[snapshot_df['train_id'].isin(plan['SERVICE']), 'status'] = 'SERVICE'
+    snapshot_df.loc[snapshot_df['train_id'].isin(plan['MAINTENANCE']), 'status'] = 'MAINTENANCE'
+    snapshot_df['written_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')
+    for col in SNAPSHOT_COLUMNS:
+        if col not in snapshot_df.columns: snapshot_df[col] = None
+    return snapshot_df[SNAPSHOT_COLUMNS]
+
+def write_day(pool, day, scenario, plan, fleet_df, updated_df):
+    """Stores `day`'s snapshot of `fleet_df`, makes `updated_df` the current fleet_status and bumps the snapshot version, in one transaction."""
+    with connection(pool) as conn:
+        bulk_load(conn, pool.dialect, 'fleet_snapshots', snapshot_rows(day, scenario, plan, fleet_df), "upsert", key=['simulation_day', 'train_id'])
+        bulk_load(conn, pool.dialect, 'fleet_status', fleet_status_rows(updated_df), "upsert", key=['train_id'])
+        cur = conn.cursor()
+        cur.execute(SQL_BUMP_SNAPSHOT_VERSION)
+        cur.close()
+
+def read_fleet(pool=None):
+    """The fleet_status table in the typed fleet schema; raises ValueError if it is empty or invalid."""
+    from kronos.fleet_schema import apply_fleet_schema
+    pool = pool or get_pool()
+    with connection(pool) as conn:
+        fleet_df = pd.read_sql_query("SELECT * FROM fleet_status ORDER BY train_id", conn)
+    if fleet_df.empty: raise ValueError("the fleet_status table is empty; run setup_database.py first")
+    return apply_fleet_schema(fleet_df)
+
+def read_snapshots(day, train_ids, pool=None):
+    """fleet_snapshots rows for `train_ids` on `day` (a primary-key lookup per train)."""
+    pool = pool or get_pool()
+    train_ids = sorted(set(train_ids))
+    if not train_ids: return pd.DataFrame(columns=SNAPSHOT_COLUMNS)
+    ph = pool.placeholder
+    sql = f"SELECT * FROM fleet_snapshots WHERE simulation_day = {ph} AND train_id IN ({', '.join(ph for _ in train_ids)}) ORDER BY train_id"
+    with connection(pool) as conn:
+        return pd.read_sql_query(sql, conn, params=[day, *train_ids])
+
+def read_snapshot_log(pool=None):
+    """Every fleet_snapshots row in (simulation_day, train_id) order, without the write timestamps."""
+    pool = pool or get_pool()
+    with connection(pool) as conn:
+        return pd.read_sql_query("SELECT * FROM fleet_snapshots ORDER BY simulation_day, train_id", conn).drop(columns=['written_at'])
+
+def snapshot_version(pool=None):
+    """The fleet_snapshot_version counter (0 before any day is written); changes whenever a run commits a day."""
+    pool = pool or get_pool()
+    with connection(pool) as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT version FROM fleet_snapshot_version WHERE id = 1")
+        row = cur.fetchone()
+        cur.close()
+    return row[0] if row else 0
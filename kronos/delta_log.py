@@ -0,0 +1,147 @@
+import json
+import threading
+import numpy as np
+import pandas as pd
+
+# --- DELTA-ENCODED SIMULATION LOG ---
+# JSON lines: a header naming the columns, then one record per simulated day with its
+# scenario. A keyframe day stores every train's full row (the first day, every
+# `keyframe_every` days and whenever the set of trains changes); every other day stores
+# only the fields that changed since the day before, {column: [[row, value], ...]} with
+# rows numbered in keyframe order. Static attributes (brake model, target km, ...) are
+# therefore written once per keyframe, and a reader moves from one day to the next by
+# applying that day's changes. The plan is not stored: it is the rows' status column.
+
+DELTA_LOG_FILE = "simulation_log.delta.jsonl"
+FORMAT = "kronos-delta-log"
+VERSION = 1
+PLAN_CATEGORIES = ['SERVICE', 'MAINTENANCE', 'STANDBY']
+
+def _json_frame(df):
+    """Columns as JSON-ready object arrays: dates as ISO strings, NaN as None, NumPy scalars as Python values."""
+    values = {}
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_datetime64_any_dtype(series): series = series.dt.strftime('%Y-%m-%d')
+        array = series.astype(object).to_numpy(copy=True)
+        array[pd.isna(array)] = None
+        values[col] = array
+    return values
+
+class DeltaLogWriter:
+    """Streams one JSON line per simulated day; a run never holds more than the previous day's rows."""
+
+    def __init__(self, file_path=DELTA_LOG_FILE, keyframe_every=0):
+        self.file_path = file_path
+        self.keyframe_every = keyframe_every # 0 = keyframe only on the first day (and when trains change)
+        self.file = open(file_path, 'w')
+        self.columns = None
+        self.previous = None # (train_ids, {column: values}) of the last written day
+
+    def _write(self, record):
+        self.file.write(json.dumps(record, separators=(',', ':')) + "\n")
+
+    def write_day(self, day, scenario, log_df):
+        """Writes `log_df` (one row per train, keyed on train_id, with its status) as the state for `day`."""
+        if self.columns is None:
+            self.columns = list(log_df.columns)
+            self._write({"format": FORMAT, "version": VERSION, "key": "train_id", "columns": self.columns})
+        values = _json_frame(log_df[self.columns])
+        train_ids = values['train_id']
+        record = {"day": day, "scenario": scenario}
+        keyframe = (self.previous is None or (self.keyframe_every and day % self.keyframe_every == 0)
+                    or len(train_ids) != len(self.previous[0]) or (train_ids != self.previous[0]).any())
+        if keyframe:
+            record["rows"] = [list(row) for row in zip(*(values[col] for col in self.columns))]
+        else:
+            changes = {}
+            for col in self.columns:
+                rows = np.flatnonzero(values[col] != self.previous[1][col])
+                if len(rows): changes[col] = [[int(i), values[col][i]] for i in rows]
+            record["changes"] = changes
+        self._write(record)
+        self.file.flush()
+        self.previous = (train_ids, values)
+
+    def close(self):
+        self.file.close()
+
+class DeltaLogReader:
+    """
+    Reconstructs any day's full snapshot from a delta log. The reader keeps the last
+    reconstructed day, so stepping forward applies only the new days' changes; going back
+    restarts from the nearest keyframe at or before the requested day.
+    """
+
+    def __init__(self, file_path=DELTA_LOG_FILE):
+        with open(file_path) as f:
+            header = json.loads(f.readline())
+            if header.get("format") != FORMAT: raise ValueError(f"'{file_path}' is not a delta-encoded simulation log")
+            self.records = [json.loads(line) for line in f if line.strip()]
+        self.columns, self.key = header["columns"], header["key"]
+        self.day_index = {record["day"]: i for i, record in enumerate(self.records)}
+        self.scenarios = {record["day"]: record["scenario"] for record in self.records}
+        self.keyframes = [i for i, record in enumerate(self.records) if "rows" in record]
+        self._lock = threading.Lock()
+        self._position = None # Index of the record self._state reflects
+        self._state = [] # One row (a list in column order) per train, in keyframe order
+        self._rows = {} # train_id -> position in self._state
+
+    @property
+    def days(self):
+        return [record["day"] for record in self.records]
+
+    def entry(self, day):
+        """The day's scenario and plan, the plan rebuilt from the status column."""
+        status, key = self.columns.index('status'), self.columns.index(self.key)
+        with self._lock:
+            self._seek(day)
+            plan = {category: [] for category in PLAN_CATEGORIES}
+            for row in self._state: plan[row[status]].append(row[key])
+        return {"day": day, "scenario": self.scenarios[day], "plan": plan}
+
+    def _apply(self, record):
+        if "rows" in record:
+            key = self.columns.index(self.key)
+            self._state = [list(row) for row in record["rows"]]
+            self._rows = {row[key]: i for i, row in enumerate(self._state)}
+        else:
+            for col, changes in record["changes"].items():
+                col = self.columns.index(col)
+                for i, value in changes: self._state[i][col] = value
+
+    def _seek(self, day):
+        target = self.day_index[day] # KeyError for a day that is not in the log
+        keyframe = max(i for i in self.keyframes if i <= target)
+        start = self._position + 1 if self._position is not None and keyframe <= self._position <= target else keyframe
+        for i in range(start, target + 1): self._apply(self.records[i])
+        self._position = target
+
+    def _frame(self, rows, days):
+        df = pd.DataFrame(rows, columns=self.columns)
+        df['simulation_day'] = days
+        df['scenario'] = df['simulation_day'].map(self.scenarios)
+        return df
+
+    def snapshot(self, day):
+        """Every train's row on `day`, as the sink logged it (the fleet the solver planned `day` from)."""
+        with self._lock:
+            self._seek(day)
+            return self._frame(self._state, day)
+
+    def rows(self, day, train_ids):
+        """Rows for `train_ids` on `day` (unknown days and trains are skipped)."""
+        if day not in self.day_index: return self._frame([], day)
+        with self._lock:
+            self._seek(day)
+            return self._frame([self._state[self._rows[tid]] for tid in dict.fromkeys(train_ids) if tid in self._rows], day)
+
+    def to_frame(self):
+        """The whole log expanded to one row per train per day, in one pass over the records."""
+        rows, days = [], []
+        with self._lock:
+            for day in self.days:
+                self._seek(day)
+                rows.extend(list(row) for row in self._state)
+                days.extend([day] * len(self._state))
+        return self._frame(rows, days)
@@ -0,0 +1,76 @@
+import pandas as pd
+from pandas.api.types import CategoricalDtype
+
+# --- FLEET STATE SCHEMA ---
+# One typed, validated representation of the fleet state shared by initialize_month.py,
+# the solver scripts, the scenario sweep and setup_database.py: categoricals for the
+# status/priority/brake columns, fixed-width integers for km and counters, bool flags
+# and date columns parsed once. health_score stays float64 because it is compared
+# against fractional maintenance thresholds and truncated into solver costs.
+
+JOB_CARD_STATUS = CategoricalDtype(['CLOSED', 'OPEN'])
+JOB_CARD_PRIORITY = CategoricalDtype(['NONE', 'LOW', 'MEDIUM', 'CRITICAL'])
+
+# Master fleet data columns (fleet_data.csv); all are required
+FLEET_COLUMNS = {
+    'train_id': 'str',
+    'cert_telecom_expiry': 'datetime64[s]',
+    'job_card_status': JOB_CARD_STATUS,
+    'job_card_priority': JOB_CARD_PRIORITY,
+    'branding_sla_active': 'bool',
+    'current_km': 'int32',
+    'target_km': 'int32',
+    'last_cleaned_date': 'datetime64[s]',
+    'stabling_shunt_moves': 'int32',
+    'target_hours': 'float32',
+    'current_hours': 'float32',
+    'brake_model': 'category',
+    'bogie_last_service_km': 'int32',
+}
+# Monthly tracking and per-day derived columns, typed when present
+STATE_COLUMNS = {
+    'health_score': 'float64',
+    'consecutive_service_days': 'int32',
+    'total_service_days_month': 'int32',
+    'total_maintenance_days_month': 'int32',
+    'is_cert_expired': 'bool',
+    'km_since_last_service': 'int32',
+    'manual_force_maintenance': 'bool',
+}
+BOOL_TEXT = {'true': True, 'false': False, '1': True, '0': False}
+
+def _to_bool(series, col):
+    if pd.api.types.is_bool_dtype(series): return series
+    parsed = series.astype(str).str.strip().str.lower().map(BOOL_TEXT)
+    if parsed.isna().any():
+        raise ValueError(f"Column '{col}' has values that are not booleans: {sorted(series[parsed.isna()].astype(str).unique())}")
+    return parsed.astype(bool)
+
+def apply_fleet_schema(df):
+    """Returns a copy of `df` with the fleet schema applied; raises ValueError on missing columns or invalid values."""
+    missing = [col for col in FLEET_COLUMNS if col not in df.columns]
+    if missing: raise ValueError(f"Fleet data is missing columns: {', '.join(missing)}")
+    if df['train_id'].duplicated().any():
+        raise ValueError(f"Duplicate train_id values: {sorted(df.loc[df['train_id'].duplicated(), 'train_id'].unique())}")
+
+    df = df.copy()
+    for col, dtype in {**FLEET_COLUMNS, **STATE_COLUMNS}.items():
+        if col not in df.columns: continue
+        if dtype == 'bool':
+            df[col] = _to_bool(df[col], col)
+        elif str(dtype).startswith('datetime64'):
+            df[col] = pd.to_datetime(df[col]).astype(dtype)
+        elif isinstance(dtype, CategoricalDtype) and dtype.categories is not None:
+            unknown = ~df[col].isin(dtype.categories)
+            if unknown.any(): raise ValueError(f"Column '{col}' has unknown values: {sorted(df.loc[unknown, col].astype(str).unique())}")
+            df[col] = df[col].astype(dtype)
+        elif str(dtype).startswith('int'):
+            if df[col].isna().any(): raise ValueError(f"Column '{col}' has missing values")
+            df[col] = df[col].astype(dtype)
+        else:
+            df[col] = df[col].astype(dtype)
+    return df
+
+def load_fleet(file_path):
+    """Reads a fleet CSV (master data or a fleet_status checkpoint) into the typed fleet schema."""
+    return apply_fleet_schema(pd.read_csv(file_path))
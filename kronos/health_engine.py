@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+# --- INCREMENTAL HEALTH ENGINE ---
+# Keeps the health score's components as per-train arrays between days and only
+# recomputes the entries whose inputs changed:
+#   health = 100 - mileage wear - fatigue - cert expiry - job card - manual penalty
+# The components are subtracted in the same order as the original per-column
+# formula, so the scores are bit-for-bit identical to a full recomputation.
+
+JOB_CARD_PENALTIES = {'LOW': 10, 'MEDIUM': 20, 'CRITICAL': 50}
+
+class HealthEngine:
+    """Incrementally maintained health scores for one fleet (resets itself if the fleet changes)."""
+
+    def __init__(self, expired_penalty_per_day=0, job_card_penalties=JOB_CARD_PENALTIES):
+        self.expired_penalty_per_day = expired_penalty_per_day
+        self.job_card_penalties = job_card_penalties
+        self.train_ids = None
+
+    def _reset(self, train_ids):
+        n = len(train_ids)
+        self.train_ids = train_ids
+        self.position = {tid: i for i, tid in enumerate(train_ids)}
+        # Cached inputs; None forces the first update to compute every train
+        self.inputs = {'km_since': None, 'consecutive': None, 'expiry': None, 'job_status': None, 'job_priority': None}
+        self.wear, self.fatigue, self.expired, self.job_card, self.manual = (np.zeros(n) for _ in range(5))
+        self.manual_force = np.zeros(n, dtype=bool)
+        self.manual_trains = []
+
+    def _changed(self, name, values):
+        """Positions whose input differs from the cached one; updates the cache."""
+        cached = self.inputs[name]
+        self.inputs[name] = values.copy()
+        if cached is None: return np.arange(len(values))
+        return np.flatnonzero(cached != values)
+
+    def score(self, df, today, manual_inputs):
+        """Sets df['health_score'] and df['manual_force_maintenance'] for `today` and returns df."""
+        train_ids = df['train_id'].to_numpy()
+        if self.train_ids is None or len(train_ids) != len(self.train_ids) or not (train_ids == self.train_ids).all():
+            self._reset(train_ids.copy())
+
+        km_since = (df['current_km'] - df['bogie_last_service_km']).to_numpy()
+        changed = self._changed('km_since', km_since)
+        self.wear[changed] = km_since[changed] / 200
+
+        if 'consecutive_service_days' in df.columns:
+            consecutive = df['consecutive_service_days'].to_numpy()
+            changed = self._changed('consecutive', consecutive)
+            self.fatigue[changed] = consecutive[changed]
+
+        if self.expired_penalty_per_day:
+            expiry = df['cert_telecom_expiry'].to_numpy(dtype='datetime64[ns]')
+            changed = self._changed('expiry', expiry)
+            self.expired[changed] = 0 # Renewed certificates stop accruing
+            # The penalty of every expired train grows daily
+            expired = np.flatnonzero(expiry < np.datetime64(pd.Timestamp(today)))
+            days_expired = (np.datetime64(pd.Timestamp(today)) - expiry[expired]).astype('timedelta64[D]').astype(np.int64)
+            self.expired[expired] = days_expired * self.expired_penalty_per_day
+
+        job_status, job_priority = df['job_card_status'].to_numpy(), df['job_card_priority'].to_numpy()
+        changed = np.union1d(self._changed('job_status', job_status), self._changed('job_priority', job_priority))
+        for i in changed:
+            self.job_card[i] = self.job_card_penalties.get(job_priority[i], 0) if job_status[i] == 'OPEN' else 0
+
+        # Manual overrides only last for the day they are entered
+        for i in self.manual_trains:
+            self.manual[i] = 0
+            self.manual_force[i] = False
+        self.manual_trains = []
+        for train_id, override in manual_inputs.items():
+            i = self.position.get(train_id)
+            if i is None: continue
+            if 'health_penalty' in override: self.manual[i] += override['health_penalty']
+            if 'force_maintenance' in override: self.manual_force[i] = True
+            self.manual_trains.append(i)
+
+        health = 100.0 - self.wear
+        if 'consecutive_service_days' in df.columns: health = health - self.fatigue
+        if self.expired_penalty_per_day: health = health - self.expired
+        health = (health - self.job_card) - self.manual
+        df['health_score'] = np.clip(health, 0, None)
+        df['manual_force_maintenance'] = self.manual_force.copy()
+        return df
@@ -0,0 +1,172 @@
+import math
+import time
+from datetime import timedelta
+import numpy as np
+import pandas as pd
+from ortools.sat.python import cp_model
+from kronos.health_engine import JOB_CARD_PENALTIES
+from kronos.model_builder import column_or_default, compute_daily_coefficients, extract_plan, explain_plan, add_plan_hints, make_solver, solve_stats
+
+# --- ROLLING-HORIZON PLANNER ---
+# Builds one CP-SAT model over the next N days and commits only the first day's plan.
+# Day 1 reuses the exact daily coefficients from model_builder; every later day carries
+# the fleet state forward, mirroring simulation_engine.apply_plan:
+#   - service adds DAILY_KM to current_km and DAILY_HOURS to branded hours,
+#   - consecutive service days grow on service and reset to 0 otherwise,
+#   - maintenance resets km-since-bogie-service and renews an expired certificate.
+# A train's state on a later day depends only on its own earlier assignments, so each
+# train's feasible schedules over the horizon (at most 3^N) are enumerated up front with
+# their exact cost, and the model picks one schedule per train subject to the daily
+# service and maintenance counts. The model is linear with no state variables, and its
+# LP relaxation is tight enough to prove a 3-day plan optimal in a fraction of a second.
+# Enumeration grows as 3^N per train, so the horizon is capped at MAX_HORIZON_DAYS and the
+# time spent enumerating is charged to the same time limit as the solve.
+
+OBJECTIVE_SCALE = 100 # Fractional per-km and run-rate costs become integer coefficients
+STATES = ('SERVICE', 'MAINTENANCE', 'STANDBY')
+MAX_HORIZON_DAYS = 5 # 243 schedules per train; a 5-day month solves in about a minute on one core
+
+def solve_horizon_optimization(fleet_df, start_day, day_modifiers, day_manual_inputs, weights, sim_config, time_limit_seconds=10.0, previous_plan=None, solver_profile="balanced"):
+    """
+    Plans len(day_modifiers) days starting at start_day and returns (plan, cost, stats) for start_day only.
+    `fleet_df` must already be preprocessed for start_day; `day_manual_inputs[t]` holds the
+    supervisor overrides for horizon day t (entry 0 is already reflected in fleet_df).
+    `previous_plan` (last night's plan) is hinted on every horizon day as a warm start;
+    `time_limit_seconds` overrides the time budget of `solver_profile` and also covers building
+    the model; if it runs out while enumerating schedules the plan is None with status 'TIME_LIMIT'.
+    """
+    deadline = time.perf_counter() + time_limit_seconds
+    S = OBJECTIVE_SCALE
+    horizon = len(day_modifiers)
+    if not 1 <= horizon <= MAX_HORIZON_DAYS: raise ValueError(f"Planning horizon of {horizon} days is outside 1..{MAX_HORIZON_DAYS}")
+    month_days, daily_km, daily_hours = sim_config['month_days'], sim_config['daily_km'], sim_config['daily_hours']
+    day_dates = [sim_config['start_date'] + timedelta(days=start_day + t - 1) for t in range(horizon)]
+    manual_inputs = [day_manual_inputs[t] if t < len(day_manual_inputs) else {} for t in range(horizon)]
+    coeffs = compute_daily_coefficients(fleet_df, start_day, day_modifiers[0], weights, month_days, daily_hours)
+    train_ids = coeffs['train_ids']
+    n = len(train_ids)
+
+    # Per-train inputs that stay fixed across the horizon
+    km0 = fleet_df['current_km'].to_numpy(dtype=np.int64)
+    km_since0 = km0 - fleet_df['bogie_last_service_km'].to_numpy(dtype=np.int64)
+    consecutive0 = column_or_default(fleet_df, 'consecutive_service_days', 0).astype(np.int64)
+    branded = fleet_df['branding_sla_active'].to_numpy(dtype=bool)
+    hours0 = np.nan_to_num(column_or_default(fleet_df, 'current_hours', 0).astype(float)).round().astype(np.int64)
+    target_hours = np.nan_to_num(column_or_default(fleet_df, 'target_hours', 0).astype(float)).round().astype(np.int64)
+    expiry = pd.to_datetime(fleet_df['cert_telecom_expiry']).tolist()
+    priority = fleet_df['job_card_priority']
+    job_penalty = np.where((fleet_df['job_card_status'] == 'OPEN').to_numpy(), priority.map(JOB_CARD_PENALTIES).astype(float).fillna(0).to_numpy(), 0)
+    is_critical = (priority == 'CRITICAL').to_numpy()
+    old_brakes = (fleet_df['brake_model'] == 'HydroMech_v1').to_numpy()
+    shunt_cost = (fleet_df['stabling_shunt_moves'].to_numpy(dtype=float) * weights['shunt_cost']).astype(np.int64)
+    expired_penalty_per_day = sim_config['expired_penalty_per_day'] # The same knob the health engine applies
+    forces_maintenance = weights.get('expired_cert_forces_maintenance', True)
+    maint_threshold_200 = math.ceil(200 * weights['maint_threshold'])
+
+    # Per-day cost coefficients of the later days
+    ideal_km = [round((weights['target_mileage'] / month_days) * (start_day + t)) for t in range(horizon)]
+    mileage_coeff = [round(S * weights['cost_per_km'] * ((start_day + t) / month_days)) for t in range(horizon)]
+    branding_coeff = [round(S * weights['branding_penalty'] / ((month_days - start_day - t + 1) * daily_hours)) for t in range(horizon)]
+
+    def first_day_costs(i):
+        """Day 1 uses exactly the greedy model's coefficients; None marks a forbidden state."""
+        forced = coeffs['force_maintenance'][i]
+        return {'SERVICE': None if forced or coeffs['forbid_service'][i] else int(coeffs['service_cost'][i] - coeffs['branding_penalty'][i]) * S,
+                'MAINTENANCE': int(coeffs['maintenance_cost'][i]) * S,
+                'STANDBY': None if forced else 0}
+
+    def later_day_cost(i, t, state, km_since, consecutive, served, expired):
+        """Scaled cost of train i taking `state` on horizon day t >= 1 in the given carried state; None if a rule forbids it."""
+        mods, manual = day_modifiers[t], manual_inputs[t].get(train_ids[i], {})
+        if state == 'SERVICE' and (is_critical[i] or expired): return None
+        if state != 'MAINTENANCE' and (manual.get('force_maintenance') or (expired and forces_maintenance)): return None
+
+        # Health (x200 to stay integral) forces maintenance below the threshold and is the maintenance cost
+        health_200 = int(200 * (100 - job_penalty[i] - manual.get('health_penalty', 0))) - km_since - 200 * consecutive
+        if expired and expired_penalty_per_day: health_200 -= 200 * expired_penalty_per_day * (day_dates[t] - expiry[i]).days
+        if state == 'MAINTENANCE':
+            cost = max(0, health_200) // 200 # Truncated like the health engine's int(health_score)
+            if cost > 100: return None
+            cost *= S
+        elif health_200 < maint_threshold_200: return None
+        else: cost = 0
+
+        # Branding SLA: standing a branded train down while it is behind its run-rate
+        if state != 'SERVICE':
+            if branded[i] and target_hours[i] > hours0[i]:
+                cost += branding_coeff[t] * max(0, int(target_hours[i] - hours0[i]) - daily_hours * served)
+            return cost
+
+        # Service cost: fatigue + mileage deviation + shunting + weather
+        cost += int((consecutive ** 2) * weights['fatigue_factor']) * S
+        cost += mileage_coeff[t] * abs(int(km0[i]) + daily_km * served - ideal_km[t])
+        fixed_cost = int(shunt_cost[i])
+        if 'WEATHER_PENALTY_OLD_BRAKES' in mods and old_brakes[i]: fixed_cost += int(mods['WEATHER_PENALTY_OLD_BRAKES'])
+        if 'WEATHER_PENALTY_BOGIE_WEAR' in mods and km_since > weights['bogie_service_interval_km']: fixed_cost += int(mods['WEATHER_PENALTY_BOGIE_WEAR'])
+        return cost + fixed_cost * S
+
+    def schedules(i):
+        """Every feasible horizon schedule of train i as (states, first-day cost, total cost)."""
+        found, day0 = [], first_day_costs(i)
+
+        def extend(states, t, first_cost, cost, km_since, consecutive, served, renewed):
+            if t == horizon:
+                found.append((states, first_cost, cost))
+                return
+            expired = expiry[i] < day_dates[t] and not renewed
+            for state in STATES:
+                day_cost = day0[state] if t == 0 else later_day_cost(i, t, state, km_since, consecutive, served, expired)
+                if day_cost is None: continue
+                in_service, in_maintenance = state == 'SERVICE', state == 'MAINTENANCE'
+                extend(states + (state,), t + 1, day_cost if t == 0 else first_cost, cost + day_cost,
+                       0 if in_maintenance else km_since + daily_km * in_service, consecutive + 1 if in_service else 0,
+                       served + in_service, renewed or (in_maintenance and expiry[i] < day_dates[t]))
+
+        extend((), 0, 0, 0, int(km_since0[i]), int(consecutive0[i]), 0, False)
+        return found
+
+    model = cp_model.CpModel()
+    service = [[model.NewBoolVar(f"s_{tid}_d{t}") for tid in train_ids] for t in range(horizon)]
+    maintenance = [[model.NewBoolVar(f"m_{tid}_d{t}") for tid in train_ids] for t in range(horizon)]
+    standby = [[model.NewBoolVar(f"b_{tid}_d{t}") for tid in train_ids] for t in range(horizon)]
+    day_costs = [[] for _ in range(horizon)]
+
+    for t in range(horizon):
+        mods = day_modifiers[t]
+        num_in_service = cp_model.LinearExpr.Sum(service[t])
+        model.Add(num_in_service <= mods['MAX_SERVICE'])
+        shortfall = model.NewIntVar(0, mods['MIN_SERVICE'], f'shortfall_d{t}')
+        model.Add(shortfall >= mods['MIN_SERVICE'] - num_in_service)
+        abs_maint_dev = model.NewIntVar(0, n, f'abs_maint_dev_d{t}')
+        model.AddAbsEquality(abs_maint_dev, cp_model.LinearExpr.Sum(maintenance[t]) - mods['MAINTENANCE_SLOTS'])
+        day_costs[t] += [shortfall * (sim_config['shortfall_penalty'] * S), abs_maint_dev * (sim_config['slot_penalty'] * S)]
+    day_costs[0].append(int(coeffs['branding_penalty'].sum()) * S)
+    later_costs = []
+
+    # One schedule per train; the day variables are the sums of the schedules that take each state
+    previous_state = {tid: state for state, tids in (previous_plan or {}).items() for tid in tids}
+    for i, tid in enumerate(train_ids):
+        options = schedules(i)
+        if time.perf_counter() > deadline: return None, None, {'status': 'TIME_LIMIT', 'wall_time_s': time_limit_seconds}
+        chosen = [model.NewBoolVar(f"x_{tid}_{k}") for k in range(len(options))]
+        model.AddExactlyOne(chosen) # Infeasible when every schedule breaks a rule, like the state-carrying model
+        for t in range(horizon):
+            for state, day_var in zip(STATES, (service[t][i], maintenance[t][i], standby[t][i])):
+                model.Add(day_var == cp_model.LinearExpr.Sum([x for x, (states, _, _) in zip(chosen, options) if states[t] == state]))
+        day_costs[0].append(cp_model.LinearExpr.WeightedSum(chosen, [first_cost for _, first_cost, _ in options]))
+        later_costs.append(cp_model.LinearExpr.WeightedSum(chosen, [cost - first_cost for _, first_cost, cost in options]))
+        if tid in previous_state:
+            for x, (states, _, _) in zip(chosen, options): model.AddHint(x, all(state == previous_state[tid] for state in states))
+
+    model.Minimize(sum(sum(costs) for costs in day_costs) + sum(later_costs))
+    if previous_plan:
+        for t in range(horizon): add_plan_hints(model, train_ids, service[t], maintenance[t], standby[t], previous_plan)
+    solver = make_solver(solver_profile, max_time_in_seconds=max(0.0, deadline - time.perf_counter()))
+    solver.parameters.linearization_level = 2 # Keep the LP relaxation in every worker, even a single one; it is what proves the bound
+    status = solver.Solve(model)
+    stats = solve_stats(solver, status)
+    if status in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
+        plan = extract_plan(solver, coeffs, service[0], maintenance[0])
+        stats['explanation'] = explain_plan(coeffs, plan, start_day)
+        return plan, int(solver.Value(sum(day_costs[0]))) // S, stats
+    return None, None, stats
@@ -0,0 +1,162 @@
+import hashlib
+import io
+import json
+import os
+from itertools import islice
+import numpy as np
+import pandas as pd
+
+# --- SIMULATION LOG INDEX ---
+# A per-train and per-day index over the CSV simulation log, built by streaming the file
+# in chunks of lines and saved next to it (<log>.index.npz). Every row's byte offset, day
+# and train are kept as flat arrays, and running aggregates (days per status, first and
+# last km and the last row of each train, status counts per day) as JSON metadata. A
+# journey, a day or the final status then reads only the matching lines, and aggregate
+# queries read no log rows at all. When the log has only grown since the index was saved
+# (a run still appending days), only the new lines are scanned; any other change rebuilds
+# the index.
+
+INDEX_SUFFIX = ".index.npz"
+FORMAT = "kronos-log-index"
+VERSION = 1
+CHUNK_LINES = 100000
+STATUSES = ['SERVICE', 'MAINTENANCE', 'STANDBY']
+INDEXED_COLUMNS = ['train_id', 'simulation_day', 'status', 'current_km']
+ROW_ARRAYS = {'row_offset': np.int64, 'row_day': np.int32, 'row_train': np.int32}
+
+def _line_hash(line):
+    return hashlib.sha1(line).hexdigest()
+
+class LogIndex:
+    def __init__(self, log_file, meta=None, arrays=None):
+        self.log_file = log_file
+        self.meta = meta or {"format": FORMAT, "version": VERSION, "header": None, "indexed_bytes": 0, "last_line_offset": None,
+                             "last_line_sha1": None, "trains": {}, "days": {}}
+        self.arrays = arrays or {name: np.zeros(0, dtype) for name, dtype in ROW_ARRAYS.items()}
+        self.train_codes = {train_id: i for i, train_id in enumerate(self.meta["trains"])}
+
+    @classmethod
+    def open(cls, log_file, rebuild=False):
+        """The log's index, loaded if still valid, extended if the log only grew, otherwise rebuilt and saved."""
+        size = os.path.getsize(log_file) # Raises FileNotFoundError if the log is missing
+        index = None if rebuild else cls.load(log_file)
+        if index is not None and size >= index.meta["indexed_bytes"] and index._tail_matches():
+            if size == index.meta["indexed_bytes"]: return index
+        else:
+            index = cls(log_file)
+        index._scan()
+        index.save()
+        return index
+
+    @classmethod
+    def load(cls, log_file):
+        """The saved index, or None if it is missing, unreadable or from another index version."""
+        try:
+            with np.load(log_file + INDEX_SUFFIX) as saved:
+                meta = json.loads(str(saved['meta']))
+                arrays = {name: saved[name] for name in ROW_ARRAYS}
+        except (OSError, ValueError, KeyError): return None
+        if meta.get("format") != FORMAT or meta.get("version") != VERSION: return None
+        return cls(log_file, meta, arrays)
+
+    def save(self):
+        index_file = self.log_file + INDEX_SUFFIX
+        tmp_file = f"{index_file}.{os.getpid()}.tmp.npz" # Renamed into place, so a concurrent reader never sees half an index
+        try:
+            np.savez(tmp_file, meta=np.array(json.dumps(self.meta, separators=(',', ':'))), **self.arrays)
+            os.replace(tmp_file, index_file)
+        except OSError: pass # Read-only log directory: the index is rebuilt next time
+
+    def _tail_matches(self):
+        """True if the last indexed line is still in place (the log was appended to, not rewritten)."""
+        if self.meta["header"] is None: return False
+        with open(self.log_file, 'rb') as f:
+            if f.readline().decode().rstrip("\r\n") != self.meta["header"]: return False
+            if self.meta["last_line_offset"] is None: return True
+            f.seek(self.meta["last_line_offset"])
+            return _line_hash(f.readline()) == self.meta["last_line_sha1"]
+
+    def _scan(self):
+        """Indexes every complete line after indexed_bytes, CHUNK_LINES at a time."""
+        meta = self.meta
+        new_arrays = {name: [array] for name, array in self.arrays.items()}
+        with open(self.log_file, 'rb') as f:
+            if meta["indexed_bytes"] == 0:
+                header = f.readline()
+                meta["header"] = header.decode().rstrip("\r\n")
+                meta["indexed_bytes"] = len(header)
+            columns = meta["header"].split(",")
+            f.seek(meta["indexed_bytes"])
+            while True:
+                lines = list(islice(f, CHUNK_LINES))
+                if lines and not lines[-1].endswith(b"\n"): lines.pop() # A row still being written; indexed next time
+                if not lines: break
+                lengths = np.fromiter(map(len, lines), np.int64, len(lines))
+                offsets = meta["indexed_bytes"] + np.cumsum(lengths) - lengths
+                meta["indexed_bytes"] += int(lengths.sum())
+                keep = np.fromiter((bool(line.strip()) for line in lines), bool, len(lines))
+                if not keep.all(): lines, offsets = [line for line in lines if line.strip()], offsets[keep]
+                if not lines: continue
+                chunk = pd.read_csv(io.BytesIO(b"".join(lines)), header=None, names=columns, usecols=INDEXED_COLUMNS)
+                chunk['offset'] = offsets
+                for name, values in self._add_chunk(chunk).items(): new_arrays[name].append(values)
+                meta["last_line_offset"], meta["last_line_sha1"] = int(offsets[-1]), _line_hash(lines[-1])
+        self.arrays = {name: np.concatenate(parts).astype(ROW_ARRAYS[name]) for name, parts in new_arrays.items()}
+
+    def _add_chunk(self, chunk):
+        """Folds a chunk into the aggregates and returns its row arrays."""
+        trains, days = self.meta["trains"], self.meta["days"]
+        per_train = chunk.groupby('train_id', sort=False).agg(first_km=('current_km', 'first'), last_km=('current_km', 'last'), last_offset=('offset', 'last'))
+        for train_id, row in per_train.iterrows():
+            if train_id not in trains:
+                self.train_codes[train_id] = len(trains)
+                trains[train_id] = {**{status: 0 for status in STATUSES}, "first_km": int(row['first_km'])}
+            trains[train_id].update(last_km=int(row['last_km']), last_offset=int(row['last_offset']))
+        for (train_id, status), count in chunk.groupby(['train_id', 'status'], sort=False).size().items():
+            trains[train_id][status] = trains[train_id].get(status, 0) + int(count)
+        for (day, status), count in chunk.groupby(['simulation_day', 'status']).size().items():
+            counts = days.setdefault(str(day), {status: 0 for status in STATUSES})
+            counts[status] = counts.get(status, 0) + int(count)
+        return {'row_offset': chunk['offset'].to_numpy(), 'row_day': chunk['simulation_day'].to_numpy(), 'row_train': chunk['train_id'].map(self.train_codes).to_numpy()}
+
+    # --- QUERIES ---
+    @property
+    def rows(self):
+        return len(self.arrays['row_offset'])
+
+    @property
+    def train_ids(self):
+        return list(self.meta["trains"])
+
+    def read_rows(self, offsets):
+        """The log rows starting at `offsets`, parsed with the log's header."""
+        with open(self.log_file, 'rb') as f:
+            lines = []
+            for offset in offsets:
+                f.seek(offset)
+                lines.append(f.readline())
+        return pd.read_csv(io.BytesIO((self.meta["header"] + "\n").encode() + b"".join(lines)))
+
+    def journey(self, train_id):
+        """Every logged row of `train_id` in log order; None for a train that is not in the log."""
+        if train_id not in self.train_codes: return None
+        return self.read_rows(self.arrays['row_offset'][self.arrays['row_train'] == self.train_codes[train_id]])
+
+    def day_rows(self, day):
+        """Every logged row of simulation day `day`; None for a day that is not in the log."""
+        if str(day) not in self.meta["days"]: return None
+        return self.read_rows(self.arrays['row_offset'][self.arrays['row_day'] == day])
+
+    def final_status(self):
+        """Each train's last logged row."""
+        return self.read_rows([train["last_offset"] for train in self.meta["trains"].values()])
+
+    def train_summary(self):
+        """Per-train days in each status and km, from the index alone."""
+        return pd.DataFrame([{"train_id": train_id, **{status.lower() + "_days": train[status] for status in STATUSES},
+                              "first_km": train["first_km"], "last_km": train["last_km"]} for train_id, train in self.meta["trains"].items()])
+
+    def day_summary(self):
+        """Status counts per simulated day, from the index alone."""
+        return pd.DataFrame([{"simulation_day": int(day), **{status.lower(): counts.get(status, 0) for status in STATUSES}}
+                             for day, counts in self.meta["days"].items()]).sort_values('simulation_day', ignore_index=True)
@@ -0,0 +1,247 @@
+import os
+import numpy as np
+import pandas as pd
+from ortools.sat.python import cp_model
+
+# --- VECTORISED CP-SAT MODEL BUILDER ---
+# Shared by every simulation profile through kronos.simulator.
+# Every per-train cost coefficient and forced-state mask is computed once as a
+# NumPy column operation; the CP-SAT variables and objective terms are then
+# emitted straight from those arrays instead of walking the DataFrame per row.
+
+# Solver parameter profiles. "deterministic" switches to interleaved search bounded by deterministic
+# time, so the same seed gives the same plan whatever the core count or machine load.
+SOLVER_PROFILES = {
+    "fast": {"max_time_in_seconds": 2.0, "relative_gap_limit": 0.01, "random_seed": 0, "deterministic": False},
+    "balanced": {"max_time_in_seconds": 10.0, "relative_gap_limit": 0.0, "random_seed": 0, "deterministic": False},
+    "thorough": {"max_time_in_seconds": 60.0, "relative_gap_limit": 0.0, "random_seed": 0, "deterministic": True},
+    # One search worker per solve: scenario sweeps parallelise across processes instead
+    "sweep": {"max_time_in_seconds": 2.0, "relative_gap_limit": 0.0, "random_seed": 0, "deterministic": True, "num_workers": 1},
+}
+
+def make_solver(profile="balanced", **overrides):
+    """Creates a CpSolver from a named profile; keyword overrides win over the profile values."""
+    if profile not in SOLVER_PROFILES:
+        raise ValueError(f"Unknown solver profile '{profile}'. Choose one of: {', '.join(SOLVER_PROFILES)}")
+    settings = {**SOLVER_PROFILES[profile], **overrides}
+    solver = cp_model.CpSolver()
+    solver.parameters.num_workers = settings.get("num_workers") or os.cpu_count() or 1
+    solver.parameters.random_seed = settings["random_seed"]
+    solver.parameters.relative_gap_limit = settings["relative_gap_limit"]
+    if settings["deterministic"]:
+        solver.parameters.interleave_search = True
+        solver.parameters.max_deterministic_time = settings["max_time_in_seconds"]
+    else:
+        solver.parameters.max_time_in_seconds = settings["max_time_in_seconds"]
+    return solver
+
+def solve_stats(solver, status):
+    """Summarises a finished solve: status, wall/user/deterministic time, objective, best bound, relative gap and search counters."""
+    has_solution = status in [cp_model.OPTIMAL, cp_model.FEASIBLE]
+    objective = solver.ObjectiveValue() if has_solution else None
+    bound = solver.BestObjectiveBound() if has_solution else None
+    return {
+        'status': solver.StatusName(status),
+        'wall_time_s': solver.WallTime(),
+        'user_time_s': solver.UserTime(),
+        'deterministic_time': solver.ResponseProto().deterministic_time,
+        'objective': objective,
+        'best_bound': bound,
+        'gap': abs(objective - bound) / max(1.0, abs(objective)) if has_solution else None,
+        'branches': solver.NumBranches(),
+        'conflicts': solver.NumConflicts(),
+        'booleans': solver.NumBooleans(),
+    }
+
+def format_solve_stats(stats):
+    gap = "n/a" if stats['gap'] is None else f"{stats['gap']:.2%}"
+    return f"{stats['status']} in {stats['wall_time_s']:.3f}s, gap {gap}, {stats['branches']:,} branches"
+
+def column_or_default(df, name, default=0):
+    if name in df.columns: return df[name].to_numpy()
+    return np.full(len(df), default)
+
+def compute_daily_coefficients(fleet_df, current_day, modifiers, weights, month_days, daily_hours):
+    """
+    Computes the per-train objective coefficients and forced-state masks for one day.
+    `weights` carries the strategy knobs (fatigue_factor, cost_per_km, branding_penalty,
+    target_mileage, maint_threshold, shunt_cost) plus the script-specific rules.
+    """
+    train_ids = fleet_df['train_id'].to_numpy()
+    health = fleet_df['health_score'].to_numpy(dtype=float)
+    is_cert_expired = fleet_df['is_cert_expired'].to_numpy(dtype=bool)
+
+    # Forced states
+    critical_job_card = (fleet_df['job_card_priority'] == 'CRITICAL').to_numpy()
+    low_health = health < weights['maint_threshold']
+    manual_force = column_or_default(fleet_df, 'manual_force_maintenance', False).astype(bool)
+    forbid_service = is_cert_expired | critical_job_card
+    force_maintenance = low_health | manual_force
+    if weights.get('expired_cert_forces_maintenance', True):
+        force_maintenance |= is_cert_expired
+
+    # Service cost = fatigue + mileage deviation + shunting (+ weather), each truncated like int()
+    consecutive_days = column_or_default(fleet_df, 'consecutive_service_days', 0).astype(float)
+    fatigue_cost = ((consecutive_days ** 2) * weights['fatigue_factor']).astype(np.int64)
+    ideal_km = (weights['target_mileage'] / month_days) * current_day
+    urgency_multiplier = current_day / month_days
+    current_km = fleet_df['current_km'].to_numpy(dtype=float)
+    mileage_cost = (np.abs(current_km - ideal_km) * weights['cost_per_km'] * urgency_multiplier).astype(np.int64)
+    shunt_cost = (fleet_df['stabling_shunt_moves'].to_numpy(dtype=float) * weights['shunt_cost']).astype(np.int64)
+    weather_cost = np.zeros(len(fleet_df), dtype=np.int64)
+    if 'WEATHER_PENALTY_OLD_BRAKES' in modifiers:
+        weather_cost += np.where((fleet_df['brake_model'] == 'HydroMech_v1').to_numpy(), int(modifiers['WEATHER_PENALTY_OLD_BRAKES']), 0)
+    if 'WEATHER_PENALTY_BOGIE_WEAR' in modifiers:
+        km_since_last_service = column_or_default(fleet_df, 'km_since_last_service', 0)
+        weather_cost += np.where(km_since_last_service > weights['bogie_service_interval_km'], int(modifiers['WEATHER_PENALTY_BOGIE_WEAR']), 0)
+    service_cost = fatigue_cost + mileage_cost + shunt_cost + weather_cost
+
+    # Branding SLA penalty for *not* running a branded train, scaled by the required run-rate
+    branding_penalty = np.zeros(len(fleet_df), dtype=np.int64)
+    branded = fleet_df['branding_sla_active'].to_numpy(dtype=bool)
+    hours_needed = np.nan_to_num(column_or_default(fleet_df, 'target_hours', 0).astype(float) - column_or_default(fleet_df, 'current_hours', 0).astype(float))
+    behind = branded & (hours_needed > 0)
+    if behind.any():
+        run_rate = hours_needed[behind] / (month_days - current_day + 1)
+        urgency = run_rate / daily_hours
+        branding_penalty[behind] = (weights['branding_penalty'] * urgency).astype(np.int64)
+
+    return {
+        'train_ids': train_ids,
+        'forbid_service': forbid_service,
+        'force_maintenance': force_maintenance,
+        'service_cost': service_cost,
+        'maintenance_cost': health.astype(np.int64),
+        'branding_penalty': branding_penalty,
+        # Components kept for the per-day explanation records
+        'health': health,
+        'maint_threshold': weights['maint_threshold'],
+        'cert_expired': is_cert_expired,
+        'critical_job_card': critical_job_card,
+        'low_health': low_health,
+        'manual_force': manual_force,
+        'consecutive_days': consecutive_days.astype(np.int64),
+        'fatigue_cost': fatigue_cost,
+        'mileage_cost': mileage_cost,
+        'shunt_cost': shunt_cost,
+        'weather_cost': weather_cost,
+    }
+
+def add_plan_hints(model, train_ids, service_vars, maintenance_vars, standby_vars, plan):
+    """Seeds the solver with a previous SERVICE/MAINTENANCE/STANDBY plan (trains missing from it are left unhinted)."""
+    in_service, in_maintenance, on_standby = set(plan.get('SERVICE', [])), set(plan.get('MAINTENANCE', [])), set(plan.get('STANDBY', []))
+    for tid, s, m, b in zip(train_ids, service_vars, maintenance_vars, standby_vars):
+        if tid not in in_service and tid not in in_maintenance and tid not in on_standby: continue
+        model.AddHint(s, tid in in_service)
+        model.AddHint(m, tid in in_maintenance)
+        model.AddHint(b, tid in on_standby)
+
+def build_daily_model(coeffs, modifiers, shortfall_penalty, slot_penalty, previous_plan=None):
+    """Emits the CP-SAT model for one day from precomputed coefficient arrays, optionally hinted with last night's plan."""
+    model = cp_model.CpModel()
+    train_ids = coeffs['train_ids']
+    n = len(train_ids)
+    service_vars = [model.NewBoolVar(f"s_{tid}") for tid in train_ids]
+    maintenance_vars = [model.NewBoolVar(f"m_{tid}") for tid in train_ids]
+    standby_vars = [model.NewBoolVar(f"b_{tid}") for tid in train_ids]
+    forbid_service, force_maintenance = coeffs['forbid_service'], coeffs['force_maintenance']
+    for i in range(n):
+        model.AddExactlyOne(service_vars[i], maintenance_vars[i], standby_vars[i])
+        if forbid_service[i]: model.Add(service_vars[i] == 0)
+        if force_maintenance[i]: model.Add(maintenance_vars[i] == 1)
+
+    num_in_service = cp_model.LinearExpr.Sum(service_vars)
+    model.Add(num_in_service <= modifiers['MAX_SERVICE'])
+    shortfall = model.NewIntVar(0, modifiers['MIN_SERVICE'], 'shortfall')
+    model.Add(shortfall >= modifiers['MIN_SERVICE'] - num_in_service)
+    maint_dev = model.NewIntVar(-n, n, 'maint_dev')
+    model.Add(maint_dev == cp_model.LinearExpr.Sum(maintenance_vars) - modifiers['MAINTENANCE_SLOTS'])
+    abs_maint_dev = model.NewIntVar(0, n, 'abs_maint_dev')
+    model.AddAbsEquality(abs_maint_dev, maint_dev)
+
+    # penalty * (1 - s) is folded into a constant offset and a negative service coefficient
+    branding_penalty = coeffs['branding_penalty']
+    service_coeffs = (coeffs['service_cost'] - branding_penalty).tolist()
+    model.Minimize(
+        cp_model.LinearExpr.WeightedSum(service_vars, service_coeffs)
+        + cp_model.LinearExpr.WeightedSum(maintenance_vars, coeffs['maintenance_cost'].tolist())
+        + shortfall * shortfall_penalty
+        + abs_maint_dev * slot_penalty
+        + int(branding_penalty.sum())
+    )
+    if previous_plan: add_plan_hints(model, train_ids, service_vars, maintenance_vars, standby_vars, previous_plan)
+    return model, service_vars, maintenance_vars
+
+def extract_plan(solver, coeffs, service_vars, maintenance_vars):
+    """Reads the SERVICE/MAINTENANCE/STANDBY plan back out of a solved model."""
+    plan = {'SERVICE': [], 'MAINTENANCE': [], 'STANDBY': []}
+    for tid, s, m in zip(coeffs['train_ids'], service_vars, maintenance_vars):
+        if solver.BooleanValue(s): plan['SERVICE'].append(tid)
+        elif solver.BooleanValue(m): plan['MAINTENANCE'].append(tid)
+        else: plan['STANDBY'].append(tid)
+    return plan
+
+# --- PER-DAY EXPLANATIONS ---
+# Binding rules in the order they are reported; each one forbids service and/or forces maintenance
+BINDING_CONSTRAINTS = [('CERT_EXPIRED', 'cert_expired'), ('CRITICAL_JOB_CARD', 'critical_job_card'),
+                       ('LOW_HEALTH', 'low_health'), ('MANUAL_FORCE', 'manual_force')]
+
+def explain_plan(coeffs, plan, day):
+    """
+    One explanation record per train for a solved day: assigned status, the hard rules that bound it
+    (';'-joined, empty when the choice was purely cost-driven), its cost components and its rank
+    by net service cost among the trains that were free to run.
+    """
+    train_ids = coeffs['train_ids']
+    status = np.full(len(train_ids), 'STANDBY', dtype=object)
+    status[np.isin(train_ids, plan['SERVICE'])] = 'SERVICE'
+    status[np.isin(train_ids, plan['MAINTENANCE'])] = 'MAINTENANCE'
+    binding = [';'.join(name for name, key in BINDING_CONSTRAINTS if coeffs[key][i]) for i in range(len(train_ids))]
+    net_service_cost = coeffs['service_cost'] - coeffs['branding_penalty']
+    candidate = ~(coeffs['forbid_service'] | coeffs['force_maintenance'])
+    service_rank = pd.Series(np.where(candidate, net_service_cost, np.nan)).rank(method='min')
+    return pd.DataFrame({
+        'simulation_day': day,
+        'train_id': train_ids,
+        'status': status,
+        'binding_constraint': binding,
+        'health_score': coeffs['health'].round(1),
+        'maint_threshold': coeffs['maint_threshold'],
+        'consecutive_service_days': coeffs['consecutive_days'],
+        'fatigue_cost': coeffs['fatigue_cost'],
+        'mileage_cost': coeffs['mileage_cost'],
+        'shunt_cost': coeffs['shunt_cost'],
+        'weather_cost': coeffs['weather_cost'],
+        'branding_penalty': coeffs['branding_penalty'],
+        'net_service_cost': net_service_cost,
+        'maintenance_cost': coeffs['maintenance_cost'],
+        'service_rank': service_rank.astype('Int64'),
+        'service_candidates': int(candidate.sum()),
+        'trains_in_service': len(plan['SERVICE']),
+    })
+
+# --- WARM-START TIMINGS ---
+class _FirstSolutionTimer(cp_model.CpSolverSolutionCallback):
+    def __init__(self):
+        super().__init__()
+        self.first_solution_time = None
+
+    def on_solution_callback(self):
+        if self.first_solution_time is None: self.first_solution_time = self.WallTime()
+
+def solve_timed(model, solver=None):
+    """Solves the model and returns (status, {'first_feasible_s', 'optimal_s'}); optimal_s is None unless proven optimal."""
+    solver = solver or cp_model.CpSolver()
+    timer = _FirstSolutionTimer()
+    status = solver.Solve(model, timer)
+    return status, {'first_feasible_s': timer.first_solution_time, 'optimal_s': solver.WallTime() if status == cp_model.OPTIMAL else None}
+
+def compare_warm_start(model, profile="balanced"):
+    """Solves a hinted model with and without its hints and returns both timings."""
+    unhinted = model.Clone()
+    unhinted.ClearHints()
+    return {'with_hints': solve_timed(model, make_solver(profile))[1], 'without_hints': solve_timed(unhinted, make_solver(profile))[1]}
+
+def format_warm_start(timings):
+    def _fmt(seconds): return "n/a" if seconds is None else f"{seconds * 1000:.1f}ms"
+    return ", ".join(f"{label.replace('_', ' ')}: first feasible {_fmt(t['first_feasible_s'])} / optimal {_fmt(t['optimal_s'])}" for label, t in timings.items())
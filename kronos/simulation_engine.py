@@ -0,0 +1,96 @@
+from datetime import timedelta
+import numpy as np
+import pandas as pd
+
+# --- IN-MEMORY SIMULATION STATE ---
+# Holds the fleet state for a whole run so the daily loop no longer re-reads and
+# re-parses fleet_status.csv every day. The CSV is written only as a checkpoint:
+# every `checkpoint_every` days (0 disables periodic checkpoints) and at the end, unless
+# there is no checkpoint path (the fleet state is then persisted by the database sink).
+
+DATE_COLUMNS = ['cert_telecom_expiry', 'last_cleaned_date']
+
+class SimulationEngine:
+    """Owns the fleet DataFrame between days and checkpoints it to CSV on demand."""
+
+    def __init__(self, fleet_df, checkpoint_path="fleet_status.csv", checkpoint_every=0):
+        self.fleet_df = fleet_df
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.last_day = 0
+        # Parse the date columns once for the whole run
+        for col in DATE_COLUMNS:
+            if col in self.fleet_df.columns and not pd.api.types.is_datetime64_any_dtype(self.fleet_df[col]):
+                self.fleet_df[col] = pd.to_datetime(self.fleet_df[col])
+
+    @property
+    def state(self):
+        return self.fleet_df
+
+    def commit(self, day, updated_df):
+        """Stores the post-update state for `day` and checkpoints if the day is due."""
+        self.fleet_df = updated_df
+        self.last_day = day
+        if self.checkpoint_every and day % self.checkpoint_every == 0:
+            self.checkpoint()
+
+    def checkpoint(self, file_path=None):
+        file_path = file_path or self.checkpoint_path
+        if file_path: self.fleet_df.to_csv(file_path, index=False)
+
+    def finish(self):
+        """Writes the final state unless the last committed day was already checkpointed."""
+        if not (self.checkpoint_every and self.last_day % self.checkpoint_every == 0):
+            self.checkpoint()
+
+# --- DAILY STATE TRANSITION ---
+class TrainIndex:
+    """Persistent train_id -> row position map, rebuilt only when the fleet's rows change."""
+
+    def __init__(self):
+        self.train_ids = None
+        self.position = {}
+
+    def mask(self, df, train_ids):
+        """Boolean row mask selecting `train_ids` (ids not in the fleet are ignored)."""
+        fleet_ids = df['train_id'].to_numpy()
+        if self.train_ids is None or len(fleet_ids) != len(self.train_ids) or not (fleet_ids == self.train_ids).all():
+            self.train_ids = fleet_ids.copy()
+            self.position = {tid: i for i, tid in enumerate(fleet_ids)}
+        mask = np.zeros(len(fleet_ids), dtype=bool)
+        mask[[self.position[tid] for tid in train_ids if tid in self.position]] = True
+        return mask
+
+def apply_plan(df, plan, today, daily_km, daily_hours, cert_validity_days, train_index):
+    """
+    Advances the fleet one day in place from a SERVICE/MAINTENANCE/STANDBY plan, as a handful of
+    array operations. Returns the ids of the trains whose expired certificate was renewed.
+    """
+    in_service = train_index.mask(df, plan['SERVICE'])
+    in_maintenance = train_index.mask(df, plan['MAINTENANCE'])
+    for col in ['consecutive_service_days', 'total_service_days_month', 'total_maintenance_days_month']:
+        if col not in df.columns: df[col] = 0
+
+    # Updated through masks on copies so the fixed-width column dtypes are kept
+    consecutive = df['consecutive_service_days'].to_numpy().copy()
+    consecutive[in_service] += 1
+    consecutive[~in_service] = 0
+    df['consecutive_service_days'] = consecutive
+    km = df['current_km'].to_numpy().copy()
+    km[in_service] += daily_km
+    df['current_km'] = km
+    hours = df['current_hours'].to_numpy().copy()
+    hours[in_service & df['branding_sla_active'].to_numpy(dtype=bool)] += daily_hours
+    df['current_hours'] = hours
+
+    # Maintenance renews expired certificates, restores health and services the bogies
+    renew = in_maintenance & (pd.to_datetime(df['cert_telecom_expiry']) < today).to_numpy()
+    if renew.any(): df.loc[renew, 'cert_telecom_expiry'] = today + timedelta(days=cert_validity_days)
+    df.loc[in_maintenance, 'health_score'] = 100
+    df.loc[in_maintenance, 'bogie_last_service_km'] = df['current_km'].to_numpy()[in_maintenance]
+
+    for col, mask in [('total_service_days_month', in_service), ('total_maintenance_days_month', in_maintenance)]:
+        totals = df[col].to_numpy().copy()
+        totals[mask] += 1
+        df[col] = totals
+    return df['train_id'].to_numpy()[renew].tolist()
@@ -0,0 +1,158 @@
+import logging
+import time
+from datetime import timedelta
+import pandas as pd
+from ortools.sat.python import cp_model
+from kronos.configs import ENGINE_CONFIGS
+from kronos.fleet_schema import load_fleet
+from kronos.health_engine import HealthEngine
+from kronos.horizon_planner import MAX_HORIZON_DAYS, solve_horizon_optimization
+from kronos.model_builder import compute_daily_coefficients, build_daily_model, extract_plan, explain_plan, compare_warm_start, format_warm_start, make_solver, solve_stats, format_solve_stats
+from kronos.simulation_engine import SimulationEngine, TrainIndex, apply_plan
+from kronos.sinks import make_sinks
+from kronos.strategies import make_strategy
+from kronos.telemetry import day_record, timed
+
+logger = logging.getLogger("kronos.simulation")
+
+# --- SIMULATOR ---
+# The preprocess -> strategy -> solve -> update loop shared by every entry point.
+# A Simulator is built from one of kronos.configs.ENGINE_CONFIGS plus a strategy
+# source and a list of log sinks; the scripts only pick the configuration.
+
+class Simulator:
+    def __init__(self, config, strategy, sinks=(), scenarios=None, manual_inputs=None, telemetry=None):
+        if not 1 <= config['planning_horizon_days'] <= MAX_HORIZON_DAYS:
+            raise ValueError(f"planning_horizon_days must be between 1 and {MAX_HORIZON_DAYS}, got {config['planning_horizon_days']}")
+        self.config = config
+        self.strategy = strategy
+        self.sinks = list(sinks)
+        self.telemetry = telemetry # None keeps no timings
+        self.scenarios = scenarios or config['scenarios']
+        self.manual_inputs = config['manual_inputs'] if manual_inputs is None else manual_inputs
+        self.modifiers = config['scenario_modifiers']
+        # Health components are kept between days; only trains whose inputs changed are recomputed
+        self.health_engine = HealthEngine(config['expired_penalty_per_day'])
+        self.train_index = TrainIndex()
+
+    def today(self, day):
+        return self.config['start_date'] + timedelta(days=day - 1)
+
+    def preprocess(self, df, day):
+        df['cert_telecom_expiry'] = pd.to_datetime(df['cert_telecom_expiry'])
+        df['last_cleaned_date'] = pd.to_datetime(df['last_cleaned_date'])
+        today = self.today(day)
+        df['is_cert_expired'] = df['cert_telecom_expiry'] < today
+        df['km_since_last_service'] = df['current_km'] - df['bogie_last_service_km']
+        return self.health_engine.score(df, today, self.manual_inputs.get(day, {}))
+
+    def _extract(self, solver, coeffs, is_in_service, is_in_maintenance, day):
+        plan = extract_plan(solver, coeffs, is_in_service, is_in_maintenance)
+        return plan, explain_plan(coeffs, plan, day)
+
+    def solve_daily(self, fleet_df, day, weights, previous_plan=None, solver_profile=None, timings=None):
+        config, modifiers = self.config, self.modifiers[self.scenarios[day - 1]]
+        solver_profile = solver_profile or config['solver_profile']
+        coeffs = timed(timings, 'coefficients', compute_daily_coefficients, fleet_df, day, modifiers, weights, config['month_days'], config['daily_hours'])
+        model, is_in_service, is_in_maintenance = timed(timings, 'model_build', build_daily_model, coeffs, modifiers, config['shortfall_penalty'], config['slot_penalty'], previous_plan)
+        if config['report_warm_start_timings'] and previous_plan: logger.info(f"  - Warm start timings: {format_warm_start(compare_warm_start(model, solver_profile))}")
+        solver = make_solver(solver_profile)
+        status = timed(timings, 'solve', solver.Solve, model)
+        stats = solve_stats(solver, status)
+        if status in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
+            plan, stats['explanation'] = timed(timings, 'extract', self._extract, solver, coeffs, is_in_service, is_in_maintenance, day)
+            return plan, int(solver.ObjectiveValue()), stats
+        return None, None, stats
+
+    def solve_rolling_horizon(self, fleet_df, day, weights, previous_plan=None, solver_profile=None):
+        """Looks ahead over the next planning_horizon_days using today's weights and commits only today's plan."""
+        config = self.config
+        days = range(day, min(day + config['planning_horizon_days'], config['month_days'] + 1))
+        day_modifiers = [self.modifiers[self.scenarios[d - 1]] for d in days]
+        day_manual_inputs = [self.manual_inputs.get(d, {}) for d in days]
+        return solve_horizon_optimization(fleet_df, day, day_modifiers, day_manual_inputs, weights, config, config['horizon_time_limit_seconds'], previous_plan, solver_profile or config['solver_profile'])
+
+    def solve(self, fleet_df, day, previous_plan=None, solver_profile=None, timings=None):
+        scenario = self.scenarios[day - 1]
+        weights = timed(timings, 'strategy', self.strategy.daily_weights, fleet_df, scenario, self.modifiers[scenario])
+        # The horizon planner builds, solves and extracts in one call, so it is reported as 'solve'
+        if self.config['planning_horizon_days'] > 1:
+            plan, cost, solve_info = timed(timings, 'solve', self.solve_rolling_horizon, fleet_df, day, weights, previous_plan, solver_profile)
+            if plan is not None: return plan, cost, solve_info
+            # No horizon plan within the time limit: fall back to tonight's single-day model
+            logger.warning(f"Horizon planner returned no plan on Day {day} (status {solve_info['status']}); falling back to the single-day model.")
+        return self.solve_daily(fleet_df, day, weights, previous_plan, solver_profile, timings)
+
+    def apply_daily_updates(self, df, plan, day):
+        config, today = self.config, self.today(day)
+        renewed = apply_plan(df, plan, today, config['daily_km'], config['daily_hours'], config['cert_validity_days'], self.train_index)
+        for train_id in renewed:
+            logger.info(f"    INFO: Certificate for {train_id} renewed to {(today + timedelta(days=config['cert_validity_days'])).strftime('%Y-%m-%d')}")
+        return df
+
+    def _update(self, engine, fleet_df, plan, day):
+        # Updated on a copy so sinks can log the fleet as the solver saw it
+        updated_df = self.apply_daily_updates(fleet_df.copy(), plan, day)
+        engine.commit(day, updated_df)
+        return updated_df
+
+    def _write_logs(self, day, scenario, plan, fleet_df, updated_df, solve_info):
+        for sink in self.sinks: sink.write_day(day, scenario, plan, fleet_df, updated_df, solve_info)
+
+    def run(self, initial_df, pacing_seconds=0):
+        """Simulates the month from `initial_df`, writing every sink; returns the SimulationEngine."""
+        config = self.config
+        checkpoint_path = config['fleet_file'] if config['fleet_source'] == 'csv' else None
+        engine = SimulationEngine(initial_df, checkpoint_path, config['checkpoint_every_days'])
+        daily_plan = None
+        for day in range(1, config['month_days'] + 1):
+            scenario = self.scenarios[day - 1]
+            manual_inputs_today = self.manual_inputs.get(day, {})
+            timings = {} if self.telemetry else None
+            logger.info(f"\n{'='*25} DAY {day} | SCENARIO: {scenario.replace('_', ' ')} {'='*25}")
+            if manual_inputs_today: logger.info(f"MANUAL OVERRIDES FOR TODAY: {manual_inputs_today}")
+            fleet_df = timed(timings, 'preprocess', self.preprocess, engine.state, day)
+            previous_plan = daily_plan if config['warm_start'] else None
+            daily_plan, daily_cost, solve_info = self.solve(fleet_df, day, previous_plan, timings=timings)
+            operational_cost = None if daily_cost is None else daily_cost % config['slot_penalty']
+            if not daily_plan:
+                if self.telemetry: self.telemetry.day_finished(day_record(day, scenario, timings, solve_info, None, None))
+                logger.error(f"CRITICAL FAILURE on Day {day} (solver status {solve_info['status']}). Could not generate a plan. Halting simulation.")
+                break
+            if solve_info['status'] == 'OPTIMAL': logger.info("Optimal plan generated for tomorrow:")
+            else: logger.info(f"Plan generated for tomorrow ({solve_info['status']}: the time limit ran out before it was proven optimal):")
+            logger.info(f"  - Solver: {format_solve_stats(solve_info)}")
+            if operational_cost is not None:
+                logger.info(f"  - Projected Operational Cost for Day {day+1}: ₹{operational_cost:,}")
+            for category, trains in daily_plan.items():
+                logger.info(f"  - {category} ({len(trains)}): {sorted(trains)}")
+            updated_df = timed(timings, 'update', self._update, engine, fleet_df, daily_plan, day)
+            timed(timings, 'log_write', self._write_logs, day, scenario, daily_plan, fleet_df, updated_df, solve_info)
+            if self.telemetry: self.telemetry.day_finished(day_record(day, scenario, timings, solve_info, daily_plan, operational_cost))
+            if pacing_seconds: time.sleep(pacing_seconds)
+        engine.finish()
+        logger.info(f"\n{'='*25} END OF MONTH SIMULATION COMPLETE {'='*25}")
+        for sink in self.sinks: logger.info(sink.close())
+        return engine
+
+def build_simulator(engine_name, strategy=None, sinks=None, scenarios=None, manual_inputs=None, telemetry=None, overrides=None):
+    """Simulator for one of ENGINE_CONFIGS; `strategy`, `sinks` and any `overrides` config values replace the configured ones."""
+    config = {**ENGINE_CONFIGS[engine_name], **(overrides or {})}
+    return Simulator(config, make_strategy(config, strategy), make_sinks(config['sinks'] if sinks is None else sinks), scenarios, manual_inputs, telemetry)
+
+def get_fleet_data(file_path="fleet_status.csv", source="csv"):
+    if source == 'database':
+        from kronos.database import read_fleet
+        try: return read_fleet()
+        except ValueError as e: print(f"Error: invalid fleet data in the database: {e}"); return None
+        except Exception as e: print(f"Error: could not read fleet_status from the database: {e}"); return None
+    try: return load_fleet(file_path)
+    except FileNotFoundError: print(f"Error: '{file_path}' not found. Please run initialize_month.py first."); return None
+    except ValueError as e: print(f"Error: invalid fleet data in '{file_path}': {e}"); return None
+
+def print_final_status(final_df):
+    print("\n--- FINAL FLEET STATUS AT END OF MONTH ---")
+    columns_to_show = ['train_id', 'health_score', 'current_km', 'current_hours', 'consecutive_service_days', 'total_service_days_month', 'total_maintenance_days_month', 'cert_telecom_expiry']
+    final_df = final_df.copy()
+    final_df['cert_telecom_expiry'] = pd.to_datetime(final_df['cert_telecom_expiry']).dt.strftime('%Y-%m-%d')
+    print(final_df[columns_to_show].to_string(index=False))
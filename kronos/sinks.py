@@ -0,0 +1,126 @@
+import json
+
+# --- LOG SINKS ---
+# Each sink receives every committed day (plan, pre-update fleet, post-update fleet and the
+# solver stats) and returns a summary line on close. A run writes only the sinks it is
+# given, so an empty list writes no logs at all.
+
+CSV_LOG_FILE = "monthly_simulation_log.csv" # Read by analyze_log.py (and api_server.py with KRONOS_LOG_SOURCE=csv)
+JSON_LOG_FILE = "simulation_log.json" # One JSON list of every day; opt-in with --log-sinks json
+DELTA_LOG_FILE = "simulation_log.delta.jsonl" # The default log: delta-encoded rows plus plans, served by api_server.py to the dashboard
+EXPLANATION_FILE = "daily_explanations.csv" # Per-day, per-train "why" records served by api_server.py
+
+class ColumnarSink:
+    """Parquet log partitioned by simulation_day for offline analysis (read it with columnar_log.read_log); opt-in with --log-sinks columnar."""
+
+    def __init__(self, log_dir="simulation_log"):
+        from kronos.columnar_log import ColumnarLogWriter # pyarrow is only loaded when the sink is used
+        self.log_dir = log_dir
+        self.writer = ColumnarLogWriter(log_dir)
+
+    def write_day(self, day, scenario, plan, fleet_df, updated_df, solve_info):
+        from kronos.columnar_log import build_day_log
+        self.writer.write_day(day, build_day_log(updated_df, plan, day, scenario))
+
+    def close(self):
+        return f"Columnar simulation log saved to '{self.log_dir}/'"
+
+class ExplanationSink:
+    def __init__(self, file_path=EXPLANATION_FILE):
+        self.file_path = file_path
+        self.header_written = False
+
+    def write_day(self, day, scenario, plan, fleet_df, updated_df, solve_info):
+        solve_info['explanation'].to_csv(self.file_path, mode='a' if self.header_written else 'w', header=not self.header_written, index=False)
+        self.header_written = True
+
+    def close(self):
+        return f"Per-day explanations saved to '{self.file_path}'"
+
+class CsvLogSink:
+    """Post-update fleet state with each train's status, one block of rows per day."""
+
+    def __init__(self, file_path=CSV_LOG_FILE):
+        self.file_path = file_path
+        open(file_path, 'w').close() # Clear the log file at the start of a new simulation
+        self.header_written = False
+
+    def write_day(self, day, scenario, plan, fleet_df, updated_df, solve_info):
+        log_df = updated_df.copy()
+        log_df['simulation_day'] = day
+        log_df['status'] = 'STANDBY'
+        log_df.loc[log_df['train_id'].isin(plan['SERVICE']), 'status'] = 'SERVICE'
+        log_df.loc[log_df['train_id'].isin(plan['MAINTENANCE']), 'status'] = 'MAINTENANCE'
+        log_df.to_csv(self.file_path, mode='a' if self.header_written else 'w', header=not self.header_written, index=False)
+        self.header_written = True
+
+    def close(self):
+        return f"CSV simulation log saved to '{self.file_path}'"
+
+class JsonLogSink:
+    """The fleet as the solver saw it each day (pre-update), written as one JSON list at the end."""
+
+    def __init__(self, file_path=JSON_LOG_FILE):
+        self.file_path = file_path
+        self.entries = []
+
+    def write_day(self, day, scenario, plan, fleet_df, updated_df, solve_info):
+        fleet_df_for_log = fleet_df.copy()
+        fleet_df_for_log['cert_telecom_expiry'] = fleet_df_for_log['cert_telecom_expiry'].dt.strftime('%Y-%m-%d')
+        fleet_df_for_log['last_cleaned_date'] = fleet_df_for_log['last_cleaned_date'].dt.strftime('%Y-%m-%d')
+        self.entries.append({"day": day, "scenario": scenario, "plan": plan, "fleet_status_today": fleet_df_for_log.to_dict(orient='records')})
+
+    def close(self):
+        with open(self.file_path, 'w') as f:
+            json.dump(self.entries, f, indent=2)
+        return f"Full simulation log saved to '{self.file_path}'"
+
+class DeltaLogSink:
+    """
+    The fleet as the solver saw it each day (pre-update, like the JSON log) with each train's status,
+    unchanged fields dropped; the plan is the status column (see kronos.delta_log).
+    """
+
+    def __init__(self, file_path=DELTA_LOG_FILE):
+        from kronos.delta_log import DeltaLogWriter
+        self.file_path = file_path
+        self.writer = DeltaLogWriter(file_path)
+
+    def write_day(self, day, scenario, plan, fleet_df, updated_df, solve_info):
+        log_df = fleet_df.copy()
+        log_df['status'] = 'STANDBY'
+        log_df.loc[log_df['train_id'].isin(plan['SERVICE']), 'status'] = 'SERVICE'
+        log_df.loc[log_df['train_id'].isin(plan['MAINTENANCE']), 'status'] = 'MAINTENANCE'
+        self.writer.write_day(day, scenario, log_df)
+
+    def close(self):
+        self.writer.close()
+        return f"Delta-encoded simulation log saved to '{self.file_path}'"
+
+class DatabaseSink:
+    """Each day's pre-update fleet and plan in fleet_snapshots, with fleet_status kept at the post-update state (see kronos.database)."""
+
+    def __init__(self, db_url=None):
+        from kronos.database import SQL_CREATE_FLEET_TABLE, connection, create_snapshot_table, create_table, get_pool, migrate_fleet_table
+        self.pool = get_pool(db_url)
+        with connection(self.pool) as conn:
+            create_table(conn, self.pool.dialect, SQL_CREATE_FLEET_TABLE)
+            migrate_fleet_table(conn, self.pool.dialect)
+            create_snapshot_table(conn, self.pool.dialect)
+        self.days = 0
+
+    def write_day(self, day, scenario, plan, fleet_df, updated_df, solve_info):
+        from kronos.database import write_day
+        write_day(self.pool, day, scenario, plan, fleet_df, updated_df)
+        self.days += 1
+
+    def close(self):
+        return f"{self.days} daily fleet snapshots saved to the '{self.pool.dialect}' database"
+
+SINKS = {'columnar': ColumnarSink, 'explanations': ExplanationSink, 'csv': CsvLogSink, 'json': JsonLogSink, 'delta': DeltaLogSink, 'database': DatabaseSink}
+
+def make_sinks(names):
+    """Instantiates the named sinks with their default paths ("none" or an empty list writes nothing)."""
+    unknown = [name for name in names if name not in SINKS and name != 'none']
+    if unknown: raise ValueError(f"Unknown log sink(s) {', '.join(unknown)} (expected any of: {', '.join(SINKS)}, none)")
+    return [SINKS[name]() for name in names if name != 'none']
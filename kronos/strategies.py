@@ -0,0 +1,182 @@
+import logging
+import os
+from functools import lru_cache
+import numpy as np
+
+logger = logging.getLogger("kronos.simulation")
+
+# --- STRATEGY SOURCES ---
+# A strategy supplies each day's solver cost weights. StaticStrategy returns the configured
+# constants; StrategistStrategy asks the joblib AI strategist (train_weight_predictor.py) for
+# today's weights given the fleet condition and scenario, falling back to the configured
+# values for anything it does not predict.
+
+class StaticStrategy:
+    def __init__(self, weights):
+        self.weights = weights
+
+    def daily_weights(self, fleet_df, scenario, modifiers):
+        return self.weights
+
+# --- STRATEGIST SERVICE ---
+# The strategist is a MultiOutputRegressor over random forests, and sklearn's per-call
+# overhead dominates one-row predictions. The service memoizes predictions on the condition
+# tuple (optionally quantizing avg_fleet_health so nearby days share an entry), predicts
+# cache misses in one batch, and can evaluate a compiled copy of the forests: every tree
+# flattened into shared node arrays and walked for all trees at once with NumPy. The
+# compiled path mirrors sklearn (float32 features, `<=` splits, trees summed in order, then
+# averaged), so its predictions are identical.
+
+STRATEGIST_FEATURES = ['total_fleet_size', 'target_service_trains', 'avg_fleet_health', 'is_monsoon', 'is_surge']
+STRATEGY_OUTPUTS = ['cost_per_km', 'fatigue_factor', 'branding_penalty', 'target_mileage', 'maint_threshold']
+
+class CompiledForest:
+    """Array-based predictor for a MultiOutputRegressor of tree ensembles."""
+    ARRAYS = ['feature', 'threshold', 'left', 'right', 'value', 'roots']
+
+    def __init__(self, arrays, n_outputs, n_trees):
+        for name in self.ARRAYS: setattr(self, name, arrays[name])
+        self.n_outputs, self.n_trees = n_outputs, n_trees
+        self.is_leaf = self.left == np.arange(len(self.left))
+
+    @classmethod
+    def from_model(cls, model):
+        forests = model.estimators_
+        features, thresholds, left, right, values, roots = [], [], [], [], [], []
+        offset = 0
+        for forest in forests:
+            for estimator in forest.estimators_:
+                tree = estimator.tree_
+                roots.append(offset)
+                features.append(tree.feature)
+                thresholds.append(tree.threshold)
+                # Child links become global node indices; leaves point at themselves
+                leaf = tree.children_left == -1
+                left.append(np.where(leaf, np.arange(tree.node_count), tree.children_left) + offset)
+                right.append(np.where(leaf, np.arange(tree.node_count), tree.children_right) + offset)
+                values.append(tree.value[:, 0, 0])
+                offset += tree.node_count
+        arrays = {'feature': np.maximum(np.concatenate(features), 0), 'threshold': np.concatenate(thresholds),
+                  'left': np.concatenate(left), 'right': np.concatenate(right), 'value': np.concatenate(values), 'roots': np.array(roots)}
+        return cls(arrays, len(forests), len(forests[0].estimators_))
+
+    def save(self, file_path, source_signature):
+        import joblib
+        tmp_path = f"{file_path}.{os.getpid()}.tmp" # Written aside and renamed, so concurrent loaders never see a partial file
+        joblib.dump({'source': source_signature, 'n_outputs': self.n_outputs, 'n_trees': self.n_trees,
+                     **{name: np.asarray(getattr(self, name)) for name in self.ARRAYS}}, tmp_path)
+        os.replace(tmp_path, file_path)
+
+    @classmethod
+    def load(cls, file_path, source_signature):
+        """The saved forest, memory-mapped; None if it is missing or was compiled from another model file."""
+        import joblib
+        try: saved = joblib.load(file_path, mmap_mode='r')
+        except (OSError, EOFError, ValueError): return None
+        if tuple(saved.get('source', ())) != tuple(source_signature): return None
+        return cls(saved, saved['n_outputs'], saved['n_trees'])
+
+    def predict(self, X):
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        nodes = np.tile(self.roots, (len(X), 1))
+        rows = np.arange(len(X))[:, None]
+        while not self.is_leaf[nodes].all():
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        leaf_values = self.value[nodes].reshape(len(X), self.n_outputs, self.n_trees)
+        return np.cumsum(leaf_values, axis=2)[:, :, -1] / self.n_trees
+
+class StrategistService:
+    def __init__(self, model=None, forest=None):
+        self.model = model # The sklearn model; None when only the compiled forest was loaded
+        self.forest = forest
+        self.cache = {}
+        self.stats = {'hits': 0, 'misses': 0, 'batches': 0}
+
+    @staticmethod
+    def conditions(fleet_size, min_service, avg_health, scenario, health_quantum=None):
+        """The strategist's feature tuple; avg_health is rounded to a multiple of health_quantum if given."""
+        if health_quantum: avg_health = round(avg_health / health_quantum) * health_quantum
+        return (fleet_size, min_service, float(avg_health), 1 if scenario == 'HEAVY_MONSOON' else 0, 1 if scenario == 'FESTIVAL_SURGE' else 0)
+
+    def predict_batch(self, conditions_list):
+        """Strategy dicts for many condition tuples; cache misses are predicted in one call."""
+        missing = list(dict.fromkeys(c for c in conditions_list if c not in self.cache))
+        self.stats['hits'] += len(conditions_list) - len(missing)
+        self.stats['misses'] += len(missing)
+        if missing:
+            self.stats['batches'] += 1
+            if self.forest is not None: predictions = self.forest.predict(missing)
+            else:
+                import pandas as pd
+                predictions = self.model.predict(pd.DataFrame(missing, columns=STRATEGIST_FEATURES))
+            for conditions, prediction in zip(missing, predictions):
+                self.cache[conditions] = dict(zip(STRATEGY_OUTPUTS, prediction))
+        return [self.cache[c] for c in conditions_list]
+
+    def predict(self, conditions):
+        return self.predict_batch([conditions])[0]
+
+    def warm(self, fleet_size, scenario_modifiers, health_quantum):
+        """Predicts every scenario at every quantized health level in one batch, so daily lookups are cache hits."""
+        levels = np.arange(0, 100 + health_quantum, health_quantum)
+        self.predict_batch([self.conditions(fleet_size, modifiers['MIN_SERVICE'], health, scenario, health_quantum)
+                            for scenario, modifiers in scenario_modifiers.items() for health in levels])
+
+def _signature(file_path):
+    stat = os.stat(file_path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+@lru_cache(maxsize=None)
+def load_strategist(model_path, compiled=True):
+    """
+    One strategist service per model file and process; raises FileNotFoundError if it has not been trained.
+    The compiled forest is cached next to the model (<model>.forest) and memory-mapped on later loads,
+    so compiled runs never import sklearn; it is rebuilt whenever the model file changes.
+    """
+    import joblib
+    signature = _signature(model_path)
+    forest_path = model_path + ".forest"
+    forest = CompiledForest.load(forest_path, signature) if compiled else None
+    if forest is not None:
+        service = StrategistService(forest=forest)
+    else:
+        model = joblib.load(model_path, mmap_mode='r')
+        if compiled:
+            forest = CompiledForest.from_model(model)
+            try: forest.save(forest_path, signature)
+            except OSError: pass # Read-only checkout: compile again next time
+        service = StrategistService(model, forest)
+    logger.info("AI Strategist model loaded successfully.")
+    return service
+
+class StrategistStrategy:
+    def __init__(self, weights, model_path="strategy_model.joblib", compiled=True, health_quantum=None, scenario_modifiers=None):
+        self.weights = weights
+        self.service = load_strategist(model_path, compiled)
+        self.health_quantum = health_quantum
+        self.scenario_modifiers = scenario_modifiers
+        self.warmed_fleet_size = None
+
+    def predict(self, fleet_df, scenario, modifiers):
+        """Asks the AI strategist for today's cost weights given the fleet condition and scenario."""
+        if self.health_quantum and self.scenario_modifiers and self.warmed_fleet_size != len(fleet_df):
+            self.service.warm(len(fleet_df), self.scenario_modifiers, self.health_quantum)
+            self.warmed_fleet_size = len(fleet_df)
+        return self.service.predict(self.service.conditions(len(fleet_df), modifiers['MIN_SERVICE'], fleet_df['health_score'].mean(), scenario, self.health_quantum))
+
+    def daily_weights(self, fleet_df, scenario, modifiers):
+        dynamic_strategy = self.predict(fleet_df, scenario, modifiers)
+        logger.info(f"AI Strategist recommends for today: Target KM={dynamic_strategy['target_mileage']:.0f}, Maint. Threshold={dynamic_strategy['maint_threshold']:.0f}")
+        return {**self.weights, **dynamic_strategy}
+
+STRATEGIES = ['static', 'strategist']
+
+def make_strategy(config, name=None):
+    """Builds the strategy named in `config` (or `name`) with the config's weights."""
+    name = name or config['strategy']
+    if name == 'static': return StaticStrategy(config['weights'])
+    if name == 'strategist':
+        return StrategistStrategy(config['weights'], config.get('strategist_model', "strategy_model.joblib"), config.get('strategist_compiled', True),
+                                  config.get('strategist_health_quantum'), config['scenario_modifiers'])
+    raise ValueError(f"Unknown strategy '{name}' (expected one of: {', '.join(STRATEGIES)})")
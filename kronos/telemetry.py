@@ -0,0 +1,91 @@
+import json
+import os
+import time
+from datetime import datetime
+
+# --- PER-DAY TELEMETRY ---
+# Structured record of each simulated night: how long every pipeline stage took and what
+# CP-SAT did. Written either as JSON lines (one record per run start and per day) or as a
+# Prometheus textfile holding the latest night's gauges, for node_exporter's textfile
+# collector. With telemetry off the simulator keeps no timings at all.
+
+STAGES = ['preprocess', 'strategy', 'coefficients', 'model_build', 'solve', 'extract', 'update', 'log_write']
+SOLVER_FIELDS = ['status', 'wall_time_s', 'user_time_s', 'deterministic_time', 'objective', 'best_bound', 'gap', 'branches', 'conflicts', 'booleans']
+
+def timed(timings, stage, fn, *args):
+    """Calls fn(*args), adding its duration to timings[stage] unless timings is None (telemetry off)."""
+    if timings is None: return fn(*args)
+    start = time.perf_counter()
+    result = fn(*args)
+    timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - start
+    return result
+
+def day_record(day, scenario, timings, solve_info, plan, operational_cost):
+    return {
+        'event': 'day', 'day': day, 'scenario': scenario, 'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'stages_s': {stage: timings[stage] for stage in STAGES if stage in timings},
+        'total_s': sum(timings.values()),
+        'solver': {field: solve_info.get(field) for field in SOLVER_FIELDS},
+        'plan': {category: len(trains) for category, trains in plan.items()} if plan else None,
+        'operational_cost': operational_cost,
+    }
+
+class JsonLinesTelemetry:
+    def __init__(self, file_path="telemetry.jsonl"):
+        self.file_path = file_path
+        open(file_path, 'w').close()
+
+    def _write(self, record):
+        with open(self.file_path, 'a') as f:
+            f.write(json.dumps(record) + "\n")
+
+    def run_started(self, engine_name, trains, load_s):
+        self._write({'event': 'run_start', 'engine': engine_name, 'timestamp': datetime.now().isoformat(timespec='seconds'), 'trains': trains, 'load_s': load_s})
+
+    def day_finished(self, record):
+        self._write(record)
+
+class PrometheusTelemetry:
+    """Latest night's gauges, rewritten atomically after every day."""
+
+    def __init__(self, file_path="kronos.prom"):
+        self.file_path = file_path
+        self.run = {}
+
+    def run_started(self, engine_name, trains, load_s):
+        self.run = {'engine': engine_name, 'trains': trains, 'load_s': load_s}
+
+    def day_finished(self, record):
+        engine, solver = self.run.get('engine', ''), record['solver']
+        lines = [
+            "# HELP kronos_planning_stage_seconds Duration of each planning stage for the latest simulated night.",
+            "# TYPE kronos_planning_stage_seconds gauge",
+        ]
+        lines += [f'kronos_planning_stage_seconds{{engine="{engine}",stage="{stage}"}} {seconds:.6f}' for stage, seconds in record['stages_s'].items()]
+        gauges = [
+            ("kronos_planning_total_seconds", "Total planning time of the latest simulated night.", record['total_s']),
+            ("kronos_planning_day", "Latest simulated day.", record['day']),
+            ("kronos_fleet_load_seconds", "Time to load the fleet state at run start.", self.run.get('load_s')),
+            ("kronos_fleet_trains", "Trains in the simulated fleet.", self.run.get('trains')),
+            ("kronos_solver_wall_time_seconds", "CP-SAT wall time of the latest solve.", solver['wall_time_s']),
+            ("kronos_solver_deterministic_time", "CP-SAT deterministic time of the latest solve.", solver['deterministic_time']),
+            ("kronos_solver_branches", "CP-SAT branches of the latest solve.", solver['branches']),
+            ("kronos_solver_conflicts", "CP-SAT conflicts of the latest solve.", solver['conflicts']),
+            ("kronos_solver_gap", "Relative gap between objective and best bound of the latest solve.", solver['gap']),
+            ("kronos_solver_optimal", "1 if the latest solve was proven optimal.", int(solver['status'] == 'OPTIMAL')),
+        ]
+        for name, help_text, value in gauges:
+            if value is None: continue
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f'{name}{{engine="{engine}"}} {value}']
+        tmp_path = self.file_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, self.file_path)
+
+TELEMETRY_FORMATS = {'jsonl': JsonLinesTelemetry, 'prometheus': PrometheusTelemetry}
+
+def make_telemetry(kind, file_path=None):
+    """Telemetry writer for `kind` ("jsonl", "prometheus"), or None for "off"."""
+    if kind in (None, 'off'): return None
+    if kind not in TELEMETRY_FORMATS: raise ValueError(f"Unknown telemetry format '{kind}' (expected one of: {', '.join(TELEMETRY_FORMATS)}, off)")
+    return TELEMETRY_FORMATS[kind](file_path) if file_path else TELEMETRY_FORMATS[kind]()
@@ -0,0 +1,104 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+
+# --- INDEXED SIMULATION LOG ---
+# Keeps the simulation log in memory for the API server, indexed by
+# (simulation_day, train_id), so a question is a dictionary lookup instead of a
+# full CSV parse and scan. The file is re-read only when its mtime or size changes,
+# e.g. after a new simulation run rewrites it.
+
+class LogStore:
+    """Thread-safe, lazily reloaded view of a simulation log CSV."""
+
+    def __init__(self, log_file):
+        self.log_file = log_file
+        self._lock = threading.Lock()
+        self._signature = None
+        self._snapshot = (None, {})
+
+    def _file_signature(self):
+        stat = os.stat(self.log_file) # Raises FileNotFoundError if the log is missing
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _refresh(self):
+        """Returns the current (log_df, index) pair, reloading the file first if it changed on disk."""
+        signature = self._file_signature()
+        if signature != self._signature:
+            with self._lock:
+                if signature != self._signature:
+                    log_df = pd.read_csv(self.log_file)
+                    self._snapshot = (log_df, log_df.groupby(['simulation_day', 'train_id'], sort=False).indices)
+                    self._signature = signature
+        return self._snapshot
+
+    @property
+    def version(self):
+        """Changes whenever the log file on disk changes; used to key cached answers."""
+        self._refresh()
+        return self._signature
+
+    @property
+    def log_df(self):
+        return self._refresh()[0]
+
+    def rows(self, day, train_ids):
+        """Returns the log rows for `train_ids` on `day`, in log order (unknown trains are skipped)."""
+        log_df, index = self._refresh()
+        positions = [index[(day, tid)] for tid in set(train_ids) if (day, tid) in index]
+        if not positions: return log_df.iloc[0:0]
+        return log_df.iloc[np.sort(np.concatenate(positions))]
+
+class DeltaLogStore(LogStore):
+    """
+    The same lookups over a delta-encoded log (kronos.delta_log). Loading parses only the
+    changed fields; a question replays changes from the reader's last day, so successive
+    questions about nearby days cost only the changes in between.
+    """
+
+    def _refresh(self):
+        signature = self._file_signature()
+        if signature != self._signature:
+            with self._lock:
+                if signature != self._signature:
+                    from kronos.delta_log import DeltaLogReader
+                    self._snapshot = DeltaLogReader(self.log_file)
+                    self._signature = signature
+        return self._snapshot
+
+    @property
+    def log_df(self):
+        return self._refresh().to_frame()
+
+    def rows(self, day, train_ids):
+        return self._refresh().rows(day, train_ids)
+
+class SnapshotStore:
+    """
+    The same lookups served from the fleet_snapshots table (kronos.database) instead of a CSV:
+    each question is a primary-key query, so it sees days committed by a run still in progress.
+    Raises FileNotFoundError while the table is missing or unreachable, like a missing log file.
+    """
+
+    def __init__(self, db_url=None):
+        self.db_url = db_url
+
+    def _query(self, fn, *args):
+        from kronos.database import get_pool
+        try: return fn(*args, pool=get_pool(self.db_url))
+        except Exception as e: raise FileNotFoundError(f"fleet_snapshots is not available: {e}") from e
+
+    @property
+    def version(self):
+        from kronos.database import snapshot_version
+        return self._query(snapshot_version)
+
+    @property
+    def log_df(self):
+        from kronos.database import read_snapshot_log
+        return self._query(read_snapshot_log)
+
+    def rows(self, day, train_ids):
+        from kronos.database import read_snapshots
+        return self._query(read_snapshots, day, train_ids)
@@ -0,0 +1,64 @@
+# --- PAGED SIMULATION-LOG VIEWS ---
+# Read-only views of one version of the simulation log for the dashboard endpoints:
+# per-day summaries, a single day's plan and fleet rows, and one train's time series.
+# The log is sorted and grouped once per version, so a page is a slice of precomputed
+# row positions instead of a scan. Every view takes offset/limit and an optional list
+# of fields to project; the key columns are always returned.
+
+PLAN_CATEGORIES = ['SERVICE', 'MAINTENANCE', 'STANDBY']
+
+def page(items, offset, limit):
+    """One page of `items` with the paging metadata the dashboard needs to fetch the next."""
+    window = items[offset:offset + limit]
+    next_offset = offset + limit if offset + limit < len(items) else None
+    return {"total": len(items), "offset": offset, "limit": limit, "next_offset": next_offset, "items": window}
+
+class LogViews:
+    def __init__(self, log_df):
+        log_df = log_df.sort_values(['simulation_day', 'train_id'], kind='stable').reset_index(drop=True)
+        self.columns = list(log_df.columns)
+        # JSON-ready values: NaN as None, NumPy scalars as Python values
+        self.records = log_df.astype(object).where(log_df.notna(), None)
+        self.by_day = {int(day): rows for day, rows in log_df.groupby('simulation_day', sort=True).indices.items()}
+        self.by_train = log_df.groupby('train_id', sort=True).indices
+        self.summaries = [self._summary(log_df.iloc[rows], day) for day, rows in self.by_day.items()]
+        self.summary_by_day = {summary["day"]: summary for summary in self.summaries}
+
+    @staticmethod
+    def _summary(day_df, day):
+        counts = day_df['status'].value_counts()
+        summary = {"day": day, "scenario": day_df['scenario'].iloc[0] if 'scenario' in day_df.columns else None, "trains": len(day_df),
+                   **{category.lower(): int(counts.get(category, 0)) for category in PLAN_CATEGORIES},
+                   "avg_health_score": round(float(day_df['health_score'].mean()), 2), "min_health_score": round(float(day_df['health_score'].min()), 2)}
+        if 'is_cert_expired' in day_df.columns: summary["expired_certificates"] = int(day_df['is_cert_expired'].astype(bool).sum())
+        return summary
+
+    def check_fields(self, fields):
+        """Raises ValueError naming any requested field the log does not have."""
+        unknown = [field for field in fields or [] if field not in self.columns]
+        if unknown: raise ValueError(f"Unknown field(s): {', '.join(unknown)} (available: {', '.join(self.columns)})")
+
+    def _page_rows(self, positions, fields, keys, offset, limit):
+        """A page over `positions`; only the rows on the page are converted to records."""
+        columns = self.columns if not fields else keys + [field for field in fields if field not in keys]
+        result = page(positions, offset, limit)
+        result["items"] = self.records.iloc[result["items"]][columns].to_dict('records')
+        return result
+
+    def days(self, offset, limit):
+        return page(self.summaries, offset, limit)
+
+    def day(self, day, fields, offset, limit):
+        """The day's summary, plan and a page of its fleet rows; None if the day is not in the log."""
+        positions = self.by_day.get(day)
+        if positions is None: return None
+        statuses = self.records['status'].iloc[positions]
+        train_ids = self.records['train_id'].iloc[positions]
+        plan = {category: train_ids[statuses == category].tolist() for category in PLAN_CATEGORIES}
+        return {**self.summary_by_day[day], "plan": plan, "fleet": self._page_rows(positions, fields, ['train_id', 'status'], offset, limit)}
+
+    def train(self, train_id, fields, offset, limit):
+        """A page of one train's rows in day order (like analyze_log.track_train_progress); None for an unknown train."""
+        positions = self.by_train.get(train_id)
+        if positions is None: return None
+        return {"train_id": train_id, "days": self._page_rows(positions, fields, ['simulation_day', 'status'], offset, limit)}
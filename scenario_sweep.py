@@ -0,0 +1,138 @@
+import argparse
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from initialize_month import build_initial_fleet_status
+from kronos import ENGINE_CONFIGS, SimulationEngine, build_simulator, load_fleet, make_strategy
+
+# --- MONTE-CARLO SCENARIO SWEEP ---
+# Generates many randomised months (monsoon/surge days, supervisor health penalties,
+# forced maintenance) and runs the full preprocess -> solve -> update loop for each
+# one in a process pool, then aggregates shortfall days, branding SLA misses and cost.
+
+SWEEP_ENGINES = list(ENGINE_CONFIGS)
+CALENDAR_SETTINGS = {
+    "monsoon_day_probability": 0.10,
+    "surge_day_probability": 0.10,
+    "health_penalty_events_per_month": 3,
+    "health_penalty_range": (10, 50),
+    "forced_maintenance_events_per_month": 2,
+}
+
+def random_calendar(rng, train_ids, month_days, settings=CALENDAR_SETTINGS):
+    """Returns (scenarios, manual_inputs) shaped like MONTHLY_SCENARIOS and MANUAL_INPUTS_CALENDAR."""
+    draws = rng.random(month_days)
+    monsoon_p, surge_p = settings["monsoon_day_probability"], settings["surge_day_probability"]
+    scenarios = ['HEAVY_MONSOON' if d < monsoon_p else 'FESTIVAL_SURGE' if d < monsoon_p + surge_p else 'NORMAL' for d in draws]
+
+    manual_inputs = {}
+    for _ in range(rng.poisson(settings["health_penalty_events_per_month"])):
+        day, train = int(rng.integers(1, month_days + 1)), str(rng.choice(train_ids))
+        low, high = settings["health_penalty_range"]
+        manual_inputs.setdefault(day, {}).setdefault(train, {})["health_penalty"] = int(rng.integers(low, high + 1))
+    for _ in range(rng.poisson(settings["forced_maintenance_events_per_month"])):
+        day, train = int(rng.integers(1, month_days + 1)), str(rng.choice(train_ids))
+        manual_inputs.setdefault(day, {}).setdefault(train, {})["force_maintenance"] = True
+    return scenarios, manual_inputs
+
+def _quiet_worker():
+    logging.getLogger("kronos").setLevel(logging.WARNING)
+
+def _init_worker(engine_name):
+    """Pool initializer: quiets the kronos loggers and loads the engine's strategy once per worker, under fork or spawn."""
+    _quiet_worker()
+    make_strategy(ENGINE_CONFIGS[engine_name])
+
+def run_month(engine_name, initial_df, scenarios, manual_inputs, seed, solver_profile="sweep", strategist_quantum=None):
+    """Simulates one month with the given engine configuration (no log sinks) and returns its summary metrics."""
+    simulator = build_simulator(engine_name, sinks=[], scenarios=scenarios, manual_inputs=manual_inputs, overrides={'strategist_health_quantum': strategist_quantum})
+    engine = SimulationEngine(initial_df.copy())
+    result = {'seed': seed, 'days_completed': 0, 'shortfall_days': 0, 'service_shortfall_trains': 0,
+              'operational_cost': 0, 'objective_cost': 0, 'failed_day': None, 'sla_misses': 0}
+    daily_plan = None
+    for day, scenario in enumerate(scenarios, start=1):
+        fleet_df = simulator.preprocess(engine.state, day)
+        daily_plan, daily_cost, _ = simulator.solve(fleet_df, day, daily_plan, solver_profile)
+        if not daily_plan:
+            result['failed_day'] = day
+            break
+        shortfall = simulator.modifiers[scenario]['MIN_SERVICE'] - len(daily_plan['SERVICE'])
+        if shortfall > 0:
+            result['shortfall_days'] += 1
+            result['service_shortfall_trains'] += shortfall
+        result['objective_cost'] += daily_cost
+        result['operational_cost'] += daily_cost % simulator.config['slot_penalty']
+        engine.commit(day, simulator.apply_daily_updates(fleet_df, daily_plan, day))
+        result['days_completed'] = day
+
+    final_df = engine.state
+    branded = final_df['branding_sla_active'].astype(bool)
+    result['sla_misses'] = int((branded & (final_df['current_hours'] < final_df['target_hours'])).sum())
+    return result
+
+def _run_month_task(task):
+    return run_month(**task)
+
+def run_sweep(engine_name, initial_df, n_scenarios, base_seed=0, workers=None, solver_profile="sweep", strategist_quantum=None):
+    """Runs n_scenarios random months across a process pool; each month is seeded base_seed + i."""
+    train_ids = initial_df['train_id'].tolist()
+    tasks = []
+    for i in range(n_scenarios):
+        seed = base_seed + i
+        scenarios, manual_inputs = random_calendar(np.random.default_rng(seed), train_ids, ENGINE_CONFIGS[engine_name]['month_days'])
+        tasks.append({'engine_name': engine_name, 'initial_df': initial_df, 'scenarios': scenarios,
+                      'manual_inputs': manual_inputs, 'seed': seed, 'solver_profile': solver_profile,
+                      'strategist_quantum': strategist_quantum})
+    make_strategy(ENGINE_CONFIGS[engine_name]) # Fails fast without a trained model and writes the compiled forest the workers map
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_init_worker, initargs=(engine_name,)) as pool:
+        return list(pool.map(_run_month_task, tasks))
+
+def _distribution(values):
+    values = np.asarray(values, dtype=float)
+    return {'mean': float(values.mean()), 'p5': float(np.percentile(values, 5)), 'p50': float(np.percentile(values, 50)),
+            'p95': float(np.percentile(values, 95)), 'max': float(values.max())}
+
+def summarize_sweep(results):
+    """Aggregates per-month results into cost, shortfall and SLA-miss distributions."""
+    completed = [r for r in results if r['failed_day'] is None]
+    shortfall_counts = pd.Series([r['shortfall_days'] for r in results]).value_counts().sort_index()
+    return {
+        'months': len(results),
+        'failed_months': len(results) - len(completed),
+        'operational_cost': _distribution([r['operational_cost'] for r in completed]) if completed else None,
+        'shortfall_days': _distribution([r['shortfall_days'] for r in results]),
+        'shortfall_days_histogram': {int(k): int(v) for k, v in shortfall_counts.items()},
+        'months_with_shortfall': sum(1 for r in results if r['shortfall_days'] > 0),
+        'sla_misses': _distribution([r['sla_misses'] for r in results]),
+        'months_with_sla_miss': sum(1 for r in results if r['sla_misses'] > 0),
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a Monte-Carlo sweep of randomised simulation months.")
+    parser.add_argument("--engine", default="new_solver", choices=SWEEP_ENGINES, help="simulation configuration to sweep (named after its script)")
+    parser.add_argument("--scenarios", type=int, default=100, help="number of random months to simulate")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first month; month i uses seed + i")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--profile", default="sweep", help="solver profile used for every daily solve")
+    parser.add_argument("--strategist-quantum", type=float, default=None, help="round avg fleet health to this step so strategist predictions are shared across days (default: exact)")
+    parser.add_argument("--base-file", default="fleet_data.csv", help="master fleet data used to initialise every month")
+    parser.add_argument("--output", default=None, help="optional JSON file for the per-month results and summary")
+    args = parser.parse_args()
+
+    try:
+        initial_df = build_initial_fleet_status(load_fleet(args.base_file))
+    except FileNotFoundError:
+        print(f"Error: Base data file '{args.base_file}' not found.")
+        sys.exit(1)
+
+    results = run_sweep(args.engine, initial_df, args.scenarios, args.seed, args.workers, args.profile, args.strategist_quantum)
+    summary = summarize_sweep(results)
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'engine': args.engine, 'summary': summary, 'months': results}, f, indent=2)
+        print(f"Sweep results saved to '{args.output}'")
@@ -1,49 +1,21 @@
-import psycopg2
+import argparse
 import pandas as pd
-import os
-# from dotenv import load_dotenv # We no longer need this
+from kronos.database import LOAD_MODES, SQL_CREATE_FLEET_TABLE, bulk_load, close_pool, connection, create_snapshot_table, create_table, fleet_status_rows, get_pool, migrate_fleet_table
+from kronos.fleet_schema import load_fleet
+from initialize_month import build_initial_fleet_status
 
-# --- DATABASE CONFIGURATION ---
-# load_dotenv() # We no longer need this
-
-# --- DIRECT DATABASE CONNECTION DETAILS ---
-# !! IMPORTANT !!
-# Replace 'your_postgres_user' with your PostgreSQL username (usually 'postgres')
-# Replace 'your_postgres_password' with the password you set during installation.
-DB_CONFIG = {
-    "dbname": "kronos",
-    "user": "your_postgres_user",
-    "password": "your_postgres_password",
-    "host": "localhost",
-    "port": "5432",
-}
+# --- DATABASE CONNECTION ---
+# Connection details live in kronos/database.py (DB_CONFIG), overridable with the
+# KRONOS_DB_NAME/USER/PASSWORD/HOST/PORT environment variables. !! IMPORTANT !! set
+# KRONOS_DB_USER (usually 'postgres') and KRONOS_DB_PASSWORD to your PostgreSQL login,
+# or KRONOS_DB_URL=sqlite:///kronos.db for a local SQLite stand-in.
 
 # --- FILE PATHS ---
 FLEET_DATA_CSV = 'fleet_data.csv'
 HISTORICAL_DATA_CSV = 'historical_strategy_data.csv'
 
 # --- TABLE CREATION SQL ---
-SQL_CREATE_FLEET_TABLE = """
-CREATE TABLE IF NOT EXISTS fleet_status (
-    train_id VARCHAR(10) PRIMARY KEY,
-    health_score REAL,
-    current_km INTEGER,
-    current_hours REAL,
-    job_card_status VARCHAR(50),
-    job_card_priority VARCHAR(50),
-    cert_telecom_expiry DATE,
-    branding_sla_active BOOLEAN,
-    target_hours REAL,
-    last_cleaned_date DATE,
-    stabling_shunt_moves INTEGER,
-    brake_model VARCHAR(50),
-    bogie_last_service_km INTEGER,
-    consecutive_service_days INTEGER,
-    total_service_days_month INTEGER,
-    total_maintenance_days_month INTEGER
-);
-"""
-
+# fleet_status and the per-day fleet_snapshots tables are defined in kronos/database.py
 SQL_CREATE_HISTORICAL_TABLE = """
 CREATE TABLE IF NOT EXISTS historical_strategy_data (
     id SERIAL PRIMARY KEY,
@@ -61,77 +33,49 @@ CREATE TABLE IF NOT EXISTS historical_strategy_data (
 );
 """
 
-def setup_database():
-    """Connects to PostgreSQL, creates tables, and populates them from CSVs."""
-    conn = None
-    try:
-        print("Connecting to the PostgreSQL database...")
-        conn = psycopg2.connect(**DB_CONFIG)
-        cur = conn.cursor()
+HISTORICAL_COLUMNS = ['total_fleet_size', 'target_service_trains', 'avg_fleet_health', 'is_monsoon', 'is_surge', 'historical_cost_per_km', 'historical_fatigue_factor', 'historical_branding_penalty', 'historical_target_mileage', 'historical_maint_threshold', 'success_score']
 
-        print("Creating 'fleet_status' table...")
-        cur.execute(SQL_CREATE_FLEET_TABLE)
-
-        print("Creating 'historical_strategy_data' table...")
-        cur.execute(SQL_CREATE_HISTORICAL_TABLE)
-        
-        conn.commit()
+def setup_database(fleet_mode="upsert", history_mode="replace", db_url=None):
+    """Creates the tables and bulk-loads them from the CSVs (fleet_status gets the start-of-month fleet, upserted on train_id by default)."""
+    try:
+        print("Connecting to the database...")
+        pool = get_pool(db_url)
+        with connection(pool) as conn:
+            print("Creating 'fleet_status' table...")
+            create_table(conn, pool.dialect, SQL_CREATE_FLEET_TABLE)
+            migrate_fleet_table(conn, pool.dialect) # A table from an older setup keeps its rows; the load below fills target_km
+            print("Creating 'historical_strategy_data' table...")
+            create_table(conn, pool.dialect, SQL_CREATE_HISTORICAL_TABLE)
+            print("Creating 'fleet_snapshots' table...")
+            create_snapshot_table(conn, pool.dialect)
 
         # --- Populate Tables ---
         print("\nPopulating database tables from CSV files...")
-        
-        # Populate fleet_status
-        try:
-            fleet_df = pd.read_csv(FLEET_DATA_CSV)
-            # Add missing columns from the simulation state
-            for col in ['health_score', 'current_km', 'current_hours', 'consecutive_service_days', 'total_service_days_month', 'total_maintenance_days_month']:
-                if col not in fleet_df.columns:
-                    fleet_df[col] = 0
-            
-            # Clear table before inserting
-            cur.execute("TRUNCATE TABLE fleet_status RESTART IDENTITY;")
-            for _, row in fleet_df.iterrows():
-                # Handling potential NaN values for fields that might be empty in the CSV
-                target_hours = row.get('target_hours') if pd.notna(row.get('target_hours')) else None
-                
-                cur.execute(
-                    """
-                    INSERT INTO fleet_status (train_id, health_score, current_km, current_hours, job_card_status, job_card_priority, cert_telecom_expiry, branding_sla_active, target_hours, last_cleaned_date, stabling_shunt_moves, brake_model, bogie_last_service_km, consecutive_service_days, total_service_days_month, total_maintenance_days_month)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """,
-                    (row['train_id'], row.get('health_score', 100), row.get('current_km', 0), row.get('current_hours', 0), row.get('job_card_status', 'CLOSED'), row.get('job_card_priority', 'NONE'), row['cert_telecom_expiry'], row['branding_sla_active'], target_hours, row['last_cleaned_date'], row['stabling_shunt_moves'], row['brake_model'], row['bogie_last_service_km'], row.get('consecutive_service_days', 0), row.get('total_service_days_month', 0), row.get('total_maintenance_days_month', 0))
-                )
-            print(f"Successfully loaded {len(fleet_df)} records into 'fleet_status'.")
-        except FileNotFoundError:
-            print(f"Warning: '{FLEET_DATA_CSV}' not found. 'fleet_status' table will be empty.")
+        with connection(pool) as conn:
+            try:
+                # Seeded with the same start-of-month reset as initialize_month.py, so a database-backed run starts from the CSV run's fleet
+                loaded = bulk_load(conn, pool.dialect, 'fleet_status', fleet_status_rows(build_initial_fleet_status(load_fleet(FLEET_DATA_CSV))), fleet_mode, key=['train_id'])
+                print(f"Successfully loaded {loaded} records into 'fleet_status' ({fleet_mode}).")
+            except FileNotFoundError:
+                print(f"Warning: '{FLEET_DATA_CSV}' not found. 'fleet_status' table was not loaded.")
 
-        # Populate historical_strategy_data
-        try:
-            hist_df = pd.read_csv(HISTORICAL_DATA_CSV)
-            cur.execute("TRUNCATE TABLE historical_strategy_data RESTART IDENTITY;")
-            for _, row in hist_df.iterrows():
-                cur.execute(
-                    """
-                    INSERT INTO historical_strategy_data (total_fleet_size, target_service_trains, avg_fleet_health, is_monsoon, is_surge, historical_cost_per_km, historical_fatigue_factor, historical_branding_penalty, historical_target_mileage, historical_maint_threshold, success_score)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """,
-                    tuple(row)
-                )
-            print(f"Successfully loaded {len(hist_df)} records into 'historical_strategy_data'.")
-        except FileNotFoundError:
-            print(f"Warning: '{HISTORICAL_DATA_CSV}' not found. 'historical_strategy_data' table will be empty.")
-
-        conn.commit()
-        cur.close()
+            try:
+                loaded = bulk_load(conn, pool.dialect, 'historical_strategy_data', pd.read_csv(HISTORICAL_DATA_CSV)[HISTORICAL_COLUMNS], history_mode)
+                print(f"Successfully loaded {loaded} records into 'historical_strategy_data' ({history_mode}).")
+            except FileNotFoundError:
+                print(f"Warning: '{HISTORICAL_DATA_CSV}' not found. 'historical_strategy_data' table was not loaded.")
         print("\nDatabase setup and population complete!")
 
-    except (Exception, psycopg2.DatabaseError) as error:
+    except Exception as error:
         print(f"Database error: {error}")
     finally:
-        if conn is not None:
-            conn.close()
-            print("Database connection closed.")
+        close_pool()
+        print("Database connection closed.")
 
 if __name__ == '__main__':
-    setup_database()
-
+    parser = argparse.ArgumentParser(description="Create the KRONOS tables and bulk-load them from the CSV files.")
+    parser.add_argument("--fleet-mode", default="upsert", choices=LOAD_MODES, help="how fleet_status rows are loaded (upsert keeps rows of trains not in the CSV)")
+    parser.add_argument("--history-mode", default="replace", choices=[m for m in LOAD_MODES if m != 'upsert'], help="how historical_strategy_data rows are loaded (the table has no natural key)")
+    parser.add_argument("--db-url", default=None, help="sqlite:///path for a local SQLite stand-in (default: KRONOS_DB_URL, else PostgreSQL via DB_CONFIG)")
+    args = parser.parse_args()
+    setup_database(args.fleet_mode, args.history_mode, args.db_url)
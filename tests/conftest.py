@@ -0,0 +1,45 @@
+import os
+import sys
+import pandas as pd
+import pytest
+
+# The entry-point modules (api_server, log_store, ...) live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TRAIN_IDS = ['Rake-01', 'Rake-02', 'Rake-03']
+HEALTH = [92.5, 80.0, 41.5]
+STATUSES = {1: ['SERVICE', 'STANDBY', 'MAINTENANCE'], 2: ['STANDBY', 'SERVICE', 'SERVICE']}
+
+def write_log(path):
+    """A two-day, three-train simulation log in the CSV sink's layout."""
+    rows = [{'train_id': tid, 'health_score': HEALTH[i], 'current_km': 1000 * day + 200 * i, 'consecutive_service_days': int(status == 'SERVICE'),
+             'simulation_day': day, 'status': status} for day, statuses in STATUSES.items() for i, (tid, status) in enumerate(zip(TRAIN_IDS, statuses))]
+    pd.DataFrame(rows).to_csv(path, index=False)
+
+def write_explanations(path, missing=()):
+    """Explanation records (kronos.model_builder.explain_plan) for every train and day except the (day, train_id) pairs in `missing`."""
+    rows = []
+    for day, statuses in STATUSES.items():
+        for i, (tid, status) in enumerate(zip(TRAIN_IDS, statuses)):
+            if (day, tid) in missing: continue
+            rows.append({'simulation_day': day, 'train_id': tid, 'status': status, 'binding_constraint': 'LOW_HEALTH' if status == 'MAINTENANCE' else '',
+                         'health_score': HEALTH[i], 'maint_threshold': 50, 'consecutive_service_days': 0, 'fatigue_cost': 0, 'mileage_cost': 100 * i,
+                         'shunt_cost': 500, 'weather_cost': 0, 'branding_penalty': 0, 'net_service_cost': 500 + 100 * i, 'maintenance_cost': int(HEALTH[i]),
+                         'service_rank': i + 1, 'service_candidates': 2, 'trains_in_service': statuses.count('SERVICE')})
+    pd.DataFrame(rows).to_csv(path, index=False)
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    """api_server with its log and explanation stores on temporary files, fresh caches and a StubModel."""
+    import api_server
+    from answer_cache import AnswerCache
+    from log_store import LogStore
+    write_log(tmp_path / "log.csv")
+    write_explanations(tmp_path / "explanations.csv", missing=[(2, 'Rake-03')])
+    monkeypatch.setattr(api_server, "log_store", LogStore(str(tmp_path / "log.csv")))
+    monkeypatch.setattr(api_server, "explanation_store", LogStore(str(tmp_path / "explanations.csv")))
+    monkeypatch.setattr(api_server, "answer_cache", AnswerCache(api_server.ANSWER_CACHE_SIZE, api_server.ANSWER_CACHE_TTL_SECONDS))
+    monkeypatch.setattr(api_server, "log_response_cache", AnswerCache(api_server.LOG_RESPONSE_CACHE_SIZE, api_server.ANSWER_CACHE_TTL_SECONDS))
+    monkeypatch.setattr(api_server, "_log_views", (None, None))
+    monkeypatch.setattr(api_server, "_model", api_server.StubModel())
+    return api_server
@@ -0,0 +1,77 @@
+import threading
+import time
+
+# --- /ask ANSWER PATH ---
+# Direct answers from the explanation index, the model fallback and in-flight coalescing,
+# all against api_server.StubModel.
+
+def ask(api, question):
+    return api.app.test_client().post('/ask', json={"question": question})
+
+def test_direct_answer_skips_the_model(api):
+    response = ask(api, "Why was Rake-01 in service on day 1?")
+    assert response.status_code == 200
+    assert response.json["source"] == "explanation_index"
+    assert "On Day 1, Rake-01 was assigned to: **SERVICE**." in response.json["answer"]
+    assert api._model.calls == 0
+
+def test_forced_assignment_names_the_binding_rule(api):
+    answer = ask(api, "Why was Rake-03 in maintenance on day 1?").json["answer"]
+    assert "This was forced because its health score (41.5) was below the maintenance threshold (50)." in answer
+    assert api._model.calls == 0
+
+def test_missing_explanation_falls_back_to_the_model(api):
+    response = ask(api, "Why was Rake-03 on standby on day 2?")
+    assert response.json["answer"] == "[stub answer] Why was Rake-03 on standby on day 2?"
+    assert api._model.calls == 1
+
+def test_falls_back_to_the_model_and_caches_the_answer(api):
+    question = "How tired is Rake-01 on day 2?"
+    first = ask(api, question)
+    assert first.status_code == 200 and "source" not in first.json
+    assert first.json["answer"] == f"[stub answer] {question}"
+    assert ask(api, "how tired is  Rake-01 on day 2").json["answer"] == first.json["answer"] # Normalised rewording hits the cache
+    assert api._model.calls == 1
+
+def test_identical_in_flight_questions_share_one_model_call(api):
+    api._model.latency_seconds = 0.3
+    answers, start = [], threading.Barrier(5)
+
+    def worker():
+        start.wait()
+        answers.append(ask(api, "How tired is Rake-02 on day 1?").json["answer"])
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for thread in threads: thread.start()
+    for thread in threads: thread.join()
+    assert len(answers) == 5 and len(set(answers)) == 1
+    assert api._model.calls == 1
+    assert api.answer_cache.stats['misses'] == 1
+
+def test_coalesced_question_times_out_with_the_busy_response(api, monkeypatch):
+    api._model.latency_seconds = 0.5
+    monkeypatch.setattr(api, "COALESCED_WAIT_SECONDS", 0.05)
+    owner = threading.Thread(target=ask, args=(api, "How tired is Rake-02 on day 1?"))
+    owner.start()
+    while not api.answer_cache._in_flight: time.sleep(0.01)
+    response = ask(api, "How tired is Rake-02 on day 1?")
+    owner.join()
+    assert response.status_code == 503
+    assert response.json["error"] == "RakeAssist is busy, please try again in a moment."
+    assert api._model.calls == 1
+
+def test_model_timeout_returns_the_busy_response_and_frees_the_slot(api, monkeypatch):
+    api._model.latency_seconds = 0.5
+    monkeypatch.setattr(api, "MODEL_TIMEOUT_SECONDS", 0.05)
+    response = ask(api, "How tired is Rake-02 on day 1?")
+    assert response.status_code == 503
+    assert response.json["error"] == "RakeAssist is busy, please try again in a moment."
+    assert all(api.model_slots.acquire(blocking=False) for _ in range(api.MODEL_CONCURRENCY)) # Every slot is free again
+    for _ in range(api.MODEL_CONCURRENCY): api.model_slots.release()
+    api._model.latency_seconds = 0
+    assert ask(api, "How tired is Rake-02 on day 1?").status_code == 200 # The timeout was not cached
+
+def test_rejects_questions_without_text_or_train(api):
+    assert ask(api, "").status_code == 400
+    assert "Please mention a specific train ID" in ask(api, "Why was the fleet idle on day 1?").json["answer"]
+    assert api._model.calls == 0
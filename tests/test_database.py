@@ -0,0 +1,131 @@
+import os
+import sqlite3
+import pandas as pd
+import pytest
+from initialize_month import build_initial_fleet_status
+from kronos.database import SQL_CREATE_FLEET_TABLE, SQLitePool, bulk_load, connection, create_snapshot_table, create_table, snapshot_version, write_day
+from kronos.fleet_schema import load_fleet
+
+# --- DATABASE BULK LOADING ---
+# kronos.database against the SQLite stand-in (KRONOS_DB_URL=sqlite:///path).
+
+FLEET_DATA_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fleet_data.csv")
+SQL_CREATE_TRAINS = "CREATE TABLE IF NOT EXISTS trains (train_id VARCHAR(10) PRIMARY KEY, current_km INTEGER, brake_model VARCHAR(50))"
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = SQLitePool(str(tmp_path / "kronos.db"))
+    with connection(pool) as conn: create_table(conn, pool.dialect, SQL_CREATE_TRAINS)
+    return pool
+
+def trains(*rows):
+    return pd.DataFrame(rows, columns=['train_id', 'current_km', 'brake_model'])
+
+def table(pool, name="trains"):
+    with connection(pool) as conn:
+        return pd.read_sql_query(f"SELECT * FROM {name} ORDER BY train_id", conn)
+
+def test_replace_empties_the_table_first(pool):
+    with connection(pool) as conn:
+        assert bulk_load(conn, pool.dialect, 'trains', trains(('Rake-01', 100, 'A'), ('Rake-02', 200, 'B'))) == 2
+    with connection(pool) as conn:
+        assert bulk_load(conn, pool.dialect, 'trains', trains(('Rake-03', 300, 'C')), "replace") == 1
+    assert table(pool)['train_id'].tolist() == ['Rake-03']
+
+def test_append_adds_rows_and_respects_the_key(pool):
+    with connection(pool) as conn: bulk_load(conn, pool.dialect, 'trains', trains(('Rake-01', 100, 'A')), "append")
+    with connection(pool) as conn: bulk_load(conn, pool.dialect, 'trains', trains(('Rake-02', 200, 'B')), "append")
+    assert len(table(pool)) == 2
+    with pytest.raises(sqlite3.IntegrityError), connection(pool) as conn:
+        bulk_load(conn, pool.dialect, 'trains', trains(('Rake-03', 300, 'C'), ('Rake-01', 999, 'Z')), "append")
+    assert len(table(pool)) == 2 # The failed load rolled back as a whole
+
+def test_upsert_updates_existing_keys_and_inserts_new_ones(pool):
+    with connection(pool) as conn: bulk_load(conn, pool.dialect, 'trains', trains(('Rake-01', 100, 'A'), ('Rake-02', 200, 'B')), "replace")
+    with connection(pool) as conn:
+        assert bulk_load(conn, pool.dialect, 'trains', trains(('Rake-02', 250, 'B2'), ('Rake-03', 300, 'C')), "upsert", key=['train_id']) == 2
+    result = table(pool)
+    assert result['train_id'].tolist() == ['Rake-01', 'Rake-02', 'Rake-03']
+    assert result.set_index('train_id').loc['Rake-02'].tolist() == [250, 'B2']
+    assert result.set_index('train_id').loc['Rake-01'].tolist() == [100, 'A'] # Rows missing from the load are kept
+
+def test_rejects_unknown_modes_and_keyless_upserts(pool):
+    with connection(pool) as conn:
+        with pytest.raises(ValueError, match="Unknown load mode"): bulk_load(conn, pool.dialect, 'trains', trains(), "merge")
+        with pytest.raises(ValueError, match="no key to upsert on"): bulk_load(conn, pool.dialect, 'trains', trains(), "upsert")
+
+def test_loads_dates_and_missing_values(pool):
+    with connection(pool) as conn:
+        create_table(conn, pool.dialect, "CREATE TABLE IF NOT EXISTS certificates (train_id VARCHAR(10) PRIMARY KEY, cert_telecom_expiry DATE, current_hours REAL)")
+        bulk_load(conn, pool.dialect, 'certificates', pd.DataFrame({'train_id': ['Rake-01', 'Rake-02'], 'cert_telecom_expiry': pd.to_datetime(['2025-09-30', '2026-01-15']),
+                                                                   'current_hours': [12.5, float('nan')]}))
+    result = table(pool, "certificates")
+    assert result['cert_telecom_expiry'].tolist() == ['2025-09-30', '2026-01-15']
+    assert result['current_hours'].iloc[0] == 12.5 and pd.isna(result['current_hours'].iloc[1])
+
+# --- FLEET STATE TABLES ---
+@pytest.fixture
+def fleet_pool(pool):
+    with connection(pool) as conn:
+        create_table(conn, pool.dialect, SQL_CREATE_FLEET_TABLE)
+        create_snapshot_table(conn, pool.dialect)
+    return pool
+
+@pytest.fixture
+def fleet():
+    return build_initial_fleet_status(load_fleet(FLEET_DATA_CSV))
+
+def plan_for(fleet):
+    train_ids = fleet['train_id'].tolist()
+    return {'SERVICE': train_ids[:3], 'MAINTENANCE': train_ids[3:4], 'STANDBY': train_ids[4:]}
+
+def test_snapshot_version_changes_with_every_day_written(fleet_pool, fleet):
+    assert snapshot_version(fleet_pool) == 0
+    write_day(fleet_pool, 1, 'NORMAL', plan_for(fleet), fleet, fleet)
+    write_day(fleet_pool, 2, 'NORMAL', plan_for(fleet), fleet, fleet)
+    assert snapshot_version(fleet_pool) == 2
+    write_day(fleet_pool, 1, 'NORMAL', plan_for(fleet), fleet, fleet) # A new run rewriting day 1 keeps the row count
+    assert snapshot_version(fleet_pool) == 3
+    assert len(table(fleet_pool, "fleet_snapshots")) == 2 * len(fleet)
+
+def test_seeded_fleet_matches_the_month_start_csv(tmp_path, monkeypatch):
+    import setup_database
+    from kronos.database import close_pool, read_fleet
+    monkeypatch.setattr(setup_database, "FLEET_DATA_CSV", FLEET_DATA_CSV)
+    url = f"sqlite:///{tmp_path / 'seeded.db'}"
+    setup_database.setup_database(db_url=url)
+    pool = SQLitePool(url[len("sqlite:///"):])
+    seeded, expected = read_fleet(pool), build_initial_fleet_status(load_fleet(FLEET_DATA_CSV))
+    close_pool()
+    assert (seeded['current_km'] == 0).all() and (seeded['consecutive_service_days'] == 0).all()
+    assert seeded[['current_hours', 'target_hours']].notna().all().all()
+    pd.testing.assert_frame_equal(seeded.set_index('train_id')[expected.columns.drop('train_id')], expected.set_index('train_id').sort_index(), check_dtype=False)
+
+def test_setup_migrates_a_fleet_table_from_an_older_setup(tmp_path, monkeypatch):
+    import setup_database
+    from kronos.database import close_pool, read_fleet
+    monkeypatch.setattr(setup_database, "FLEET_DATA_CSV", FLEET_DATA_CSV)
+    pool = SQLitePool(str(tmp_path / "old.db"))
+    old_table = SQL_CREATE_FLEET_TABLE.replace("    target_km INTEGER,\n", "").replace("DOUBLE PRECISION", "REAL")
+    with connection(pool) as conn:
+        create_table(conn, pool.dialect, old_table)
+        conn.execute("INSERT INTO fleet_status (train_id, health_score) VALUES ('Rake-01', 50.0)")
+    setup_database.setup_database(db_url=f"sqlite:///{pool.path}")
+    close_pool()
+    seeded = read_fleet(pool)
+    assert seeded['target_km'].notna().all()
+    assert len(seeded) == len(load_fleet(FLEET_DATA_CSV))
+
+def test_write_day_round_trips_through_read_fleet(fleet_pool, fleet):
+    from kronos.database import fleet_status_rows, read_fleet
+    with connection(fleet_pool) as conn: bulk_load(conn, fleet_pool.dialect, 'fleet_status', fleet_status_rows(fleet), "replace")
+    updated = fleet.copy()
+    updated['current_km'] += 200
+    updated['consecutive_service_days'] = 1
+    updated.loc[0, 'cert_telecom_expiry'] = pd.Timestamp('2026-09-01')
+    write_day(fleet_pool, 1, 'NORMAL', plan_for(fleet), fleet, updated)
+    stored = read_fleet(fleet_pool).set_index('train_id')
+    expected = updated.set_index('train_id').sort_index()
+    pd.testing.assert_frame_equal(stored[expected.columns], expected, check_dtype=False)
+    snapshot = table(fleet_pool, "fleet_snapshots") # The snapshot keeps the fleet the solver planned from, like the delta log
+    assert (snapshot['current_km'].to_numpy() == fleet.sort_values('train_id')['current_km'].to_numpy()).all()
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+from kronos.delta_log import DeltaLogReader, DeltaLogWriter
+
+# --- DELTA-ENCODED LOG ROUND TRIP ---
+# kronos.delta_log writes keyframes every few days and per-column changes in between;
+# any day read back must equal the frame that was written for it.
+
+DAYS = 8
+KEYFRAME_EVERY = 3
+TRAIN_IDS = [f"Rake-{i:02d}" for i in range(1, 7)]
+
+def day_frames(seed=0):
+    """One log frame per day: slowly drifting state, a mostly stable plan and a static column."""
+    rng = np.random.default_rng(seed)
+    frames, km, health = {}, np.zeros(len(TRAIN_IDS), dtype=np.int64), np.full(len(TRAIN_IDS), 90.0)
+    expiry = pd.to_datetime(['2025-09-20'] * len(TRAIN_IDS))
+    for day in range(1, DAYS + 1):
+        status = rng.choice(['SERVICE', 'MAINTENANCE', 'STANDBY'], len(TRAIN_IDS), p=[0.6, 0.1, 0.3])
+        km = km + 200 * (status == 'SERVICE')
+        health = np.round(health - rng.random(len(TRAIN_IDS)) * (status == 'SERVICE'), 3)
+        if day == 4: expiry = expiry.where(status != 'MAINTENANCE', pd.Timestamp('2026-03-20'))
+        frames[day] = pd.DataFrame({'train_id': TRAIN_IDS, 'status': status, 'health_score': health, 'current_km': km,
+                                    'cert_telecom_expiry': expiry, 'brake_model': 'HydroMech_v1'})
+    return frames
+
+def expected(frame, day, scenario):
+    frame = frame.copy()
+    frame['cert_telecom_expiry'] = frame['cert_telecom_expiry'].dt.strftime('%Y-%m-%d')
+    frame['simulation_day'] = day
+    frame['scenario'] = scenario
+    return frame
+
+def scenario(day):
+    return 'NORMAL' if day % 2 else 'HEAVY_MONSOON'
+
+@pytest.fixture
+def log(tmp_path):
+    frames, path = day_frames(), str(tmp_path / "log.delta.jsonl")
+    writer = DeltaLogWriter(path, keyframe_every=KEYFRAME_EVERY)
+    for day, frame in frames.items(): writer.write_day(day, scenario(day), frame)
+    writer.close()
+    return frames, DeltaLogReader(path)
+
+def test_middle_day_matches_the_written_frame(log):
+    frames, reader = log
+    assert [reader.records[i]["day"] for i in reader.keyframes] == [1, 3, 6] # Day 5 is rebuilt from day 3's keyframe plus changes
+    pd.testing.assert_frame_equal(reader.snapshot(5), expected(frames[5], 5, scenario(5)), check_dtype=False)
+
+def test_every_day_matches_in_any_order(log):
+    frames, reader = log
+    for day in [7, 2, 8, 4, 5, 1]: # Forward steps, backward seeks and keyframe days
+        pd.testing.assert_frame_equal(reader.snapshot(day), expected(frames[day], day, scenario(day)), check_dtype=False)
+    whole = reader.to_frame()
+    pd.testing.assert_frame_equal(whole, pd.concat([expected(frames[day], day, scenario(day)) for day in range(1, DAYS + 1)], ignore_index=True), check_dtype=False)
+
+def test_changed_trains_start_a_new_keyframe(tmp_path):
+    frames, path = day_frames(), str(tmp_path / "log.delta.jsonl")
+    frames[2] = frames[2].iloc[:-1] # A train leaves the fleet on day 2
+    writer = DeltaLogWriter(path)
+    for day in (1, 2, 3): writer.write_day(day, 'NORMAL', frames[day])
+    writer.close()
+    reader = DeltaLogReader(path)
+    assert "rows" in reader.records[1] and "rows" in reader.records[2]
+    pd.testing.assert_frame_equal(reader.snapshot(2), expected(frames[2], 2, 'NORMAL'), check_dtype=False)
@@ -0,0 +1,47 @@
+import os
+import numpy as np
+import pandas as pd
+from initialize_month import build_initial_fleet_status
+from kronos.fleet_schema import load_fleet
+from kronos.health_engine import JOB_CARD_PENALTIES, HealthEngine
+from kronos.simulator import build_simulator
+
+# --- INCREMENTAL HEALTH SCORES ---
+# The simulator's HealthEngine only recomputes trains whose inputs changed; over several
+# simulated days it must match a from-scratch score of the same fleet.
+
+FLEET_DATA_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fleet_data.csv")
+DAYS = 6
+MANUAL_INPUTS = {
+    2: {'Rake-01': {'health_penalty': 30}, 'Rake-02': {'force_maintenance': True}},
+    3: {'Rake-03': {'health_penalty': 15, 'force_maintenance': True}},
+    5: {'Rake-01': {'health_penalty': 20}, 'Rake-04': {'health_penalty': 10}},
+}
+
+def expected_health(df, today, manual_inputs, expired_penalty_per_day):
+    """The health formula computed directly from the day's fleet."""
+    days_expired = (pd.Timestamp(today) - pd.to_datetime(df['cert_telecom_expiry'])).dt.days.clip(lower=0)
+    job_card = np.where(df['job_card_status'] == 'OPEN', df['job_card_priority'].map(JOB_CARD_PENALTIES).astype(float).fillna(0), 0)
+    manual = df['train_id'].map(lambda tid: manual_inputs.get(tid, {}).get('health_penalty', 0))
+    health = (100.0 - (df['current_km'] - df['bogie_last_service_km']) / 200 - df['consecutive_service_days']
+              - days_expired * expired_penalty_per_day - job_card - manual)
+    return health.clip(lower=0).to_numpy()
+
+def test_incremental_scores_match_a_full_recompute():
+    simulator = build_simulator('new_solver', sinks=[], manual_inputs=MANUAL_INPUTS)
+    penalty = simulator.config['expired_penalty_per_day']
+    state = build_initial_fleet_status(load_fleet(FLEET_DATA_CSV))
+    state.loc[state['train_id'] == 'Rake-05', 'cert_telecom_expiry'] = pd.Timestamp(simulator.today(2)) # Expires mid-run and accrues daily
+    previous_plan = None
+    for day in range(1, DAYS + 1):
+        fleet_df = simulator.preprocess(state.copy(), day)
+        today, manual_inputs = simulator.today(day), MANUAL_INPUTS.get(day, {})
+        fresh = HealthEngine(penalty).score(fleet_df.drop(columns=['health_score', 'manual_force_maintenance']), today, manual_inputs)
+        np.testing.assert_array_equal(fleet_df['health_score'].to_numpy(), fresh['health_score'].to_numpy())
+        np.testing.assert_array_equal(fleet_df['manual_force_maintenance'].to_numpy(), fresh['manual_force_maintenance'].to_numpy())
+        np.testing.assert_allclose(fleet_df['health_score'].to_numpy(), expected_health(fleet_df, today, manual_inputs, penalty))
+        forced = fleet_df.loc[fleet_df['manual_force_maintenance'], 'train_id'].tolist()
+        assert sorted(forced) == sorted(tid for tid, override in manual_inputs.items() if override.get('force_maintenance'))
+
+        previous_plan, _, _ = simulator.solve(fleet_df, day, previous_plan)
+        state = simulator.apply_daily_updates(fleet_df.copy(), previous_plan, day)
@@ -0,0 +1,60 @@
+import gzip
+import json
+
+# --- /log ENDPOINTS ---
+# Paging, ETag revalidation, gzip and the 400/404 answers of the simulation-log views.
+
+def get(api, path, **headers):
+    return api.app.test_client().get(path, headers=headers)
+
+def test_days_are_paged(api):
+    first = get(api, '/log/days?limit=1').json
+    assert (first['total'], first['next_offset'], [day['day'] for day in first['items']]) == (2, 1, [1])
+    last = get(api, '/log/days?offset=1&limit=1').json
+    assert (last['next_offset'], [day['day'] for day in last['items']]) == (None, [2])
+    assert last['items'][0]['service'] == 2 and last['items'][0]['trains'] == 3
+
+def test_day_and_train_views_project_fields(api):
+    day = get(api, '/log/days/1?fields=health_score').json
+    assert day['plan'] == {'SERVICE': ['Rake-01'], 'MAINTENANCE': ['Rake-03'], 'STANDBY': ['Rake-02']}
+    assert set(day['fleet']['items'][0]) == {'train_id', 'status', 'health_score'}
+    train = get(api, '/log/trains/Rake-02').json
+    assert [row['status'] for row in train['days']['items']] == ['STANDBY', 'SERVICE']
+
+def test_unchanged_log_revalidates_with_304(api):
+    first = get(api, '/log/days/2')
+    assert first.status_code == 200 and first.headers['ETag'] and 'max-age' in first.headers['Cache-Control']
+    revalidated = get(api, '/log/days/2', **{'If-None-Match': first.headers['ETag']})
+    assert revalidated.status_code == 304 and revalidated.data == b''
+    assert get(api, '/log/days/1', **{'If-None-Match': first.headers['ETag']}).status_code == 200 # The ETag covers the query
+
+def test_rewritten_log_gets_a_new_etag(api):
+    first = get(api, '/log/days')
+    with open(api.log_store.log_file, 'a') as f: f.write("Rake-04,100.0,3000,0,2,SERVICE\n")
+    changed = get(api, '/log/days', **{'If-None-Match': first.headers['ETag']})
+    assert changed.status_code == 200 and changed.headers['ETag'] != first.headers['ETag']
+    assert changed.json['items'][-1]['trains'] == 4
+
+def test_large_responses_are_gzipped(api, monkeypatch):
+    monkeypatch.setattr(api, "GZIP_MIN_BYTES", 0)
+    response = get(api, '/log/days', **{'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(response.data))['total'] == 2
+    assert 'Content-Encoding' not in get(api, '/log/days').headers
+
+def test_bad_paging_and_fields_are_400s(api):
+    for query in ['limit=0', f'limit={api.LOG_PAGE_MAX + 1}', 'offset=-1']:
+        response = get(api, f'/log/days?{query}')
+        assert response.status_code == 400 and 'limit' in response.json['error']
+    response = get(api, '/log/days/1?fields=health_score,wheel_wear')
+    assert response.status_code == 400 and 'wheel_wear' in response.json['error']
+    assert 'ETag' not in response.headers
+
+def test_unknown_day_or_train_is_404(api):
+    assert get(api, '/log/days/9').status_code == 404
+    assert get(api, '/log/trains/Rake-99').status_code == 404
+
+def test_missing_log_is_404(api, tmp_path, monkeypatch):
+    from log_store import LogStore
+    monkeypatch.setattr(api, "log_store", LogStore(str(tmp_path / "missing.csv")))
+    assert get(api, '/log/days').status_code == 404
@@ -0,0 +1,83 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import STATUSES, TRAIN_IDS, write_log
+from kronos.log_index import INDEX_SUFFIX, LogIndex
+
+# --- SIMULATION LOG INDEX ---
+# kronos.log_index over the CSV log: the saved index is extended when a run appends
+# days and rebuilt when the log is rewritten or truncated, never reused stale.
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = str(tmp_path / "log.csv")
+    write_log(path)
+    return path
+
+def append_day(log_file, day, statuses, km=5000, newline=True):
+    rows = pd.DataFrame({'train_id': TRAIN_IDS, 'health_score': 70.0, 'current_km': [km + 200 * i for i in range(len(TRAIN_IDS))],
+                         'consecutive_service_days': 0, 'simulation_day': day, 'status': statuses})
+    text = rows.to_csv(index=False, header=False)
+    with open(log_file, 'a') as f: f.write(text if newline else text.rstrip("\n"))
+
+def scans(monkeypatch):
+    """Records the byte offset every LogIndex scan starts from."""
+    starts, scan = [], LogIndex._scan
+    def recording_scan(index):
+        starts.append(index.meta["indexed_bytes"])
+        scan(index)
+    monkeypatch.setattr(LogIndex, "_scan", recording_scan)
+    return starts
+
+def assert_same_index(index, rebuilt):
+    assert index.meta == rebuilt.meta
+    for name in rebuilt.arrays: np.testing.assert_array_equal(index.arrays[name], rebuilt.arrays[name])
+
+def test_appended_days_extend_the_saved_index(log_file, monkeypatch):
+    LogIndex.open(log_file)
+    assert os.path.exists(log_file + INDEX_SUFFIX)
+    indexed_bytes = os.path.getsize(log_file)
+    append_day(log_file, 3, ['MAINTENANCE', 'SERVICE', 'STANDBY'])
+    starts = scans(monkeypatch)
+    index = LogIndex.open(log_file)
+    assert starts == [indexed_bytes] # Only the appended lines were scanned
+    assert index.rows == 9
+    assert index.day_rows(3)['status'].tolist() == ['MAINTENANCE', 'SERVICE', 'STANDBY']
+    assert index.journey('Rake-02')['simulation_day'].tolist() == [1, 2, 3]
+    assert index.final_status()['current_km'].tolist() == [5000, 5200, 5400]
+    assert index.train_summary().set_index('train_id').loc['Rake-01', 'maintenance_days'] == 1
+    assert_same_index(index, LogIndex.open(log_file, rebuild=True))
+
+def test_unchanged_log_reuses_the_index(log_file, monkeypatch):
+    LogIndex.open(log_file)
+    starts = scans(monkeypatch)
+    assert LogIndex.open(log_file).rows == 6
+    assert starts == []
+
+def test_partial_last_line_waits_for_its_newline(log_file):
+    append_day(log_file, 3, ['SERVICE'] * 3, newline=False) # A run still writing day 3's last row
+    assert LogIndex.open(log_file).rows == 8
+    with open(log_file, 'a') as f: f.write("\n")
+    index = LogIndex.open(log_file)
+    assert index.rows == 9 and index.day_rows(3)['train_id'].tolist() == TRAIN_IDS
+
+def test_rewritten_log_rebuilds_the_index(log_file, monkeypatch):
+    LogIndex.open(log_file)
+    with open(log_file) as f: text = f.read()
+    with open(log_file, 'w') as f: f.write(text.replace("STANDBY", "MAINTENANCE") + "Rake-01,60.0,9999,0,3,SERVICE\n") # Another run, longer than the indexed one
+    starts = scans(monkeypatch)
+    index = LogIndex.open(log_file)
+    assert starts == [0]
+    day_1 = index.day_summary().set_index('simulation_day').loc[1]
+    assert day_1['standby'] == 0 and day_1['maintenance'] == 2
+    assert index.final_status().set_index('train_id').loc['Rake-01', 'current_km'] == 9999
+    assert_same_index(index, LogIndex.open(log_file, rebuild=True))
+
+def test_truncated_log_rebuilds_the_index(log_file):
+    LogIndex.open(log_file)
+    df = pd.read_csv(log_file)
+    df[df['simulation_day'] == 1].to_csv(log_file, index=False) # A new run started over
+    index = LogIndex.open(log_file)
+    assert index.rows == 3 and index.day_rows(2) is None
+    assert index.day_rows(1)['status'].tolist() == STATUSES[1]